@@ -0,0 +1,73 @@
+"""
+Throughput of the catalog batch pipeline as concurrency grows, and resumption.
+
+Builds lessons and quizzes at every level for `--videos` local transcripts
+with the fake chat model at each `--concurrency`, into a fresh catalog, and
+reports artifacts/sec. Then reruns the last build, which must generate
+nothing, and reads an artifact back through the artifact cache the way an
+interactive session would.
+
+    python -m benchmarks.bench_batch [--videos 20] [--concurrency 1 4 16] [--latency 0.5]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+
+from benchmarks.bench_load import clear_caches, responder, video_ids, write_fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency", type=float, default=0.5, help="Median fake time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    args = parser.parse_args()
+
+    source = tempfile.mkdtemp()
+    write_fixtures(source, args.videos)
+    os.environ["EDISON_CACHE_DIR"] = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+    from edison_ai import agent
+    from edison_ai.artifacts import LEVEL_BUCKETS, UNASSESSED, ArtifactCache, model_name
+    from edison_ai.batch import CatalogBuilder, parse_source
+    from edison_ai.cache import DiskCache
+    from edison_ai.catalog import CatalogStore
+    from edison_ai.models.models import get_model
+
+    agent.model = get_model(
+        "fake",
+        responder=responder,
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        seed=0,
+    )
+    paths = [os.path.join(source, f"{video_id}.json") for video_id in video_ids(args.videos)]
+    sources = [parse_source(path) for path in paths]
+    levels = [UNASSESSED, *LEVEL_BUCKETS]
+
+    for concurrency in args.concurrency:
+        clear_caches()
+        catalog = CatalogStore(os.path.join(tempfile.mkdtemp(), "catalog.sqlite"))
+        progress = asyncio.run(CatalogBuilder(catalog, levels, concurrency).build(sources))
+        print(f"concurrency {concurrency:>3}: {progress.summary()}")
+        if progress.failed:
+            raise SystemExit(f"{progress.failed} videos failed")
+
+    rerun = asyncio.run(CatalogBuilder(catalog, levels, concurrency).build(sources))
+    print(f"rerun: {rerun.summary()}")
+    if rerun.generated:
+        raise SystemExit("Rerun generated artifacts that were already stored")
+
+    artifacts = ArtifactCache(DiskCache(tempfile.mkdtemp(), max_bytes=1 << 20), catalog=catalog)
+    quiz = asyncio.run(artifacts.get_quiz(sources[0][0], model_name(agent.model), "advanced"))
+    if quiz is None:
+        raise SystemExit("Artifact cache did not serve the pre-generated quiz")
+    print(f"served from catalog: {artifacts.stats['quiz']['hits']} quiz hit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Checkpoint write/read latency and memory growth across many sessions.
+
+Simulates `--sessions` threads, each writing `--turns` checkpoints of a
+realistic AgentState (transcript, lesson, assessment and growing message
+history) and reading the latest one back, for every checkpointer backend.
+Reports p50/p99 latencies, payload size and RSS growth.
+
+    python -m benchmarks.bench_checkpoint [--sessions 10000] [--turns 3]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import statistics
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import create_checkpoint, empty_checkpoint
+from langgraph.checkpoint.memory import MemorySaver
+
+from edison_ai.checkpoint import BlobCodec, BoundedMemorySaver, CompactSerializer, SQLiteSaver
+from edison_ai.models.fake import fake_instance
+from edison_ai.schema import StudentLevelAssessment
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def make_checkpoint(transcript: str, turn: int):
+    messages = []
+    for i in range(turn + 1):
+        messages.append(HumanMessage(content=f"Student answer {i} about the lecture topic", id=f"h{i}"))
+        messages.append(AIMessage(content=f"Follow-up assessment question number {i}?", id=f"a{i}"))
+    checkpoint = create_checkpoint(empty_checkpoint(), None, turn)
+    checkpoint["channel_values"] = {
+        "messages": messages,
+        "transcript": transcript,
+        "lesson_explanation": transcript[:8000],
+        "assessment": fake_instance(StudentLevelAssessment),
+        "video_id": "dQw4w9WgXcQ",
+    }
+    checkpoint["channel_versions"] = {key: str(turn) for key in checkpoint["channel_values"]}
+    return checkpoint
+
+
+def run(saver, sessions: int, turns: int, transcript: str):
+    gc.collect()
+    rss_before = rss_mb()
+    writes, reads = [], []
+    for session in range(sessions):
+        config = {"configurable": {"thread_id": f"thread-{session}", "checkpoint_ns": ""}}
+        for turn in range(turns):
+            checkpoint = make_checkpoint(transcript, turn)
+            start = time.perf_counter()
+            config = saver.put(config, checkpoint, {"source": "loop", "step": turn}, {})
+            writes.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            saver.get_tuple({"configurable": {"thread_id": f"thread-{session}", "checkpoint_ns": ""}})
+            reads.append(time.perf_counter() - start)
+    gc.collect()
+    return writes, reads, rss_mb() - rss_before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--max-threads", type=int, default=1_000)
+    args = parser.parse_args()
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        transcript = file.read()
+
+    sample = make_checkpoint(transcript, args.turns - 1)
+    plain = MemorySaver().serde.dumps_typed(sample)[1]
+    compact = CompactSerializer().dumps_typed(sample)[1]
+    # Transcript and lesson stored once as blobs, leaving references in the checkpoint
+    referenced = CompactSerializer().dumps_typed(BlobCodec(CompactSerializer()).split(sample)[0])[1]
+    print(
+        f"checkpoint payload: {len(plain) / 1024:.1f} KiB plain, {len(compact) / 1024:.1f} KiB compact, "
+        f"{len(referenced) / 1024:.1f} KiB with blob references"
+    )
+
+    # The unbounded MemorySaver runs last so the memory it frees is not mistaken
+    # for the other backends staying flat
+    backends = {
+        "bounded": lambda: BoundedMemorySaver(max_threads=args.max_threads),
+        "sqlite": lambda: SQLiteSaver(os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")),
+        "memory": lambda: MemorySaver(),
+    }
+    print(
+        f"{'backend':<9}{'write p50':>11}{'write p99':>11}"
+        f"{'read p50':>10}{'read p99':>10}{'RSS +MiB':>10}"
+    )
+    for name, factory in backends.items():
+        saver = factory()
+        writes, reads, rss_growth = run(saver, args.sessions, args.turns, transcript)
+        print(
+            f"{name:<9}"
+            f"{statistics.median(writes) * 1e3:>9.3f}ms"
+            f"{percentile(writes, 99) * 1e3:>9.3f}ms"
+            f"{statistics.median(reads) * 1e3:>8.3f}ms"
+            f"{percentile(reads, 99) * 1e3:>8.3f}ms"
+            f"{rss_growth:>10.1f}"
+        )
+        del saver
+
+
+if __name__ == "__main__":
+    main()
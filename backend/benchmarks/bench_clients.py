@@ -0,0 +1,103 @@
+"""
+Overhead and behaviour of the pooled model clients.
+
+Measures building an OpenAI structured-output runnable on every call, as the
+nodes used to, against the cached runnables of `edison_ai.models.clients`, then
+checks with the fake model that the shared token bucket holds a burst of
+concurrent calls to the configured rate and that transient connection errors
+are retried with jittered backoff instead of failing the turn. Exits non-zero
+if either does not hold.
+
+    python -m benchmarks.bench_clients [--calls 2000] [--rps 20] [--burst 5]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+import httpx
+from langchain_core.messages import HumanMessage
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from edison_ai.models.clients import structured_output
+from edison_ai.models.fake import FakeChatModel, default_responder
+from edison_ai.schema import FusedTurn
+
+MESSAGES = [HumanMessage(content="What is a LangGraph node?")]
+
+
+def bench_construction(calls: int) -> None:
+    from edison_ai.models.models import get_model
+
+    # A real provider model: building its tool schema and parser is the cost saved
+    model = get_model("openai")
+    structured_output(model, FusedTurn)
+    started = time.perf_counter()
+    for _ in range(calls):
+        model.with_structured_output(FusedTurn)
+    per_turn = (time.perf_counter() - started) / calls
+    started = time.perf_counter()
+    for _ in range(calls):
+        structured_output(model, FusedTurn)
+    cached = (time.perf_counter() - started) / calls
+    print(f"structured runnable   per call {per_turn * 1e6:8.1f}us   cached {cached * 1e6:6.1f}us")
+
+
+async def bench_rate_limit(calls: int, rps: float, burst: int) -> None:
+    limiter = InMemoryRateLimiter(
+        requests_per_second=rps, check_every_n_seconds=0.01, max_bucket_size=burst
+    )
+    model = FakeChatModel(rate_limiter=limiter)
+    started = time.perf_counter()
+    await asyncio.gather(*(structured_output(model, FusedTurn).ainvoke(MESSAGES) for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    achieved = calls / elapsed
+    print(f"rate limit            {calls} calls in {elapsed:.2f}s, {achieved:.1f} req/s (limit {rps:g})")
+    if achieved > rps * 1.25:
+        raise SystemExit(f"Rate limiter let {achieved:.1f} req/s through, limit {rps:g}")
+
+
+async def bench_retries(calls: int, failure_rate: float) -> None:
+    rng = random.Random(0)
+    failures = 0
+
+    def flaky(schema, messages):
+        nonlocal failures
+        if rng.random() < failure_rate:
+            failures += 1
+            raise httpx.ConnectError("connection reset")
+        return default_responder(schema, messages)
+
+    model = FakeChatModel(responder=flaky)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(structured_output(model, FusedTurn).ainvoke(MESSAGES) for _ in range(calls)),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    print(
+        f"retries               {calls} calls, {failures} transient failures, "
+        f"{len(errors)} errors in {time.perf_counter() - started:.2f}s"
+    )
+    if errors:
+        raise SystemExit(f"{len(errors)} calls failed despite retries: {errors[0]!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    args = parser.parse_args()
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+    bench_construction(args.calls)
+    asyncio.run(bench_rate_limit(int(args.rps * 2), args.rps, args.burst))
+    asyncio.run(bench_retries(50, args.failure_rate))
+
+
+if __name__ == "__main__":
+    main()
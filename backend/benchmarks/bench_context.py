@@ -0,0 +1,99 @@
+"""
+Per-turn prompt size and latency over long sessions.
+
+Replays a `--turns`-turn assessment conversation through the real graph with a
+fake chat model whose latency grows with prompt size, once with the full
+message history (no windowing) and once with the default ContextWindow, and
+reports prompt tokens and wall time at several points of the session.
+
+    python -m benchmarks.bench_context [--turns 100]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from edison_ai import agent
+from edison_ai.context import ContextWindow
+from edison_ai.models.fake import FakeChatModel, fake_instance
+from edison_ai.schema import ResponseAssessment
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+
+ANSWER = (
+    "I think LangGraph lets you describe an agent as a graph of nodes that share a "
+    "state, and the edges decide which node runs next depending on the state. {turn}"
+)
+
+
+def responder(schema, messages):
+    if schema is None:
+        return "Can you explain how the state is shared between nodes in more detail?"
+    response = fake_instance(schema)
+    if schema is ResponseAssessment:
+        response.should_extract_student_response.bool_value = True
+    return response
+
+
+async def run_session(window: ContextWindow, turns: int, args):
+    fake = FakeChatModel(
+        responder=responder,
+        latency=args.latency,
+        prompt_token_latency=args.prompt_token_latency,
+    )
+    agent.model = fake
+    agent.context_window = window
+    graph = agent.build_graph("classic").compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        transcript = file.read()
+    await graph.aupdate_state(
+        config, {"transcript": transcript, "lesson_explanation": transcript[:8000]}
+    )
+
+    results = []
+    for turn in range(turns):
+        tokens = fake.prompt_tokens
+        start = time.perf_counter()
+        await graph.ainvoke(
+            {"messages": [HumanMessage(content=ANSWER.format(turn=turn))]}, config
+        )
+        results.append((time.perf_counter() - start, fake.prompt_tokens - tokens))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "--prompt-token-latency",
+        type=float,
+        default=2e-5,
+        help="Fake prefill cost in seconds per prompt token",
+    )
+    args = parser.parse_args()
+
+    checkpoints = sorted({1, 10, 25, 50, args.turns // 2, args.turns})
+    windows = {
+        "full": ContextWindow(keep_turns=10**9),
+        "windowed": ContextWindow(),
+    }
+    for name, window in windows.items():
+        results = asyncio.run(run_session(window, args.turns, args))
+        print(f"{name}:")
+        print(f"  {'turn':>6}{'prompt tok':>12}{'ms':>10}")
+        for turn in checkpoints:
+            if turn <= len(results):
+                seconds, tokens = results[turn - 1]
+                print(f"  {turn:>6}{tokens:>12}{seconds * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Load test: event-loop responsiveness while transcripts are being fetched.
+
+Simulates `--sessions` connected students whose requests each need a short
+slice of the event loop, and measures their latency while `--fetches` slow
+transcript fetches for uncached videos run at the same time. Compare the
+`inline` mode (the old synchronous call inside the async node) with the
+`store` mode (TranscriptStore on the bounded I/O pool).
+
+    python -m benchmarks.bench_event_loop [--fetch-latency 0.5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from edison_ai.cache import DiskCache
+from edison_ai.transcripts import TranscriptStore
+
+
+class SlowFetcher:
+    """Blocking fetcher standing in for YouTubeTranscriptApi."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def fetch(self, video_id: str):
+        time.sleep(self.latency)
+        return [{"text": f"transcript of {video_id}", "start": 0.0, "duration": 1.0}]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def session(latencies, stop: asyncio.Event, interval: float):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append(time.perf_counter() - start - interval)
+
+
+async def run(mode: str, args) -> list:
+    fetcher = SlowFetcher(args.fetch_latency)
+    store = TranscriptStore(
+        DiskCache(tempfile.mkdtemp(), max_bytes=1 << 20), fetcher, fetch_timeout=30
+    )
+
+    async def fetch(i: int):
+        video_id = f"video{i:06d}"
+        if mode == "inline":
+            fetcher.fetch(video_id)
+        elif mode == "store":
+            await store.get(video_id)
+
+    latencies: list = []
+    stop = asyncio.Event()
+    sessions = [
+        asyncio.create_task(session(latencies, stop, args.interval))
+        for _ in range(args.sessions)
+    ]
+    await asyncio.sleep(0.1)
+    for _ in range(args.rounds):
+        await asyncio.gather(*(fetch(i) for i in range(args.fetches)))
+        await asyncio.sleep(args.fetch_latency)
+    stop.set()
+    await asyncio.gather(*sessions)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--fetches", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--fetch-latency", type=float, default=0.5)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for mode in ("idle", "inline", "store"):
+        latencies = asyncio.run(run(mode, args))
+        print(
+            f"{mode:<8}"
+            f"{statistics.median(latencies) * 1e3:>10.2f}"
+            f"{percentile(latencies, 99) * 1e3:>10.2f}"
+            f"{max(latencies) * 1e3:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Latency of local quiz grading.
+
+Parses and grades a stream of student answers in the formats the grader
+understands against a `--questions`-question quiz, checks that free-text
+follow-ups are left to the model, and reports per-answer latency.
+
+    python -m benchmarks.bench_grading [--questions 20] [--answers 10000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from edison_ai.grading import grade_answers, parse_answers
+from edison_ai.schema import Quiz, QuizAnswer, QuizQuestion
+
+FORMATS = ["{n}{l}", "Q{n}: {L}", "{n}) {l}", "question {n} is {l}", "{L}", "my answer is {l}"]
+FOLLOW_UPS = [
+    "Can you explain question 3 a bit more?",
+    "why is that the right answer?",
+    "I have 2 questions about state",
+]
+
+
+def build_quiz(questions: int) -> Quiz:
+    return Quiz(
+        title="LangGraph",
+        description="A quiz",
+        instructions="Pick one answer",
+        questions=[
+            QuizQuestion(
+                question=f"Question {i}?",
+                answers=[
+                    QuizAnswer(text=f"Answer {j}", is_correct=j == i % 4, explanation=f"Why {j}")
+                    for j in range(4)
+                ],
+                difficulty="moderate",
+                topic=f"topic {i}",
+                skill_tested="recall",
+            )
+            for i in range(questions)
+        ],
+        difficulty_level="moderate",
+        target_skills=["recall"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--answers", type=int, default=10000)
+    args = parser.parse_args()
+
+    quiz = build_quiz(args.questions)
+    for text in FOLLOW_UPS:
+        assert not parse_answers(text, quiz), f"{text!r} should go to the model"
+
+    rng = random.Random(0)
+    latencies = []
+    score = None
+    for _ in range(args.answers):
+        if score is not None and len(score.results) == args.questions:
+            # A lone letter has no current question once the quiz is finished
+            score = None
+        letter = rng.choice("abcd")
+        text = rng.choice(FORMATS).format(
+            n=rng.randint(1, args.questions), l=letter, L=letter.upper()
+        )
+        started = time.perf_counter()
+        answers = parse_answers(text, quiz, score)
+        score, _ = grade_answers(quiz, score, answers)
+        latencies.append(time.perf_counter() - started)
+        assert answers, f"{text!r} was not recognized as an answer"
+
+    latencies.sort()
+    print(f"answers graded: {len(latencies)}")
+    print(f"mean  {statistics.mean(latencies) * 1e6:8.1f} us")
+    print(f"p50   {latencies[len(latencies) // 2] * 1e6:8.1f} us")
+    print(f"p99   {latencies[int(len(latencies) * 0.99)] * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
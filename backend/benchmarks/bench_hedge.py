@@ -0,0 +1,121 @@
+"""
+Tail latency and availability with provider hedging and fallback.
+
+Two fake providers: a primary with a heavy latency tail and a slower but
+steadier fallback. Sends `--calls` structured calls, `--concurrency` at a time,
+to the primary alone and through a HedgedChatModel over both, and reports
+p50/p95/p99 and the share of calls hedged. Then makes the primary fail
+`--failure-rate` of its calls and checks every call still succeeds by failing
+over. Exits non-zero if hedging does not cut p99, hedges more than
+`--max-hedged` of calls, or any call fails.
+
+    python -m benchmarks.bench_hedge [--calls 400] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# Latencies here are scaled down tenfold, and so is the hedge delay floor
+os.environ.setdefault("EDISON_HEDGE_MIN_DELAY", "0.05")
+
+from langchain_core.messages import HumanMessage
+
+from edison_ai.metrics import REGISTRY
+from edison_ai.models.clients import structured_output
+from edison_ai.models.fake import FakeChatModel, default_responder
+from edison_ai.models.hedge import HedgedChatModel
+from edison_ai.schema import FusedTurn
+
+MESSAGES = [HumanMessage(content="What is a LangGraph node?")]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def counter(name: str) -> float:
+    return sum(REGISTRY._counters.get(name, {}).values())
+
+
+async def run(model, calls: int, concurrency: int):
+    latencies, errors = [], []
+
+    async def call():
+        started = time.perf_counter()
+        try:
+            await structured_output(model, FusedTurn).ainvoke(MESSAGES)
+        except Exception as e:
+            errors.append(e)
+            return
+        latencies.append(time.perf_counter() - started)
+
+    for start in range(0, calls, concurrency):
+        await asyncio.gather(*(call() for _ in range(min(concurrency, calls - start))))
+    return latencies, errors
+
+
+def report(label: str, latencies) -> float:
+    p99 = percentile(latencies, 99)
+    print(
+        f"{label:<10}p50 {percentile(latencies, 50) * 1000:7.0f}ms   "
+        f"p95 {percentile(latencies, 95) * 1000:7.0f}ms   p99 {p99 * 1000:7.0f}ms"
+    )
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.1, help="Primary median latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.8, help="Primary tail")
+    parser.add_argument("--fallback-latency", type=float, default=0.15)
+    parser.add_argument("--failure-rate", type=float, default=0.2)
+    parser.add_argument("--max-hedged", type=float, default=0.15)
+    args = parser.parse_args()
+
+    def primary(responder=default_responder):
+        return FakeChatModel(
+            latency=args.latency, latency_sigma=args.latency_sigma, seed=1, responder=responder
+        )
+
+    fallback = FakeChatModel(latency=args.fallback_latency, latency_sigma=0.1, seed=2)
+
+    alone, errors = asyncio.run(run(primary(), args.calls, args.concurrency))
+    assert not errors, errors[0]
+    hedged_model = HedgedChatModel(models=[primary(), fallback], providers=["primary", "fallback"])
+    hedged, errors = asyncio.run(run(hedged_model, args.calls, args.concurrency))
+    assert not errors, errors[0]
+    hedges = counter("edison_hedges_total")
+
+    p99_alone = report("primary", alone)
+    p99_hedged = report("hedged", hedged)
+    print(f"hedged {hedges / args.calls:.1%} of calls")
+
+    rng = random.Random(0)
+
+    def flaky(schema, messages):
+        if rng.random() < args.failure_rate:
+            raise ConnectionError("provider unavailable")
+        return default_responder(schema, messages)
+
+    failing = HedgedChatModel(models=[primary(flaky), fallback], providers=["primary", "fallback"])
+    failovers = counter("edison_failovers_total")
+    _, errors = asyncio.run(run(failing, args.calls, args.concurrency))
+    failovers = counter("edison_failovers_total") - failovers
+    print(f"failover  {failovers:.0f} primary failures, {len(errors)} failed calls")
+
+    if p99_hedged >= p99_alone:
+        raise SystemExit("Hedging did not reduce p99 latency")
+    if hedges / args.calls > args.max_hedged:
+        raise SystemExit(f"Hedged {hedges / args.calls:.1%} of calls, over {args.max_hedged:.0%}")
+    if errors or not failovers:
+        raise SystemExit(f"Failover did not absorb primary errors: {len(errors)} calls failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Offline throughput, per-node latency and memory of the graph under load.
+
+Replays the recorded sessions in benchmarks/sessions/*.json against the local
+transcript fixture through the real compiled graph, with the fake chat model
+from `get_model("fake")` standing in for the provider. Each concurrency level
+runs that many sessions at once and reports turns/sec, per-node p50/p95/p99 and
+RSS. Caches are shared by the sessions of a level, as in production, and
+cleared between levels.
+
+`--save` writes the results as JSON; `--baseline` compares against such a file
+and exits non-zero when throughput drops or a node's p95 grows by more than
+`--tolerance`, so the run can gate performance regressions.
+
+    python -m benchmarks.bench_load [--concurrency 1 10 100 1000] [--latency 0.5]
+        [--latency-sigma 0.3] [--tokens-per-second 80] [--save results.json]
+        [--baseline results.json]
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import resource
+import tempfile
+import time
+import uuid
+
+SESSIONS_DIR = os.path.join(os.path.dirname(__file__), "sessions")
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+QUIZ_QUESTIONS = 5
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def video_ids(count: int):
+    return [f"fixture{index:04d}"[-11:].rjust(11, "x") for index in range(count)]
+
+
+def write_fixtures(directory: str, count: int) -> None:
+    """Serve transcript.txt as `count` videos, in 12-word timestamped segments."""
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        words = file.read().split()
+    segments = [
+        {"text": " ".join(words[i : i + 12]), "start": i / 2.5, "duration": 12 / 2.5}
+        for i in range(0, len(words), 12)
+    ]
+    for video_id in video_ids(count):
+        with open(os.path.join(directory, f"{video_id}.json"), "w", encoding="utf-8") as file:
+            json.dump(segments, file)
+
+
+def responder(schema, messages):
+    """Fake answers that keep sessions on realistic paths: valid quizzes and plans."""
+    from edison_ai.models.fake import default_responder, fake_instance
+    from edison_ai.schema import Quiz, QuizAnswer, QuizQuestion
+
+    if schema is Quiz:
+        quiz = fake_instance(Quiz)
+        quiz.questions = [
+            QuizQuestion(
+                question=f"Fake question {i}?",
+                answers=[
+                    QuizAnswer(text=f"Answer {j}", is_correct=j == i % 4, explanation="fake")
+                    for j in range(4)
+                ],
+                difficulty="moderate",
+                topic=f"topic {i}",
+                skill_tested="recall",
+            )
+            for i in range(QUIZ_QUESTIONS)
+        ]
+        return quiz
+    return default_responder(schema, messages)
+
+
+def load_sessions():
+    sessions = []
+    for path in sorted(glob.glob(os.path.join(SESSIONS_DIR, "*.json"))):
+        with open(path, "r", encoding="utf-8") as file:
+            sessions.append((os.path.basename(path), json.load(file)["turns"]))
+    return sessions
+
+
+async def run_level(graph, sessions, videos, concurrency):
+    from langchain_core.messages import HumanMessage
+
+    errors = []
+
+    async def replay(index: int) -> int:
+        _, turns = sessions[index % len(sessions)]
+        video_id = videos[index % len(videos)]
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        for turn in turns:
+            try:
+                await graph.ainvoke(
+                    {"messages": [HumanMessage(content=turn.format(video_id=video_id))]},
+                    config,
+                )
+            except Exception as e:
+                errors.append(e)
+                return 0
+        return len(turns)
+
+    started = time.perf_counter()
+    turns = await asyncio.gather(*(replay(index) for index in range(concurrency)))
+    return sum(turns), time.perf_counter() - started, errors
+
+
+def clear_caches():
+    from edison_ai import artifacts, summarize
+
+    if artifacts._artifacts is not None:
+        artifacts._artifacts.cache.clear()
+    if summarize._summarizer is not None:
+        summarize._summarizer.cache.clear()
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of `results` against `baseline`, as messages."""
+    regressions = []
+    for level, result in results.items():
+        before = baseline.get(level)
+        if before is None:
+            continue
+        if result["turns_per_sec"] < before["turns_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{level} sessions: {result['turns_per_sec']:.1f} turns/s "
+                f"vs {before['turns_per_sec']:.1f}"
+            )
+        for node, stats in result["nodes"].items():
+            p95 = before["nodes"].get(node, {}).get("p95")
+            if p95 and stats["p95"] > p95 * (1 + tolerance):
+                regressions.append(
+                    f"{level} sessions, {node}: p95 {stats['p95'] * 1000:.0f}ms "
+                    f"vs {p95 * 1000:.0f}ms"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--videos", type=int, default=4, help="Distinct fixture videos")
+    parser.add_argument("--latency", type=float, default=0.5, help="Median fake time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--token-rate-sigma", type=float, default=0.2)
+    parser.add_argument("--turn-mode", choices=["classic", "fused"], default="classic")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Fail on regressions against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Configure the agent before it is imported: local transcripts, empty caches
+    source = tempfile.mkdtemp()
+    write_fixtures(source, args.videos)
+    os.environ["EDISON_TRANSCRIPT_SOURCE_DIR"] = source
+    os.environ["EDISON_CACHE_DIR"] = tempfile.mkdtemp()
+    os.environ["EDISON_TURN_MODE"] = args.turn_mode
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+    from edison_ai import agent
+    from edison_ai.metrics import Registry, install_metrics
+    from edison_ai.models.models import get_model
+
+    class SampleRegistry(Registry):
+        """Keeps raw node durations so exact percentiles can be reported."""
+
+        def __init__(self):
+            super().__init__()
+            self.samples = {}
+
+        def observe(self, name, labels, value):
+            super().observe(name, labels, value)
+            if name == "edison_node_duration_seconds":
+                self.samples.setdefault(labels["node"], []).append(value)
+
+    agent.model = get_model(
+        "fake",
+        responder=responder,
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        token_rate_sigma=args.token_rate_sigma,
+        seed=0,
+    )
+    handler = install_metrics()
+    sessions = load_sessions()
+    videos = video_ids(args.videos)
+    print(f"sessions: {', '.join(name for name, _ in sessions)}")
+
+    results = {}
+    for concurrency in args.concurrency:
+        clear_caches()
+        handler.registry = SampleRegistry()
+        rss_before = rss_mb()
+        turns, elapsed, errors = asyncio.run(
+            run_level(agent.graph, sessions, videos, concurrency)
+        )
+        if errors:
+            raise SystemExit(f"{len(errors)} sessions failed, first error: {errors[0]!r}")
+
+        nodes = {
+            node: {pct: percentile(samples, value) for pct, value in (("p50", 50), ("p95", 95), ("p99", 99))}
+            for node, samples in sorted(handler.registry.samples.items())
+        }
+        results[str(concurrency)] = {
+            "turns": turns,
+            "seconds": elapsed,
+            "turns_per_sec": turns / elapsed,
+            "rss_mb": rss_mb(),
+            "rss_growth_mb": rss_mb() - rss_before,
+            "nodes": nodes,
+        }
+        print(
+            f"\n{concurrency} concurrent sessions: {turns} turns in {elapsed:.1f}s, "
+            f"{turns / elapsed:.1f} turns/s, RSS {rss_mb():.0f} MiB "
+            f"(+{rss_mb() - rss_before:.0f})"
+        )
+        print(f"  {'node':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for node, stats in nodes.items():
+            print(
+                f"  {node:<26}{stats['p50'] * 1000:>9.1f}"
+                f"{stats['p95'] * 1000:>9.1f}{stats['p99'] * 1000:>9.1f}"
+            )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            raise SystemExit("Performance regressions:\n" + "\n".join(regressions))
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Microbenchmark for system prompt construction.
+
+Compares rebuilding each node's prompt with `schema_json()` on every call (the
+previous behaviour) against the precomputed templates in `edison_ai.prompts`,
+and reports static/dynamic token counts per node.
+
+    python -m benchmarks.bench_prompts [--lesson-chars 8000]
+"""
+
+import argparse
+import os
+import timeit
+
+from edison_ai.prompts import (
+    ANALYZE_STUDENT_LEVEL_PROMPT,
+    CREATE_QUIZ_PROMPT,
+    EXTRACT_STUDENT_RESPONSE_PROMPT,
+    ROUTER_PROMPT,
+    SUMMARIZE_TRANSCRIPT_PROMPT,
+)
+from edison_ai.schema import (
+    QuestionResponse,
+    Quiz,
+    StudentAssessment,
+    StudentLevelAssessment,
+)
+from edison_ai.tokens import count_tokens
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+
+NODES = {
+    "router": (ROUTER_PROMPT, ("lesson", "assessment"), StudentAssessment),
+    "summarize_transcript": (SUMMARIZE_TRANSCRIPT_PROMPT, ("transcript",), None),
+    "create_quiz": (CREATE_QUIZ_PROMPT, ("lesson", "assessment"), Quiz),
+    "extract_student_response": (EXTRACT_STUDENT_RESPONSE_PROMPT, ("assessment",), StudentAssessment),
+    "analyze_student_level": (ANALYZE_STUDENT_LEVEL_PROMPT, ("lesson", "assessment"), StudentAssessment),
+}
+
+
+def sample_values(lesson_chars: int) -> dict:
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        text = file.read()
+    assessment = StudentLevelAssessment(
+        assessment=StudentAssessment(
+            knowledge_recall=QuestionResponse(
+                question="What is LangGraph?",
+                response="A library for building agent graphs",
+                analysis="Correct recall",
+            )
+        ),
+        overall_level="beginner",
+        strengths=["recall"],
+        areas_for_improvement=["application"],
+    )
+    return {
+        "lesson": text[:lesson_chars],
+        "transcript": text,
+        "assessment": assessment,
+    }
+
+
+def legacy_render(template, schema, values) -> str:
+    # Mirrors the old per-call f-string: schema serialised again every time
+    schema_json = schema.schema_json() if schema is not None else ""
+    return template.static + schema_json + "".join(str(v) for v in values.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2_000)
+    parser.add_argument("--lesson-chars", type=int, default=8_000)
+    args = parser.parse_args()
+
+    values = sample_values(args.lesson_chars)
+    print(
+        f"{'node':<26}{'legacy us':>11}{'template us':>13}"
+        f"{'static tok':>12}{'dynamic tok':>13}"
+    )
+    for name, (template, keys, schema) in NODES.items():
+        node_values = {key: values[key] for key in keys}
+        legacy = timeit.timeit(
+            lambda: legacy_render(template, schema, node_values), number=args.number
+        )
+        rendered = timeit.timeit(
+            lambda: template.message(**node_values), number=args.number
+        )
+        static_tokens = count_tokens(template.static)
+        total_tokens = count_tokens(template.render(**node_values))
+        print(
+            f"{name:<26}"
+            f"{legacy / args.number * 1e6:>11.1f}"
+            f"{rendered / args.number * 1e6:>13.1f}"
+            f"{static_tokens:>12}"
+            f"{total_tokens - static_tokens:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Wall-clock time of single-call versus parallel per-topic quiz generation.
+
+Generates a `--questions`-question quiz with a fake streaming model, once as a
+single structured call and once with ParallelQuizGenerator, and reports total
+time, time to the first question and the slowest single question call. One
+question is malformed on its first attempt to exercise per-question retries.
+Exits non-zero if the parallel quiz is incomplete or out of plan order.
+
+    python -m benchmarks.bench_quiz [--questions 20] [--chunk-latency 0.01]
+"""
+
+import argparse
+import asyncio
+import time
+
+from edison_ai.models.fake import FakeChatModel, default_responder
+from edison_ai.prompts import CREATE_QUIZ_PROMPT, QUIZ_QUESTION_PROMPT
+from edison_ai.quiz import ParallelQuizGenerator
+from edison_ai.schema import Quiz, QuizAnswer, QuizPlan, QuizQuestion, QuizTopic
+from edison_ai.streaming import stream_quiz
+
+LESSON = "LangGraph describes an agent as a graph of nodes that share a state."
+
+
+def question(topic: str, correct: int = 1) -> QuizQuestion:
+    return QuizQuestion(
+        question=f"Which statement about {topic} is true?",
+        answers=[
+            QuizAnswer(
+                text=f"Statement {i} about {topic}",
+                is_correct=i < correct,
+                explanation="Because the lecture says so.",
+            )
+            for i in range(4)
+        ],
+        difficulty="moderate",
+        topic=topic,
+        skill_tested="comprehension",
+    )
+
+
+def responder(questions: int):
+    topics = [f"topic {i}" for i in range(questions)]
+    malformed = {topics[len(topics) // 2]}
+
+    def respond(schema, messages):
+        if schema is Quiz:
+            return Quiz(
+                title="LangGraph",
+                description="A quiz",
+                instructions="Pick one answer",
+                questions=[question(topic) for topic in topics],
+                difficulty_level="moderate",
+                target_skills=["comprehension"],
+            )
+        if schema is QuizPlan:
+            return QuizPlan(
+                title="LangGraph",
+                description="A quiz",
+                instructions="Pick one answer",
+                difficulty_level="moderate",
+                target_skills=["comprehension"],
+                topics=[
+                    QuizTopic(topic=topic, skill_tested="comprehension", difficulty="moderate")
+                    for topic in topics
+                ],
+            )
+        if schema is QuizQuestion:
+            prompt = str(messages[0].content)
+            topic = next(t for t in topics if f'"{t}"' in prompt)
+            if topic in malformed:
+                malformed.discard(topic)
+                return question(topic, correct=0)
+            return question(topic)
+        return default_responder(schema, messages)
+
+    return respond, topics
+
+
+async def timed(coroutine, start, first):
+    result = await coroutine
+    return result, time.perf_counter() - start, first.get("at")
+
+
+async def run(args):
+    respond, topics = responder(args.questions)
+    model = FakeChatModel(
+        responder=respond, latency=args.latency, chunk_latency=args.chunk_latency
+    )
+
+    async def on_questions(partial):
+        if partial["questions"] and "at" not in first:
+            first["at"] = time.perf_counter() - start
+
+    first = {}
+    start = time.perf_counter()
+    prompt = [CREATE_QUIZ_PROMPT.message(lesson=LESSON)]
+    quiz, single, single_first = await timed(stream_quiz(model, prompt, on_questions), start, first)
+    assert len(quiz.questions) == args.questions
+
+    # The slowest single question, as a lower bound for the parallel quiz
+    started = time.perf_counter()
+    await model.with_structured_output(QuizQuestion).ainvoke(
+        [QUIZ_QUESTION_PROMPT.message(topic=f'"{topics[-1]}"', lesson=LESSON)]
+    )
+    one_question = time.perf_counter() - started
+
+    generator = ParallelQuizGenerator(questions=args.questions, concurrency=args.concurrency)
+    first = {}
+    calls = model.calls
+    start = time.perf_counter()
+    (quiz, _), parallel, parallel_first = await timed(
+        generator.generate(model, LESSON, None, on_questions=on_questions), start, first
+    )
+    assert [q.topic for q in quiz.questions] == topics, "questions out of plan order"
+
+    print(f"{'mode':<9} {'total s':>8} {'first s':>8} {'calls':>6}")
+    print(f"{'single':<9} {single:>8.2f} {single_first:>8.2f} {1:>6}")
+    print(f"{'parallel':<9} {parallel:>8.2f} {parallel_first:>8.2f} {model.calls - calls:>6}")
+    print(f"one question: {one_question:.2f}s, speedup {single / parallel:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds before the first chunk")
+    parser.add_argument("--chunk-latency", type=float, default=0.01)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
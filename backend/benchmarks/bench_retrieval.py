@@ -0,0 +1,104 @@
+"""
+Prompt context size and retrieval latency for lectures of different lengths.
+
+Synthesizes timestamped transcripts of 10 minutes to 3 hours from
+transcript.txt, builds and memory-maps a retrieval index for each, and compares
+the tokens of the whole transcript with the tokens of the top-k passages a node
+would receive, along with index build, load and query times.
+
+    python -m benchmarks.bench_retrieval [--top-k 6] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from edison_ai.config import RETRIEVAL_TOP_K
+from edison_ai.retrieval import TranscriptIndex, format_passages
+from edison_ai.tokens import count_tokens
+from edison_ai.transcripts import transcript_text
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+DURATIONS = [10, 30, 60, 120, 180]
+WORDS_PER_SECOND = 2.5
+SEGMENT_WORDS = 12
+
+
+def synthesize(words, minutes):
+    """Timestamped segments for a `minutes`-long lecture, cycling through `words`."""
+    total = int(minutes * 60 * WORDS_PER_SECOND)
+    segments = []
+    for start in range(0, total, SEGMENT_WORDS):
+        chunk = [words[(start + i) % len(words)] for i in range(SEGMENT_WORDS)]
+        segments.append(
+            {
+                "text": " ".join(chunk),
+                "start": start / WORDS_PER_SECOND,
+                "duration": SEGMENT_WORDS / WORDS_PER_SECOND,
+            }
+        )
+    return segments
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top-k", type=int, default=RETRIEVAL_TOP_K)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        words = file.read().split()
+    rng = random.Random(0)
+    queries = []
+    for _ in range(args.queries):
+        start = rng.randrange(len(words) - 20)
+        queries.append(" ".join(words[start : start + 20]))
+
+    print(
+        f"{'minutes':>7} {'passages':>8} {'full tok':>9} {'top-k tok':>9} "
+        f"{'build ms':>9} {'load ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'disk KB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for minutes in DURATIONS:
+            transcript = synthesize(words, minutes)
+            path = os.path.join(directory, str(minutes))
+
+            started = time.perf_counter()
+            TranscriptIndex.build(transcript, 150).save(path)
+            build = time.perf_counter() - started
+
+            started = time.perf_counter()
+            index = TranscriptIndex.load(path)
+            load = time.perf_counter() - started
+
+            latencies, context_tokens = [], []
+            for query in queries:
+                started = time.perf_counter()
+                passages = index.search(query, args.top_k)
+                latencies.append(time.perf_counter() - started)
+                context_tokens.append(count_tokens(format_passages(passages)))
+            assert all(context_tokens), "every query should retrieve at least one passage"
+
+            disk = sum(
+                os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+            )
+            print(
+                f"{minutes:>7} {len(index.passages):>8} "
+                f"{count_tokens(transcript_text(transcript)):>9} "
+                f"{statistics.mean(context_tokens):>9.0f} "
+                f"{build * 1000:>9.1f} {load * 1000:>8.2f} "
+                f"{percentile(latencies, 0.5) * 1000:>7.3f} "
+                f"{percentile(latencies, 0.95) * 1000:>7.3f} {disk / 1024:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
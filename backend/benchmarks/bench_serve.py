@@ -0,0 +1,203 @@
+"""
+HTTP throughput of `edison-ai-serve` as workers are added, and graceful drain.
+
+Starts the production server with the fake model provider and the shared
+SQLite checkpointer for each `--workers` count, replays the recorded sessions
+in benchmarks/sessions/*.json through the CopilotKit endpoint with
+`--sessions` concurrent sessions, and reports turns/sec. Each turn of a
+session may land on a different worker, so a completed session also shows
+the shared checkpointer keeps conversations consistent. Scrapes /metrics a
+few times after each load, which must report the same totals from whichever
+worker answers. Finally sends SIGTERM while turns are in flight and checks
+every one of them still completes.
+
+Exits non-zero on failed turns, on metrics that differ between workers, on an
+unclean drain, or when throughput at the highest worker count is below
+`--min-efficiency` of linear scaling. The scaling check is skipped when the
+host has fewer cores than workers.
+
+    python -m benchmarks.bench_serve [--workers 1 2 4] [--sessions 32]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.bench_load import load_sessions, video_ids, write_fixtures
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "edison_ai.serve", "--workers", str(workers), "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited with status {server.returncode} on startup")
+        time.sleep(0.2)
+    server.kill()
+    raise SystemExit("Server did not become healthy")
+
+
+async def turn(client: httpx.AsyncClient, thread_id: str, messages: list) -> bool:
+    """Send one turn and report whether the run streamed through to its end."""
+    body = {
+        "name": "edison_ai",
+        "threadId": thread_id,
+        "nodeName": "__end__",
+        "state": {},
+        "messages": messages,
+    }
+    response = await client.post("/copilotkit/agents/execute", json=body)
+    lines = response.text.strip().splitlines()
+    if response.status_code != 200 or not lines:
+        return False
+    last = json.loads(lines[-1])
+    return last.get("event") == "on_copilotkit_state_sync" and last.get("active") is False
+
+
+async def replay(client, turns, video_id) -> int:
+    thread_id = str(uuid.uuid4())
+    messages = []
+    for text in turns:
+        messages.append({"id": str(uuid.uuid4()), "role": "user", "content": text.format(video_id=video_id)})
+        if not await turn(client, thread_id, messages):
+            return -1
+    return len(turns)
+
+
+async def run_load(port: int, sessions, videos, concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", timeout=300, limits=limits
+    ) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                replay(client, sessions[i % len(sessions)][1], videos[i % len(videos)])
+                for i in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    failed = sum(1 for result in results if result < 0)
+    return sum(result for result in results if result > 0), elapsed, failed
+
+
+def scrape_node_runs(port: int, scrapes: int, interval: float) -> list:
+    """Total graph node runs reported by `scrapes` scrapes of /metrics."""
+    # Let every worker publish what it counted during the load
+    time.sleep(interval * 2)
+    totals = []
+    for _ in range(scrapes):
+        text = httpx.get(f"http://127.0.0.1:{port}/metrics").text
+        totals.append(
+            sum(
+                float(line.rsplit(" ", 1)[1])
+                for line in text.splitlines()
+                if line.startswith("edison_node_runs_total{")
+            )
+        )
+    return totals
+
+
+async def run_drain(server: subprocess.Popen, port: int, video_id: str, requests: int):
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300) as client:
+        message = [{"id": "m1", "role": "user", "content": f"https://youtu.be/{video_id}"}]
+        pending = [
+            asyncio.ensure_future(turn(client, str(uuid.uuid4()), message))
+            for _ in range(requests)
+        ]
+        # Let the requests reach the workers before asking them to drain
+        await asyncio.sleep(0.5)
+        server.send_signal(signal.SIGTERM)
+        return await asyncio.gather(*pending)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cores = os.cpu_count() or 1
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, min(cores, 4)}))
+    parser.add_argument("--sessions", type=int, default=32, help="Concurrent sessions")
+    parser.add_argument("--videos", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--drain-requests", type=int, default=16)
+    parser.add_argument("--min-efficiency", type=float, default=0.5)
+    parser.add_argument("--metrics-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    source = tempfile.mkdtemp()
+    write_fixtures(source, args.videos)
+    sessions = load_sessions()
+    videos = video_ids(args.videos)
+
+    throughput = {}
+    for workers in args.workers:
+        env = {
+            **os.environ,
+            "EDISON_MODEL_PROVIDER": "fake",
+            "EDISON_CHECKPOINTER": "sqlite",
+            "EDISON_TRANSCRIPT_SOURCE_DIR": source,
+            "EDISON_CACHE_DIR": tempfile.mkdtemp(),
+            "EDISON_METRICS_FLUSH_INTERVAL": str(args.metrics_interval),
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "offline"),
+        }
+        server = start_server(workers, args.port, env)
+        try:
+            turns, elapsed, failed = asyncio.run(run_load(args.port, sessions, videos, args.sessions))
+            node_runs = scrape_node_runs(args.port, workers * 4, args.metrics_interval)
+            last = workers == args.workers[-1]
+            drained = asyncio.run(run_drain(server, args.port, videos[0], args.drain_requests)) if last else None
+            if last:
+                server.wait(timeout=60)
+        finally:
+            if server.poll() is None:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+
+        throughput[workers] = turns / elapsed
+        print(f"{workers:>3} workers: {turns} turns in {elapsed:.1f}s, {turns / elapsed:.1f} turns/s")
+        if failed:
+            raise SystemExit(f"{failed} sessions failed with {workers} workers")
+        if len(set(node_runs)) != 1 or node_runs[0] < turns:
+            raise SystemExit(f"/metrics node runs differ between scrapes: {node_runs}")
+
+    completed = sum(drained)
+    print(
+        f"drain: {completed}/{len(drained)} in-flight turns completed, "
+        f"server exited with status {server.returncode}"
+    )
+    if completed != len(drained) or server.returncode != 0:
+        raise SystemExit("Graceful drain dropped in-flight turns")
+
+    most = max(throughput)
+    if most > 1 and cores >= most:
+        efficiency = throughput[most] / (throughput[min(throughput)] * most / min(throughput))
+        print(f"scaling efficiency at {most} workers: {efficiency:.0%}")
+        if efficiency < args.min_efficiency:
+            raise SystemExit(f"Throughput does not scale with workers ({efficiency:.0%} of linear)")
+    else:
+        print(f"{cores} cores: scaling to {most} workers not checked")
+
+
+if __name__ == "__main__":
+    main()
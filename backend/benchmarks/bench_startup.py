@@ -0,0 +1,144 @@
+"""
+Cold-start cost of importing the agent, from `python -X importtime`.
+
+Imports `edison_ai.agent` in fresh interpreters started outside the backend
+directory and reports the median import time, the slowest modules, and the
+time to build the graph on first use. Also checks that the import reads no
+data files and loads neither provider SDKs, which are only needed once a
+model is built, nor numpy, which is only needed for retrieval.
+
+Exits non-zero when an import loads a lazy module or reads a data file, or
+when the median import time exceeds `--budget-ms`.
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Only imported once a model of that provider is built, or a retrieval index is used.
+# rich is not checked: httpx imports it for its command line whenever it is installed
+LAZY_MODULES = ("langchain_openai", "langchain_anthropic", "openai", "anthropic", "numpy")
+
+CODE_SUFFIXES = (".py", ".pyc", ".so", ".pyd", ".pth")
+
+CHILD = """
+import json, sys, time
+opened = []
+sys.addaudithook(lambda event, args: event == "open" and opened.append(str(args[0])))
+started = time.perf_counter()
+import edison_ai.agent as agent
+imported = time.perf_counter()
+loaded = [name for name in LAZY_MODULES if name in sys.modules]
+files = [path for path in opened if not path.endswith(CODE_SUFFIXES)]
+agent.get_graph()
+built = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "graph": built - imported,
+    "loaded": loaded,
+    "files": files,
+}))
+"""
+
+
+def run_child(env: dict, cwd: str) -> tuple:
+    """Import the agent once; returns (child report, per-module import times)."""
+    code = f"LAZY_MODULES = {LAZY_MODULES!r}\nCODE_SUFFIXES = {CODE_SUFFIXES!r}\n{CHILD}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Import failed:\n{result.stderr[-4000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """{module: (self us, cumulative us)} from `-X importtime` output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def is_data_file(path: str) -> bool:
+    """Files read at import that belong to the project rather than to installed packages."""
+    prefixes = {sys.prefix, sys.base_prefix, sys.exec_prefix}
+    return not any(os.path.abspath(path).startswith(prefix) for prefix in prefixes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get("PYTHONPATH")])),
+        "EDISON_MODEL_PROVIDER": "fake",
+        "EDISON_CHECKPOINTER": "bounded",
+        "EDISON_CACHE_DIR": tempfile.mkdtemp(),
+    }
+    # A directory without transcript.txt or .env, like a worker started elsewhere
+    cwd = tempfile.mkdtemp()
+
+    # The first run also writes bytecode caches; keep it out of the timings
+    run_child(env, cwd)
+    reports, modules = [], {}
+    for _ in range(args.runs):
+        report, modules = run_child(env, cwd)
+        reports.append(report)
+
+    import_ms = statistics.median(report["import"] for report in reports) * 1000
+    graph_ms = statistics.median(report["graph"] for report in reports) * 1000
+    print(f"import edison_ai.agent: {import_ms:.0f} ms (median of {args.runs})")
+    print(f"first get_graph():      {graph_ms:.0f} ms")
+
+    print("\nslowest modules by self time, import and first get_graph() (last run):")
+    for name, (self_us, cumulative_us) in sorted(
+        modules.items(), key=lambda item: item[1][0], reverse=True
+    )[: args.top]:
+        print(f"  {self_us / 1000:8.1f} ms self {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+    packages = {}
+    for name, (self_us, _) in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nslowest packages by total self time:")
+    for name, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[
+        : args.top
+    ]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    report = reports[-1]
+    files = [path for path in report["files"] if is_data_file(path)]
+    failures = []
+    if report["loaded"]:
+        failures.append(f"import loaded lazy modules: {', '.join(report['loaded'])}")
+    if files:
+        failures.append(f"import read files: {', '.join(files)}")
+    if import_ms > args.budget_ms:
+        failures.append(f"import took {import_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
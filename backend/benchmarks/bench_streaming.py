@@ -0,0 +1,102 @@
+"""
+Time-to-first-content for streamed lessons and quizzes.
+
+Runs a fresh session through the real graph with a fake streaming model and
+records when the first partial lesson and the first complete QuizQuestion
+reach the CopilotKit intermediate-state stream, compared with when the full
+generation finishes. Exits non-zero if the first content does not arrive well
+before the end of the generation.
+
+    python -m benchmarks.bench_streaming [--questions 10] [--chunk-latency 0.01]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+VIDEO_ID = "dQw4w9WgXcQ"
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+
+
+def quiz_responder(questions: int):
+    from edison_ai.models.fake import default_responder, fake_instance
+    from edison_ai.schema import Quiz, QuizQuestion
+
+    def respond(schema, messages):
+        if schema is Quiz:
+            quiz = fake_instance(Quiz)
+            quiz.questions = [fake_instance(QuizQuestion) for _ in range(questions)]
+            return quiz
+        if schema is None:
+            return "Hello, today we will work together to learn about LangGraph. " * 40
+        return default_responder(schema, messages)
+
+    return respond
+
+
+async def run(args):
+    from langchain_core.messages import HumanMessage
+
+    from edison_ai import agent
+    from edison_ai.models.fake import FakeChatModel
+
+    agent.model = FakeChatModel(
+        responder=quiz_responder(args.questions),
+        latency=args.latency,
+        chunk_latency=args.chunk_latency,
+    )
+    config = {"configurable": {"thread_id": "streaming-benchmark"}}
+
+    start = time.perf_counter()
+    first = {}
+    ends = {}
+    async for event in agent.graph.astream_events(
+        {"messages": [HumanMessage(content=f"https://youtu.be/{VIDEO_ID}")]},
+        config,
+        version="v2",
+    ):
+        now = time.perf_counter() - start
+        node = event["metadata"].get("langgraph_node")
+        if event["event"] == "on_chain_end" and event["name"] in ("summarize_transcript", "create_quiz"):
+            ends[event["name"]] = now
+        if not event["metadata"].get("copilotkit:force-emit-intermediate-state"):
+            continue
+        if event["event"] == "on_chain_end" and node not in first:
+            first[node] = now
+    return first, ends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake time to first token")
+    parser.add_argument("--chunk-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # Serve the transcript locally and start from empty caches
+    source = tempfile.mkdtemp()
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        text = file.read()
+    with open(os.path.join(source, f"{VIDEO_ID}.txt"), "w", encoding="utf-8") as file:
+        file.write(text)
+    os.environ["EDISON_TRANSCRIPT_SOURCE_DIR"] = source
+    os.environ["EDISON_CACHE_DIR"] = tempfile.mkdtemp()
+
+    first, ends = asyncio.run(run(args))
+
+    failed = False
+    lesson_start = 0.0
+    for node in ("summarize_transcript", "create_quiz"):
+        duration = ends[node] - lesson_start
+        ttfc = first.get(node, float("inf")) - lesson_start
+        print(f"{node:<22} first content {ttfc:6.2f}s   complete {duration:6.2f}s")
+        failed |= ttfc > args.latency + duration / 2
+        lesson_start = ends[node]
+    if failed:
+        raise SystemExit("first content did not arrive before the generation finished")
+
+
+if __name__ == "__main__":
+    main()
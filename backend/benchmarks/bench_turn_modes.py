@@ -0,0 +1,85 @@
+"""
+Compare the classic (router -> extract -> analyze) and fused turn modes.
+
+Replays a scripted assessment conversation through the real graph with a
+deterministic fake chat model and reports LLM calls, prompt tokens and wall
+time per student turn for each mode.
+
+    python -m benchmarks.bench_turn_modes [--latency 0.8] [--turns 8]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from edison_ai import agent
+from edison_ai.models.fake import FakeChatModel, fake_instance
+from edison_ai.schema import FusedTurn, ResponseAssessment
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+
+
+def scripted_responder(schema, messages):
+    wants_quiz = "quiz" in str(messages[-1].content).lower()
+    if schema is None:
+        return "What do you remember about how LangGraph models an agent?"
+    response = fake_instance(schema)
+    if schema is ResponseAssessment:
+        response.should_create_quiz.bool_value = wants_quiz
+        response.should_extract_student_response.bool_value = not wants_quiz
+    elif schema is FusedTurn:
+        response.should_create_quiz.bool_value = wants_quiz
+        response.next_question = "" if wants_quiz else "How would you apply this?"
+    return response
+
+
+async def run_session(turn_mode: str, turns: int, latency: float):
+    fake = FakeChatModel(responder=scripted_responder, latency=latency)
+    agent.model = fake
+    graph = agent.build_graph(turn_mode).compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        transcript = file.read()
+    # Start after the lesson has been generated: only student turns are measured
+    await graph.aupdate_state(
+        config, {"transcript": transcript, "lesson_explanation": transcript[:8000]}
+    )
+
+    results = []
+    for turn in range(turns):
+        text = "Make me a quiz" if turn == turns - 1 else f"My answer number {turn}"
+        calls, tokens = fake.calls, fake.prompt_tokens
+        start = time.perf_counter()
+        await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+        results.append(
+            (time.perf_counter() - start, fake.calls - calls, fake.prompt_tokens - tokens)
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.8, help="Seconds per fake LLM call")
+    args = parser.parse_args()
+
+    print(f"{'mode':<9}{'turns':>6}{'calls/turn':>12}{'tokens/turn':>13}{'s/turn':>9}")
+    for turn_mode in ("classic", "fused"):
+        results = asyncio.run(run_session(turn_mode, args.turns, args.latency))
+        n = len(results)
+        print(
+            f"{turn_mode:<9}{n:>6}"
+            f"{sum(r[1] for r in results) / n:>12.2f}"
+            f"{sum(r[2] for r in results) / n:>13.0f}"
+            f"{sum(r[0] for r in results) / n:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
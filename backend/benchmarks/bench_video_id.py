@@ -0,0 +1,97 @@
+"""
+Benchmark for the deterministic YouTube video-ID extractor.
+
+Checks `extract_video_id` against a corpus of URL shapes and reports the
+per-call cost next to the LLM round-trip it replaces on session start.
+
+    python -m benchmarks.bench_video_id [--llm-latency 1.5]
+"""
+
+import argparse
+import timeit
+
+from edison_ai.transcripts import extract_video_id
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+# (input, expected video ID)
+CORPUS = [
+    (f"https://www.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+    (f"https://youtube.com/watch?v={VIDEO_ID}&t=42s", VIDEO_ID),
+    (f"https://www.youtube.com/watch?feature=share&v={VIDEO_ID}&list=PL123", VIDEO_ID),
+    (f"http://m.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+    (f"https://music.youtube.com/watch?v={VIDEO_ID}&si=abc", VIDEO_ID),
+    (f"www.youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+    (f"youtube.com/watch?v={VIDEO_ID}", VIDEO_ID),
+    (f"https://youtu.be/{VIDEO_ID}", VIDEO_ID),
+    (f"https://youtu.be/{VIDEO_ID}?t=10", VIDEO_ID),
+    (f"youtu.be/{VIDEO_ID}?si=XyZ", VIDEO_ID),
+    (f"https://www.youtube.com/shorts/{VIDEO_ID}", VIDEO_ID),
+    (f"https://youtube.com/shorts/{VIDEO_ID}?feature=share", VIDEO_ID),
+    (f"https://www.youtube.com/embed/{VIDEO_ID}", VIDEO_ID),
+    (f"https://www.youtube.com/embed/{VIDEO_ID}?autoplay=1", VIDEO_ID),
+    (f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}", VIDEO_ID),
+    (f"https://www.youtube.com/live/{VIDEO_ID}?si=abc", VIDEO_ID),
+    (f"https://www.youtube.com/v/{VIDEO_ID}", VIDEO_ID),
+    (f"https://www.youtube.com/e/{VIDEO_ID}", VIDEO_ID),
+    (f"https://www.youtube.com/attribution_link?a=x&u=/watch%3Fv%3D{VIDEO_ID}%26feature%3Dshare", VIDEO_ID),
+    (f"HTTPS://WWW.YOUTUBE.COM/watch?v={VIDEO_ID}", VIDEO_ID),
+    (f"Can you teach me this? https://www.youtube.com/watch?v={VIDEO_ID} thanks!", VIDEO_ID),
+    (f"<https://youtu.be/{VIDEO_ID}>", VIDEO_ID),
+    (f"{VIDEO_ID}", VIDEO_ID),
+    (f"  {VIDEO_ID}\n", VIDEO_ID),
+    ("https://www.youtube.com/watch?v=_-aB3_-xY9z", "_-aB3_-xY9z"),
+    ("abcDefGhijk", "abcDefGhijk"),
+    # Nothing to extract: these fall back to the LLM parser
+    ("I want to learn about LangGraph", None),
+    ("https://www.youtube.com/watch?v=tooshort", None),
+    ("https://www.youtube.com/@somechannel", None),
+    ("https://vimeo.com/123456789", None),
+    ("", None),
+    # Single 11-letter words, which are prose rather than video IDs
+    ("Explanation", None),
+    ("programming", None),
+    ("PROGRAMMING", None),
+]
+
+
+def check_corpus() -> None:
+    failures = [
+        (text, expected, extract_video_id(text))
+        for text, expected in CORPUS
+        if extract_video_id(text) != expected
+    ]
+    for text, expected, actual in failures:
+        print(f"FAIL {text!r}: expected {expected!r}, got {actual!r}")
+    if failures:
+        raise SystemExit(1)
+    print(f"corpus: {len(CORPUS)} inputs ok")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=10_000)
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=1.5,
+        help="Typical YouTubeURLParser round-trip in seconds, for comparison",
+    )
+    args = parser.parse_args()
+
+    check_corpus()
+
+    inputs = [text for text, _ in CORPUS]
+    total = timeit.timeit(
+        lambda: [extract_video_id(text) for text in inputs], number=args.number
+    )
+    per_call = total / (args.number * len(inputs))
+    print(f"extract_video_id: {per_call * 1e6:.2f} us/call")
+    print(
+        f"saved per session vs LLM parser: ~{args.llm_latency:.2f} s "
+        f"({args.llm_latency / per_call:,.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
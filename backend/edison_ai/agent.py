@@ -1,15 +1,14 @@
 import logging
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage, AIMessage
 
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, StateGraph
 from langgraph.graph.graph import CompiledGraph
-from .models.models import model
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.logging import RichHandler
-from typing import List, Dict, Any
+from langchain_core.language_models import BaseChatModel
+from .models.clients import chat, structured_output
+from .models.models import get_default_model
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import json
 from .schema import (
     EXTRACT_STUDENT_RESPONSE,
@@ -17,77 +16,127 @@ from .schema import (
     AgentState,
     QuestionResponse,
     ResponseAssessment,
-    StudentAssessment,
     StudentLevelAssessment,
     CREATE_QUIZ,
     ANALYZE_STUDENT_LEVEL,
     SUMMARIZE_TRANSCRIPT,
     YouTubeURLParser,
     TRANSCRIBE_YOUTUBE,
+    FUSED_TURN,
+    GRADE_QUIZ,
+    FusedTurn,
     Quiz,
+    assessment_patch,
 )
-from langgraph.checkpoint.memory import MemorySaver
-from youtube_transcript_api import YouTubeTranscriptApi
-
-# Set up rich logging
-logging.basicConfig(
-    level="INFO",
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True)],
+from .artifacts import get_artifact_cache, level_bucket, model_name
+from .checkpoint import get_checkpointer
+from .grading import grade_answers, parse_answers
+from .metrics import install_metrics
+from .config import DEBUG_PANELS, QUIZ_MODE, RETRIEVAL_ENABLED, RETRIEVAL_TOP_K, TURN_MODE
+from .context import ContextWindow
+from .prompts import (
+    ANALYZE_STUDENT_LEVEL_PROMPT,
+    CREATE_QUIZ_PROMPT,
+    EXTRACT_STUDENT_RESPONSE_PROMPT,
+    FUSED_TURN_PROMPT,
+    ROUTER_PROMPT,
 )
+from .quiz import get_quiz_generator
+from .retrieval import format_passages, get_index_store
+from .routing import classify_turn, record_route
+from .streaming import OnQuestions, OnText, state_emitter, stream_quiz
+from .summarize import get_summarizer
+from .tokens import generation_tokens
+from .transcripts import Transcript, extract_video_id, get_transcript_store, transcript_text
 
-# Disable logging for HTTP requests
-logging.getLogger("httpx").setLevel(logging.WARNING)
-logging.getLogger("httpcore").setLevel(logging.WARNING)
+logger = logging.getLogger("uvicorn.info")
 
 
-logger = logging.getLogger("uvicorn.info")
-console = Console()
+def configure_logging() -> None:
+    """Rich console logging for the server; rich is only imported when this runs."""
+    from rich.logging import RichHandler
+
+    logging.basicConfig(
+        level="INFO",
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(rich_tracebacks=True)],
+    )
+    # Disable logging for HTTP requests
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+
+def debug_panel(body: str, title: str, border_style: str, markdown: bool = True) -> None:
+    """Print `body` in a rich panel, for EDISON_DEBUG_PANELS."""
+    from rich.console import Console
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+
+    Console().print(
+        Panel(Markdown(body) if markdown else body, title=title, border_style=border_style)
+    )
+
+
+# The chat model every node calls. None means the configured model, built on first
+# use; benchmarks assign a fake model here
+model: Optional[BaseChatModel] = None
+
+
+def chat_model() -> BaseChatModel:
+    return model if model is not None else get_default_model()
+
 
-with open("transcript.txt", "r") as file:
-    transcript = file.read()
+context_window = ContextWindow()
+
+
+def partial_state(state: AgentState) -> Dict[str, Any]:
+    """The state sent along with intermediate updates; messages are synced separately."""
+    return state.model_dump(exclude={"messages"})
 
 
 def goto_route(state: AgentState):
     return state.route or END
 
 
+# Transcript passages retrieved per node; routing needs far less than a quiz
+RETRIEVAL_K = {
+    ROUTER: max(1, RETRIEVAL_TOP_K // 2),
+    CREATE_QUIZ: RETRIEVAL_TOP_K * 2,
+}
+
+
+async def lesson_context(
+    state: AgentState, node: str, messages: Sequence[AnyMessage]
+) -> Optional[str]:
+    """
+    The transcript passages most relevant to the current turn, used in place of
+    the whole lesson. Falls back to the lesson when retrieval is disabled, the
+    video is unknown or nothing in the transcript matches the turn.
+    """
+    if not (RETRIEVAL_ENABLED and state.video_id):
+        return state.lesson_explanation
+
+    video_id = state.video_id
+    index = await get_index_store().get(
+        video_id, lambda: get_transcript_store().get(video_id)
+    )
+    query = [str(message.content) for message in messages[-2:]]
+    if node == CREATE_QUIZ and state.assessment:
+        # Steer the quiz towards what the student still has to work on
+        query.extend(state.assessment.areas_for_improvement)
+    passages = index.search(" ".join(query), RETRIEVAL_K.get(node, RETRIEVAL_TOP_K))
+    return format_passages(passages) if passages else state.lesson_explanation
+
+
 async def router_assessment(state: AgentState):
-    relevant_messages = state.messages
-    system_message = SystemMessage(
-        f"""
-        You are an assistant that is helping students learn from lesson transcripts. 
-        Your goal is to determine the student's level by asking them questions to determine their knowledge on the topic.
-        Then based on the student's level of understanding on the topic, you have to create a quiz based on the transcript.
-        Based on the messages in the chat, determine if the student level assessment is done or not and based on that decide if we should still assess the student's level or move on to create a quiz.
-         Here is the transcript:
-        {state.lesson_explanation if state.lesson_explanation else "No transcript available"}
-        
-        here is the StudentAssessment schema that needs to be filled out before we can create a quiz:
-        ```json
-        {StudentAssessment.schema_json()}
-        ```
-        
-        Here is the current state of the StudentAssessment:
-        {state.assessment if state.assessment else "No assessment available"}
-        
-        Your actual goal is to accurately assess whether we need to assess the student's level or create a quiz based on the transcript.
-        we can only create a quiz if the student's level has been assessed. 
-        
-        if the student is answering an assessment question, you should hydrate the StudentAssessment schema with the student's response by extracting the relevant information from the student's response.
-        if the student is answering a quiz question, you should provide feedback on the student's response.
-        if The student has provided a response to the assessment question, you should extract the relevant information from the student's response.
-
-        Create a quiz if the student asks for one.
-
-        Review the conversation and assess the student response to determine next steps in the conversation.    
-        If you get this wrong, my boss will make me cry.
-        """
+    relevant_messages = context_window.messages_for(state, ROUTER)
+    system_message = ROUTER_PROMPT.message(
+        lesson=await lesson_context(state, ROUTER, relevant_messages),
+        assessment=state.assessment,
+        summary=state.conversation_summary,
     )
-    response = await model.with_structured_output(
-        ResponseAssessment, strict=True
-    ).ainvoke(
+    response = await structured_output(chat_model(), ResponseAssessment, strict=True).ainvoke(
         [
             system_message,
             *relevant_messages,
@@ -101,240 +150,278 @@ async def router(state: AgentState, config: RunnableConfig) -> AgentState:
     if not state.transcript:
         return {"route": TRANSCRIBE_YOUTUBE}
 
+    update = await context_window.summarize(state, chat_model())
+    route = classify_turn(state)
+    if route is not None:
+        record_route("rule", route)
+        return {**update, "route": route}
+
     assessment = await router_assessment(state)
-    console.print(
-        Panel(
+    if DEBUG_PANELS:
+        debug_panel(
             json.dumps(assessment.dict(), indent=2),
             title="Router Assessment",
             border_style="default",
+            markdown=False,
         )
-    )
     if assessment.should_extract_student_response.bool_value:
-        return {"route": EXTRACT_STUDENT_RESPONSE}
+        route = EXTRACT_STUDENT_RESPONSE
     elif assessment.should_create_quiz.bool_value:
-        return {"route": CREATE_QUIZ}
+        route = CREATE_QUIZ
     elif assessment.should_analyze_student_level.bool_value:
-        return {"route": ANALYZE_STUDENT_LEVEL}
-
+        route = ANALYZE_STUDENT_LEVEL
     else:
-        return {"route": ANALYZE_STUDENT_LEVEL}
+        route = ANALYZE_STUDENT_LEVEL
+    record_route("llm", route)
+    return {**update, "route": route}
 
 async def transcribe_youtube(state: AgentState) -> AgentState:
     user_input = state.messages[-1].content if state.messages else ""
-    parsed_url: YouTubeURLParser = model.with_structured_output(
-        YouTubeURLParser
-    ).invoke(
-        [
-            SystemMessage(content="Parse the YouTube URL and return the video ID"),
-            HumanMessage(content=user_input),
-        ]
-    )
-    video_id: str = parsed_url.url.split("v=")[1]
-    transcript: List[Dict[str, Any]] = YouTubeTranscriptApi.get_transcript(video_id)
-    full_transcript: str = " ".join(entry["text"] for entry in transcript)
+    video_id = extract_video_id(user_input)
+    if video_id is None:
+        # Only ask the model when the deterministic extractor finds nothing
+        parsed_url: YouTubeURLParser = await structured_output(
+            chat_model(), YouTubeURLParser
+        ).ainvoke(
+            [
+                SystemMessage(content="Parse the YouTube URL and return the video ID"),
+                HumanMessage(content=user_input),
+            ]
+        )
+        video_id = extract_video_id(parsed_url.url)
+    if video_id is None:
+        raise ValueError(f"Could not find a YouTube video in: {user_input!r}")
+    transcript: List[Dict[str, Any]] = await get_transcript_store().get(video_id)
     return {
-        "transcript": full_transcript,
+        "video_id": video_id,
+        "transcript": transcript_text(transcript),
     }
 
 
-async def summarize_transcript(state: AgentState, config: RunnableConfig) -> AgentState:
-    system_message = SystemMessage(
-        content=f"""
-
-        You are an expert educator tasked with translating a YouTube transcript into a lesson plan designed to personalize and enhance students' learning process. You should be clear, concise and logical in the way you present this lesson plan.  
-It would be best to show empathy to your students who may not speak the language and are experiencing other challenges of ability and cultural difference. You have a friendly personality and you are eager to help your students learn the material.
-Open your lessons with a friendly greeting: 
-“Hello, today we will work together to learn about the <topic of the video transcript>.  You will read the lesson I have prepared for you and afterward, you can answer questions on the content. When you are ready, you can take a multiple-choice quiz to test your knowledge. So, are you ready? Let’s go!”
-
-Follow these steps:
-        1. Review the transcript:
-        - Identify the main points and concepts
-        - Identify the key ideas and supporting details.
-
-        2. Organize the content into a lesson plan 
-        - structure the content to make it accessible to students
-        - Group related concepts together for clarity.
-
-        3. Explain key concepts:
-        - Define and explain each important concept from the transcript.
-        - Use simple language and provide concrete examples where appropriate to aid understanding.
-
-        4. Highlight how concepts are related to one another:
-        - Explain cause-and-effect relationships or interdependencies.
-
-        5. Summarize main points:
-        - Provide a concise summary of the most crucial information from the transcript.
-        - Ensure that the core message of the lecture is conveyed accurately.
-
-        6. Use analogies or real-world examples:
-        - Where possible, include analogies or visual examples to make abstract concepts more relatable.
-
-        7. Address potential areas of confusion:
-        - Anticipate parts of the transcript that might be challenging for students and provide additional clarification.
-
-        8. Review key takeaways:
-        - Conclude with a brief recap of the most important points from the transcript.
+async def generate_lesson(
+    transcript: Transcript, on_text: Optional[OnText] = None
+) -> Tuple[str, int]:
+    """
+    Generate a lesson plan from transcript segments; returns (lesson, tokens spent).
+    Long transcripts are summarized chunk by chunk before the lesson is written.
+    `on_text` receives the lesson so far while it streams.
+    """
+    return await get_summarizer().summarize(chat_model(), transcript, on_text)
 
-        Your output should be a clear, well-structured explanation that effectively communicates the content from the transcript. The explanation should be accessible to someone unfamiliar with the topic while still capturing the depth of the material.
 
-        Now, please explain the key concepts based on the following transcript:
-        
-End your response with 
-"I have explained the key concepts from the lecture transcript. If this looks good, and you are ready to move on, please let me know, so that we can move on to the next step and assess your understanding of the topic so that I can prepare a quiz for you."
+async def generate_quiz(
+    lesson: Optional[str],
+    assessment: Optional[StudentLevelAssessment],
+    summary: Optional[str] = None,
+    messages: Sequence[AnyMessage] = (),
+    on_questions: Optional[OnQuestions] = None,
+) -> Tuple[Quiz, int]:
     """
-    )
+    Generate a quiz for the student's level; returns (quiz, tokens spent).
+    `on_questions` receives the partial quiz each time a question completes.
+    With EDISON_QUIZ_MODE=parallel the questions are written concurrently.
+    """
+    if QUIZ_MODE == "parallel":
+        return await get_quiz_generator().generate(
+            chat_model(), lesson, assessment, summary, messages, on_questions
+        )
+    prompt = [
+        CREATE_QUIZ_PROMPT.message(
+            lesson=lesson, assessment=assessment, summary=summary
+        ),
+        *messages,
+    ]
+    quiz = await stream_quiz(chat_model(), prompt, on_questions)
+    return quiz, generation_tokens(prompt, quiz.model_dump_json())
 
-    response = await model.ainvoke([system_message])
-    console.print(
-        Panel(
-            Markdown(response.content), title="Transcript Summary", border_style="green"
+
+async def summarize_transcript(state: AgentState, config: RunnableConfig) -> AgentState:
+    artifacts = get_artifact_cache()
+    lesson = None
+    if state.video_id:
+        lesson = await artifacts.get_lesson(state.video_id, model_name(chat_model()))
+    if lesson is None:
+        if state.video_id:
+            transcript = await get_transcript_store().get(state.video_id)
+        else:
+            transcript = [{"text": state.transcript or "", "start": 0.0, "duration": 0.0}]
+        lesson, tokens = await generate_lesson(
+            transcript,
+            state_emitter(config, partial_state(state), "lesson_explanation"),
         )
-    )
-    return {"lesson_explanation": response.content}
+        if state.video_id:
+            await artifacts.set_lesson(state.video_id, model_name(chat_model()), lesson, tokens)
 
+    if DEBUG_PANELS:
+        debug_panel(lesson, title="Transcript Summary", border_style="green")
+    return {"lesson_explanation": lesson}
 
-async def create_quiz(state: AgentState, config: RunnableConfig) -> AgentState:
-    system_message = SystemMessage(
-        content=f"""
-    Your role is to create a structured quiz based on the transcript and the student's assessed level. The quiz should be output as a structured JSON object following the Quiz schema.
-
-    Here is the transcript for reference: {state.lesson_explanation}
-
-    Student assessment: {state.assessment or "No assessment available"}
-
-    Create a quiz that:
-    1. Matches the student's assessed level
-    2. Covers the key concepts from the transcript
-    3. Includes a mix of question difficulties
-    4. Tests different cognitive skills (recall, comprehension, application, etc.)
-    5. Provides explanations for correct and incorrect answers
-
-    Each question should include:
-    - Clear question text
-    - 4 possible answers (1 correct, 3 incorrect)
-    - Difficulty level
-    - Topic covered
-    - Skill being tested
-    - Explanations for answers
-
-    Format the output as a Quiz object following this schema:
-    ```json
-    {Quiz.schema_json()}
-    ```
-    """
-    )
 
-    response = await model.with_structured_output(Quiz).ainvoke(
-        [system_message, *state.messages]
-    )
-    
-    console.print(
-        Panel(
-            Markdown(json.dumps(response.dict(), indent=2)),
+async def create_quiz(state: AgentState, config: RunnableConfig) -> AgentState:
+    # Quizzes are shared by every student of the same video at the same level
+    artifacts = get_artifact_cache()
+    level = level_bucket(state.assessment)
+    response = None
+    if state.video_id:
+        response = await artifacts.get_quiz(state.video_id, model_name(chat_model()), level)
+    if response is None:
+        messages = context_window.messages_for(state, CREATE_QUIZ)
+        response, tokens = await generate_quiz(
+            await lesson_context(state, CREATE_QUIZ, messages),
+            state.assessment,
+            state.conversation_summary,
+            messages,
+            state_emitter(config, partial_state(state), "quiz"),
+        )
+        if state.video_id:
+            await artifacts.set_quiz(
+                state.video_id, model_name(chat_model()), level, response, tokens
+            )
+
+    if DEBUG_PANELS:
+        debug_panel(
+            json.dumps(response.dict(), indent=2),
             title="Generated Quiz",
-            border_style="yellow"
+            border_style="yellow",
         )
-    )
     
     return {
         # "messages": [AIMessage(content=json.dumps(response.dict(), indent=2))],
-        "quiz": response
+        "quiz": response,
+        "score": None,
     }
 
 
+async def grade_quiz(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Grade quiz answers against the stored quiz, without calling the model."""
+    answers = parse_answers(str(state.messages[-1].content), state.quiz, state.score)
+    score, feedback = grade_answers(state.quiz, state.score, answers)
+    return {"score": score, "messages": [AIMessage(content=feedback)]}
+
+
 async def extract_question_response(
     state: AgentState, config: RunnableConfig
 ) -> AgentState:
-    system_message = SystemMessage(
-        content=f"""
-        Your role is to assess the student's level of understanding on the topic through thoughtful questioning. 
-        You will ask a series of questions, based on the schema, to fill out the StudentAssessment schema.
-
-        here is the StudentAssessment schema that you will be filling out:
-        ```json
-        {StudentAssessment.schema_json()}
-        ```
-
-        Current assessment state:
-        {state.assessment or "No assessment available"}
-        
-        Ask one question at a time, wait for the response, and avoid repetition.
-        """
+    system_message = EXTRACT_STUDENT_RESPONSE_PROMPT.message(
+        assessment=state.assessment, summary=state.conversation_summary
     )
 
-    new_assessment = await model.with_structured_output(StudentLevelAssessment).ainvoke(
+    new_assessment = await structured_output(chat_model(), StudentLevelAssessment).ainvoke(
         [
             system_message,
-            *state.messages,
+            *context_window.messages_for(state, EXTRACT_STUDENT_RESPONSE),
         ]
     )
 
-    # Initialize a new StudentLevelAssessment if none exists
-    if state.assessment is None:
-        state.assessment = StudentLevelAssessment(
-            assessment=StudentAssessment(),
-            overall_level="",
-            strengths=[],
-            areas_for_improvement=[]
-        )
-
-    # Update existing assessment with new data
-    if new_assessment:
-        if new_assessment.assessment:
-            state.assessment.assessment = new_assessment.assessment
-        if new_assessment.overall_level:
-            state.assessment.overall_level = new_assessment.overall_level
-        if new_assessment.strengths:
-            state.assessment.strengths = new_assessment.strengths
-        if new_assessment.areas_for_improvement:
-            state.assessment.areas_for_improvement = new_assessment.areas_for_improvement
-
-    return {"assessment": state.assessment}
+    return {"assessment": assessment_patch(state.assessment, new_assessment)}
 
 
 async def analyze_student_level(
     state: AgentState, config: RunnableConfig
 ) -> AgentState:
-    system_message = SystemMessage(
-        content=f"""
-        Your role is to assess the student's level of understanding on the topic through thoughtful questioning. 
-        You will ask a series of questions, one at a time, to fill out the StudentAssessment schema. 
-        After each question, wait for the student's response before proceeding to the next question.
-        
-        Here is the transcript for reference: {state.lesson_explanation}
-
-        here is the StudentAssessment schema that you will be filling out:
-        ```json
-        {StudentAssessment.schema_json()}
-        ```
-
-        Here is the current state of the StudentAssessment:
-        {state.assessment}
-        
-        Remember to ask only one question at a time and wait for the student's response and do not repeat the question.
-        """
+    messages = context_window.messages_for(state, ANALYZE_STUDENT_LEVEL)
+    system_message = ANALYZE_STUDENT_LEVEL_PROMPT.message(
+        lesson=await lesson_context(state, ANALYZE_STUDENT_LEVEL, messages),
+        assessment=state.assessment,
+        summary=state.conversation_summary,
     )
 
-    question = await model.ainvoke(
-        [
-            system_message,
-            *state.messages,
-        ]
+    question = await chat(chat_model()).ainvoke([system_message, *messages])
+    if DEBUG_PANELS:
+        debug_panel(str(question.content), title="Question", border_style="blue")
+    return {"messages": [AIMessage(content=str(question.content))]}
+
+
+async def fused_router(state: AgentState, config: RunnableConfig) -> AgentState:
+    if not state.transcript:
+        return {"route": TRANSCRIBE_YOUTUBE}
+    update = await context_window.summarize(state, chat_model())
+    route = classify_turn(state)
+    if route in (CREATE_QUIZ, GRADE_QUIZ):
+        record_route("rule", route)
+        return {**update, "route": route}
+    return {**update, "route": FUSED_TURN}
+
+
+async def fused_turn(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Route, update the assessment and ask the next question in one LLM call."""
+    messages = context_window.messages_for(state, FUSED_TURN)
+    system_message = FUSED_TURN_PROMPT.message(
+        lesson=await lesson_context(state, FUSED_TURN, messages),
+        assessment=state.assessment,
+        summary=state.conversation_summary,
     )
-    console.print(
-        Panel(Markdown(question.content), title="Question", border_style="blue")
+
+    turn: FusedTurn = await structured_output(chat_model(), FusedTurn).ainvoke(
+        [system_message, *messages]
     )
-    return {"messages": [AIMessage(content=str(question.content))]}
+    if DEBUG_PANELS:
+        debug_panel(
+            json.dumps(turn.dict(), indent=2),
+            title="Fused Turn",
+            border_style="default",
+            markdown=False,
+        )
+
+    assessment = assessment_patch(state.assessment, turn.assessment)
+    if turn.should_create_quiz.bool_value or not turn.next_question:
+        return {"assessment": assessment, "route": CREATE_QUIZ}
+    return {
+        "assessment": assessment,
+        "messages": [AIMessage(content=turn.next_question)],
+        "route": END,
+    }
 
 
-def build_graph():
+def build_graph(turn_mode: str = TURN_MODE):
+    """
+    Build the tutoring graph.
+
+    Args:
+        turn_mode (str): "classic" runs router -> extract -> analyze as separate
+            LLM calls per student turn; "fused" handles a turn with a single
+            structured call. Defaults to EDISON_TURN_MODE.
+    """
+    if turn_mode not in ("classic", "fused"):
+        raise ValueError(f"Unsupported turn mode: {turn_mode}")
+
     graph = StateGraph(AgentState)
-    graph.add_node(ROUTER, router)
     graph.add_node(SUMMARIZE_TRANSCRIPT, summarize_transcript)
-    graph.add_node(ANALYZE_STUDENT_LEVEL, analyze_student_level)
     graph.add_node(CREATE_QUIZ, create_quiz)
-    graph.add_node(EXTRACT_STUDENT_RESPONSE, extract_question_response)
     graph.add_node(TRANSCRIBE_YOUTUBE, transcribe_youtube)
+    graph.add_node(GRADE_QUIZ, grade_quiz)
+    graph.set_entry_point(ROUTER)
+    graph.add_edge(SUMMARIZE_TRANSCRIPT, CREATE_QUIZ)
+    graph.add_edge(CREATE_QUIZ, END)
+    graph.add_edge(GRADE_QUIZ, END)
+    graph.add_edge(TRANSCRIBE_YOUTUBE, SUMMARIZE_TRANSCRIPT)
+
+    if turn_mode == "fused":
+        graph.add_node(ROUTER, fused_router)
+        graph.add_node(FUSED_TURN, fused_turn)
+        graph.add_conditional_edges(
+            ROUTER,
+            goto_route,
+            {
+                FUSED_TURN: FUSED_TURN,
+                CREATE_QUIZ: CREATE_QUIZ,
+                GRADE_QUIZ: GRADE_QUIZ,
+                TRANSCRIBE_YOUTUBE: TRANSCRIBE_YOUTUBE,
+            },
+        )
+        graph.add_conditional_edges(
+            FUSED_TURN,
+            goto_route,
+            {
+                CREATE_QUIZ: CREATE_QUIZ,
+                END: END,
+            },
+        )
+        return graph
+
+    graph.add_node(ROUTER, router)
+    graph.add_node(ANALYZE_STUDENT_LEVEL, analyze_student_level)
+    graph.add_node(EXTRACT_STUDENT_RESPONSE, extract_question_response)
     graph.add_conditional_edges(
         ROUTER,
         goto_route,
@@ -343,20 +430,31 @@ def build_graph():
             CREATE_QUIZ: CREATE_QUIZ,
             SUMMARIZE_TRANSCRIPT: SUMMARIZE_TRANSCRIPT,
             EXTRACT_STUDENT_RESPONSE: EXTRACT_STUDENT_RESPONSE,
+            GRADE_QUIZ: GRADE_QUIZ,
             TRANSCRIBE_YOUTUBE: TRANSCRIBE_YOUTUBE,
         },
     )
-    graph.set_entry_point(ROUTER)
-    graph.add_edge(SUMMARIZE_TRANSCRIPT, CREATE_QUIZ)
     graph.add_edge(ANALYZE_STUDENT_LEVEL, END)
     graph.add_edge(EXTRACT_STUDENT_RESPONSE, ANALYZE_STUDENT_LEVEL)
-    graph.add_edge(CREATE_QUIZ, END)
-    graph.add_edge(TRANSCRIBE_YOUTUBE, SUMMARIZE_TRANSCRIPT)
     return graph
 
 
-memory = MemorySaver()
-graph: CompiledGraph = build_graph().compile(checkpointer=memory)
+@lru_cache(maxsize=1)
+def get_graph() -> CompiledGraph:
+    """The compiled graph with the configured checkpointer, built on first use."""
+    install_metrics()
+    return build_graph().compile(checkpointer=get_checkpointer())
+
+
+def __getattr__(name: str):
+    # `graph` and `memory` are built when first read, so importing this module
+    # opens no checkpoint database and builds no models
+    if name == "graph":
+        return get_graph()
+    if name == "memory":
+        return get_graph().checkpointer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def generate_response(input_text):
     # Add personality to the AI's responses
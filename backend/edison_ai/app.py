@@ -1,25 +1,40 @@
 """Demo"""
 
 import os
-from fastapi import FastAPI
-import uvicorn
-from copilotkit.integrations.fastapi import add_fastapi_endpoint
-from copilotkit import CopilotKitSDK, LangGraphAgent
-from edison_ai.agent import graph
+from functools import lru_cache
 
-from dotenv import load_dotenv 
-load_dotenv()
+from dotenv import find_dotenv, load_dotenv
 
-app = FastAPI()
-sdk = CopilotKitSDK(
-    agents=[
+# edison_ai.config reads the environment once, when first imported, so .env is loaded
+# before anything below imports it, however the app is launched (main(), uvicorn
+# edison_ai.app:app, edison-ai-serve)
+load_dotenv(find_dotenv(usecwd=True))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import PlainTextResponse  # noqa: E402
+import uvicorn  # noqa: E402
+from copilotkit.integrations.fastapi import add_fastapi_endpoint  # noqa: E402
+from copilotkit import CopilotKitSDK, LangGraphAgent  # noqa: E402
+from edison_ai.agent import configure_logging, get_graph  # noqa: E402
+from edison_ai.metrics import render_metrics  # noqa: E402
+
+configure_logging()
+
+
+@lru_cache(maxsize=1)
+def _agents() -> tuple:
+    # The graph and its checkpointer are built on the first request, not at import
+    return (
         LangGraphAgent(
             name="edison_ai",
             description="Edison AI agent.",
-            agent=graph,
-        )
-    ],
-)
+            agent=get_graph(),
+        ),
+    )
+
+
+app = FastAPI()
+sdk = CopilotKitSDK(agents=lambda context: list(_agents()))
 
 add_fastapi_endpoint(app, sdk, "/copilotkit")
 
@@ -30,6 +45,12 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics, summed over every worker under edison-ai-serve."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 def main():
     """Run the uvicorn server."""
     port = int(os.getenv("PORT", "8000"))
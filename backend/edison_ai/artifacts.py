@@ -0,0 +1,123 @@
+import os
+from typing import Any, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+
+from . import config
+from .cache import DiskCache
+from .catalog import CatalogStore
+from .executor import run_blocking
+from .prompts import PROMPT_VERSION
+from .schema import Quiz, StudentLevelAssessment
+
+LEVEL_BUCKETS = ("beginner", "intermediate", "advanced")
+UNASSESSED = "unassessed"
+
+_LEVEL_KEYWORDS = {
+    "advanced": ("advanced", "expert", "proficient", "strong", "high"),
+    "intermediate": ("intermediate", "moderate", "average", "medium", "developing"),
+    "beginner": ("beginner", "novice", "basic", "introductory", "weak", "low"),
+}
+
+
+def level_bucket(assessment: Optional[StudentLevelAssessment]) -> str:
+    """Map the free-text overall level onto one of LEVEL_BUCKETS."""
+    if assessment is None or not assessment.overall_level:
+        return UNASSESSED
+    level = assessment.overall_level.lower()
+    for bucket, keywords in _LEVEL_KEYWORDS.items():
+        if any(keyword in level for keyword in keywords):
+            return bucket
+    return "intermediate"
+
+
+def model_name(model: BaseChatModel) -> str:
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+
+
+class ArtifactCache:
+    """
+    Cache of generated lesson plans and quizzes.
+
+    Entries are keyed by (kind, video ID, prompt version, model, level bucket),
+    so students watching the same video at the same level share one generation
+    and a prompt or model change never serves stale content. Each entry records
+    the tokens its generation cost, which are counted as saved on every hit.
+    Misses fall back to the pre-generated `catalog`, when there is one.
+    """
+
+    def __init__(
+        self,
+        cache: DiskCache,
+        prompt_version: str = PROMPT_VERSION,
+        catalog: Optional[CatalogStore] = None,
+    ):
+        self.cache = cache
+        self.prompt_version = prompt_version
+        self.catalog = catalog
+        self.stats: Dict[str, Dict[str, int]] = {
+            kind: {"hits": 0, "misses": 0, "saved_tokens": 0} for kind in ("lesson", "quiz")
+        }
+
+    def _key(self, kind: str, video_id: str, model: str, level: str) -> str:
+        return f"{kind}:{video_id}:{self.prompt_version}:{model}:{level}"
+
+    async def _get(self, kind: str, video_id: str, model: str, level: str) -> Optional[Any]:
+        entry = await run_blocking(self.cache.get, self._key(kind, video_id, model, level))
+        if entry is None and self.catalog is not None:
+            entry = await run_blocking(
+                self.catalog.get, kind, video_id, self.prompt_version, model, level
+            )
+        if entry is None:
+            self.stats[kind]["misses"] += 1
+            return None
+        self.stats[kind]["hits"] += 1
+        self.stats[kind]["saved_tokens"] += entry["tokens"]
+        return entry["value"]
+
+    async def _set(
+        self, kind: str, video_id: str, model: str, level: str, value: Any, tokens: int
+    ) -> None:
+        await run_blocking(
+            self.cache.set,
+            self._key(kind, video_id, model, level),
+            {"value": value, "tokens": tokens},
+        )
+
+    async def get_lesson(self, video_id: str, model: str) -> Optional[str]:
+        return await self._get("lesson", video_id, model, "all")
+
+    async def set_lesson(self, video_id: str, model: str, lesson: str, tokens: int) -> None:
+        await self._set("lesson", video_id, model, "all", lesson, tokens)
+
+    async def get_quiz(self, video_id: str, model: str, level: str) -> Optional[Quiz]:
+        value = await self._get("quiz", video_id, model, level)
+        return Quiz.model_validate(value) if value is not None else None
+
+    async def set_quiz(
+        self, video_id: str, model: str, level: str, quiz: Quiz, tokens: int
+    ) -> None:
+        await self._set("quiz", video_id, model, level, quiz.model_dump(), tokens)
+
+    def hit_rate(self, kind: str) -> float:
+        stats = self.stats[kind]
+        total = stats["hits"] + stats["misses"]
+        return stats["hits"] / total if total else 0.0
+
+
+_artifacts: Optional[ArtifactCache] = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Return the process-wide artifact cache, configured from the environment."""
+    global _artifacts
+    if _artifacts is None:
+        _artifacts = ArtifactCache(
+            DiskCache(
+                config.ARTIFACT_CACHE_DIR,
+                max_bytes=config.ARTIFACT_CACHE_MAX_BYTES,
+                ttl=config.ARTIFACT_CACHE_TTL,
+            ),
+            catalog=CatalogStore(config.CATALOG_DB) if os.path.exists(config.CATALOG_DB) else None,
+        )
+    return _artifacts
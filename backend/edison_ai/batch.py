@@ -0,0 +1,254 @@
+"""Pre-generate lesson plans and quizzes for a course catalog into the catalog store."""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from dotenv import find_dotenv, load_dotenv
+
+from .prewarm import level_assessment
+from .prompts import PROMPT_VERSION
+
+# Modules that import config are imported where they are used, so that main() can
+# load .env before config reads the environment
+if TYPE_CHECKING:
+    from .catalog import CatalogEntry, CatalogStore
+    from .transcripts import Transcript
+
+logger = logging.getLogger(__name__)
+
+# (video ID, local transcript file or None to fetch it by video ID)
+Source = Tuple[str, Optional[str]]
+
+
+def parse_source(item: str) -> Optional[Source]:
+    """
+    A YouTube URL or video ID, or a local `<video_id>.json` / `<video_id>.txt`
+    transcript whose file name is the video it belongs to.
+    """
+    from .transcripts import extract_video_id
+
+    if os.path.isfile(item):
+        return os.path.splitext(os.path.basename(item))[0], item
+    video_id = extract_video_id(item)
+    return (video_id, None) if video_id is not None else None
+
+
+async def load_transcript(source: Source) -> "Transcript":
+    from .executor import run_blocking
+    from .transcripts import FileTranscriptFetcher, get_transcript_store
+
+    video_id, path = source
+    store = get_transcript_store()
+    if path is None:
+        return await store.get(video_id)
+    fetcher = FileTranscriptFetcher(os.path.dirname(os.path.abspath(path)))
+    transcript = await run_blocking(fetcher.fetch, video_id)
+    # Interactive sessions for this video then find the transcript without fetching it
+    await run_blocking(store.cache.set, video_id, transcript)
+    return transcript
+
+
+class Progress:
+    """Counts finished videos and logs progress, throughput and an ETA."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.started = time.perf_counter()
+        self.videos = self.failed = self.generated = self.reused = self.tokens = 0
+
+    def record(
+        self, video_id: str, generated: int, reused: int, tokens: int, error: Optional[str]
+    ) -> None:
+        self.videos += 1
+        self.failed += error is not None
+        self.generated += generated
+        self.reused += reused
+        self.tokens += tokens
+        elapsed = time.perf_counter() - self.started
+        rate = self.videos / elapsed if elapsed else 0.0
+        eta = (self.total - self.videos) / rate if rate else 0.0
+        logger.info(
+            "[%d/%d] %s: %d generated, %d already stored%s "
+            "| %.2f videos/s, %.0f tokens/s, ETA %.0fs",
+            self.videos, self.total, video_id, generated, reused,
+            f", failed: {error}" if error else "",
+            rate, self.tokens / elapsed if elapsed else 0.0, eta,
+        )
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        return (
+            f"{self.videos - self.failed}/{self.total} videos complete, {self.failed} failed; "
+            f"{self.generated} artifacts generated, {self.reused} already stored; "
+            f"{self.tokens} tokens in {elapsed:.1f}s "
+            f"({self.generated / elapsed if elapsed else 0.0:.2f} artifacts/s)"
+        )
+
+
+class CatalogBuilder:
+    """
+    Generates the lesson and a quiz per level for each video with the same code
+    the graph's summarize_transcript and create_quiz nodes use, and stores each
+    video's artifacts in one catalog write. Artifacts already in the catalog
+    are skipped, so an interrupted run resumes where it stopped. At most
+    `concurrency` model generations run at once.
+    """
+
+    def __init__(self, catalog: "CatalogStore", levels: Sequence[str], concurrency: int):
+        self.catalog = catalog
+        self.levels = list(levels)
+        self.concurrency = concurrency
+        self._jobs = asyncio.Semaphore(concurrency)
+
+    async def build_video(self, source: Source) -> Tuple[int, int, int]:
+        """Fill in the video's missing artifacts; returns (generated, reused, tokens)."""
+        # Imported here so the graph and model are only built when actually generating
+        from . import agent
+        from .artifacts import UNASSESSED, model_name
+        from .executor import run_blocking
+        from .retrieval import get_index_store
+
+        video_id = source[0]
+        name = model_name(agent.chat_model())
+        existing = await run_blocking(self.catalog.existing, video_id, PROMPT_VERSION, name)
+        missing = [level for level in self.levels if ("quiz", level) not in existing]
+        reused = len(existing & {("lesson", "all"), *(("quiz", level) for level in self.levels)})
+        if not missing and ("lesson", "all") in existing:
+            return 0, reused, 0
+
+        transcript = await load_transcript(source)
+        entries: List["CatalogEntry"] = []
+        spent = 0
+        if ("lesson", "all") in existing:
+            entry = await run_blocking(
+                self.catalog.get, "lesson", video_id, PROMPT_VERSION, name, "all"
+            )
+            lesson = entry["value"]
+        else:
+            async with self._jobs:
+                lesson, tokens = await agent.generate_lesson(transcript)
+            entries.append(("lesson", "all", lesson, tokens))
+            spent += tokens
+
+        async def transcript_loader() -> "Transcript":
+            return transcript
+
+        await get_index_store().get(video_id, transcript_loader)
+
+        async def quiz(level: str):
+            assessment = None if level == UNASSESSED else level_assessment(level)
+            async with self._jobs:
+                return await agent.generate_quiz(lesson, assessment)
+
+        results = await asyncio.gather(*(quiz(level) for level in missing), return_exceptions=True)
+        errors = []
+        for level, result in zip(missing, results):
+            if isinstance(result, BaseException):
+                errors.append(f"{level}: {result!r}")
+                continue
+            quiz_, tokens = result
+            entries.append(("quiz", level, quiz_.model_dump(), tokens))
+            spent += tokens
+        # Keep what succeeded even when some quizzes failed; a rerun fills in the rest
+        await run_blocking(self.catalog.put_many, video_id, PROMPT_VERSION, name, entries)
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return len(entries), reused, spent
+
+    async def build(self, sources: Sequence[Source]) -> Progress:
+        progress = Progress(len(sources))
+        queue: "asyncio.Queue[Source]" = asyncio.Queue()
+        for source in sources:
+            queue.put_nowait(source)
+
+        async def worker() -> None:
+            while not queue.empty():
+                source = queue.get_nowait()
+                try:
+                    generated, reused, tokens = await self.build_video(source)
+                    progress.record(source[0], generated, reused, tokens, None)
+                except Exception as e:
+                    logger.debug("Failed to build %s", source[0], exc_info=True)
+                    progress.record(source[0], 0, 0, 0, repr(e))
+
+        # Enough videos in flight to keep every generation slot busy
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(sources)))))
+        return progress
+
+
+def read_sources(items: Sequence[str], files: Sequence[str]) -> List[str]:
+    """
+    Inputs from the command line and from catalog files, one per line. Blank
+    lines and lines starting with # are skipped, and transcript paths in a
+    catalog file are relative to it.
+    """
+    inputs = list(items)
+    for path in files:
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                relative = os.path.join(os.path.dirname(path), line)
+                inputs.append(relative if os.path.isfile(relative) else line)
+    return inputs
+
+
+def main():
+    """Run the catalog batch command."""
+    load_dotenv(find_dotenv(usecwd=True))
+    from . import config
+    from .artifacts import LEVEL_BUCKETS, UNASSESSED
+    from .catalog import CatalogStore
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "videos",
+        nargs="*",
+        help="YouTube URLs, video IDs or local <video_id>.json/.txt transcripts",
+    )
+    parser.add_argument(
+        "--catalog-file",
+        action="append",
+        default=[],
+        help="File listing one video or transcript per line; may be repeated",
+    )
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        default=[UNASSESSED, *LEVEL_BUCKETS],
+        choices=[UNASSESSED, *LEVEL_BUCKETS],
+        help="Level buckets to generate quizzes for",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent model generations")
+    parser.add_argument("--catalog", help="Catalog database, EDISON_CATALOG_DB by default")
+    args = parser.parse_args()
+
+    sources: List[Source] = []
+    seen = set()
+    for item in read_sources(args.videos, args.catalog_file):
+        source = parse_source(item)
+        if source is None:
+            parser.error(f"Not a YouTube URL, video ID or transcript file: {item}")
+        if source[0] not in seen:
+            seen.add(source[0])
+            sources.append(source)
+    if not sources:
+        parser.error("No videos given")
+
+    catalog = CatalogStore(args.catalog or config.CATALOG_DB)
+    builder = CatalogBuilder(catalog, args.levels, args.concurrency)
+    progress = asyncio.run(builder.build(sources))
+    logger.info("%s", progress.summary())
+    logger.info("Catalog %s holds %d artifacts", catalog.path, len(catalog))
+    if progress.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
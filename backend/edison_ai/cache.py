@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class DiskCache:
+    """
+    Size-bounded, on-disk JSON cache with LRU eviction and an optional TTL.
+
+    Every entry is stored in its own file named after a hash of the key, so the
+    cache can be shared by every worker on a host. The in-memory index keeps the
+    files in least-recently-used order and is rebuilt from file mtimes on start.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._size += size
+
+    @staticmethod
+    def _filename(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+
+    def get(self, key: str) -> Optional[Any]:
+        name = self._filename(key)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    payload = json.load(file)
+            except (OSError, ValueError):
+                self._forget(name)
+                self.stats["misses"] += 1
+                return None
+
+            if self.ttl is not None and time.time() - payload["stored_at"] > self.ttl:
+                self._remove(name)
+                self.stats["misses"] += 1
+                return None
+
+            # Touch the file so LRU order survives a restart
+            os.utime(path)
+            if name in self._index:
+                self._index.move_to_end(name)
+            self.stats["hits"] += 1
+            return payload["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        name = self._filename(key)
+        path = os.path.join(self.directory, name)
+        data = json.dumps(
+            {"key": key, "stored_at": time.time(), "value": value},
+            separators=(",", ":"),
+        )
+        with self._lock:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+
+            self._forget(name)
+            size = len(data.encode("utf-8"))
+            self._index[name] = size
+            self._size += size
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(self._filename(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._index):
+                self._remove(name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and len(self._index) > 1:
+            name = next(iter(self._index))
+            self._remove(name)
+            self.stats["evictions"] += 1
+
+    def _forget(self, name: str) -> None:
+        size = self._index.pop(name, None)
+        if size is not None:
+            self._size -= size
+
+    def _remove(self, name: str) -> None:
+        self._forget(name)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
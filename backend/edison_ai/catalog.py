@@ -0,0 +1,108 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from . import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    video_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    level TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (video_id, prompt_version, model, kind, level)
+);
+"""
+
+# (kind, level, value, tokens spent generating it)
+CatalogEntry = Tuple[str, str, Any, int]
+
+
+class CatalogStore:
+    """
+    Pre-generated lesson plans and quizzes for a course catalog.
+
+    Filled in bulk by `edison-ai-batch` and read by `ArtifactCache` when its
+    disk cache misses. Unlike that cache, entries are never evicted. Rows are
+    keyed like artifact cache entries, so a prompt or model change never serves
+    stale content, and values are stored as zlib-compressed JSON in one SQLite
+    file that every worker on a host can read.
+    """
+
+    def __init__(self, path: str = config.CATALOG_DB, level: int = 6):
+        self.path = path
+        self.level = level
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(
+        self, kind: str, video_id: str, prompt_version: str, model: str, level: str
+    ) -> Optional[Dict[str, Any]]:
+        """The entry as {"value", "tokens"}, like an artifact cache entry, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data, tokens FROM artifacts WHERE video_id = ? AND prompt_version = ? "
+                "AND model = ? AND kind = ? AND level = ?",
+                (video_id, prompt_version, model, kind, level),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"value": json.loads(zlib.decompress(row[0])), "tokens": row[1]}
+
+    def existing(self, video_id: str, prompt_version: str, model: str) -> Set[Tuple[str, str]]:
+        """The (kind, level) pairs already stored for `video_id`."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT kind, level FROM artifacts "
+                "WHERE video_id = ? AND prompt_version = ? AND model = ?",
+                (video_id, prompt_version, model),
+            ).fetchall()
+        return {(kind, level) for kind, level in rows}
+
+    def put_many(
+        self, video_id: str, prompt_version: str, model: str, entries: Iterable[CatalogEntry]
+    ) -> None:
+        """Store `entries` of one video in a single transaction."""
+        now = time.time()
+        rows = [
+            (
+                video_id,
+                kind,
+                level,
+                prompt_version,
+                model,
+                tokens,
+                zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), self.level),
+                now,
+            )
+            for kind, level, value, tokens in entries
+        ]
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
@@ -0,0 +1,718 @@
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    SerializerProtocol,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.serde.types import TASKS
+
+from . import config
+from .executor import run_blocking
+
+
+class CompactSerializer(SerializerProtocol):
+    """
+    JsonPlusSerializer (msgpack) with zlib compression for large payloads.
+
+    Checkpoints carry the transcript, lesson and message history, which
+    compress well; small values are left as-is to save CPU.
+    """
+
+    def __init__(self, min_size: int = 1024, level: int = 1):
+        self.serde = JsonPlusSerializer()
+        self.min_size = min_size
+        self.level = level
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if len(data) >= self.min_size:
+            return f"{type_}+zlib", zlib.compress(data, self.level)
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_.endswith("+zlib"):
+            return self.serde.loads_typed((type_[: -len("+zlib")], zlib.decompress(payload)))
+        return self.serde.loads_typed((type_, payload))
+
+
+# Channels holding large values that rarely change once set
+BLOB_CHANNELS = ("transcript", "lesson_explanation", "quiz")
+
+Blob = Tuple[str, bytes]
+
+
+class BlobCodec:
+    """
+    Moves large channel values out of checkpoints into content-addressed blobs.
+
+    A checkpoint holds every channel, so without this the transcript, lesson
+    and quiz would be serialized into each one, on every turn of every
+    session. `split` replaces them with their content hash; each blob is stored
+    once and shared by every thread with the same content, e.g. students of the
+    same video. Values are cached by identity when encoded and by hash when
+    decoded, so an unchanged value is neither re-serialized nor re-parsed.
+    """
+
+    def __init__(
+        self,
+        serde: SerializerProtocol,
+        channels: Sequence[str] = BLOB_CHANNELS,
+        min_size: int = 1024,
+        cache_size: int = 256,
+    ):
+        self.serde = serde
+        self.channels = tuple(channels)
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        # id(value) -> (value, digest, blob); holding the value keeps its id stable
+        self._encoded: "OrderedDict[int, Tuple[Any, str, Blob]]" = OrderedDict()
+        self._decoded: "OrderedDict[str, Any]" = OrderedDict()
+
+    def _encode(self, value: Any) -> Tuple[str, Blob]:
+        with self._lock:
+            cached = self._encoded.get(id(value))
+            if cached is not None and cached[0] is value:
+                self._encoded.move_to_end(id(value))
+                return cached[1], cached[2]
+        blob = self.serde.dumps_typed(value)
+        digest = hashlib.blake2b(blob[0].encode() + b"\0" + blob[1], digest_size=16).hexdigest()
+        with self._lock:
+            self._encoded[id(value)] = (value, digest, blob)
+            self._remember(digest, value)
+            while len(self._encoded) > self.cache_size:
+                self._encoded.popitem(last=False)
+        return digest, blob
+
+    def _remember(self, digest: str, value: Any) -> None:
+        self._decoded[digest] = value
+        self._decoded.move_to_end(digest)
+        while len(self._decoded) > self.cache_size:
+            self._decoded.popitem(last=False)
+
+    def split(self, checkpoint: Checkpoint) -> Tuple[Checkpoint, Dict[str, Blob]]:
+        """
+        `checkpoint` with its large blob channels replaced by references, and
+        the blobs {digest: (type, data)} those references point at.
+        """
+        values = checkpoint["channel_values"]
+        refs, blobs = {}, {}
+        for channel in self.channels:
+            value = values.get(channel)
+            if value is None:
+                continue
+            digest, blob = self._encode(value)
+            if len(blob[1]) >= self.min_size:
+                refs[channel] = digest
+                blobs[digest] = blob
+        if not refs:
+            return checkpoint, blobs
+        values = {channel: value for channel, value in values.items() if channel not in refs}
+        split = {**checkpoint, "channel_values": values, "blobs": refs}
+        return split, blobs  # type: ignore[return-value]
+
+    def join(
+        self, checkpoint: Checkpoint, load: Callable[[Sequence[str]], Dict[str, Blob]]
+    ) -> Checkpoint:
+        """
+        Resolve the blob references of `checkpoint`; `load` fetches the blobs
+        missing from the cache.
+        """
+        refs: Dict[str, str] = checkpoint.pop("blobs", None)  # type: ignore[typeddict-item]
+        if not refs:
+            return checkpoint
+        with self._lock:
+            values = {digest: self._decoded.get(digest) for digest in refs.values()}
+        missing = [digest for digest, value in values.items() if value is None]
+        loaded = load(missing) if missing else {}
+        for digest in missing:
+            if digest not in loaded:
+                raise LookupError(f"Checkpoint blob {digest} is missing")
+            values[digest] = self.serde.loads_typed(loaded[digest])
+            with self._lock:
+                self._remember(digest, values[digest])
+        checkpoint["channel_values"] = {
+            **checkpoint["channel_values"],
+            **{channel: values[digest] for channel, digest in refs.items()},
+        }
+        return checkpoint
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-process checkpointer with a bounded footprint.
+
+    Keeps at most `max_threads` threads in LRU order, drops threads idle for
+    longer than `ttl` seconds, and retains only the latest `history`
+    checkpoints of each thread. Large channel values are stored once as
+    reference-counted blobs (see `BlobCodec`).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_threads: int = config.CHECKPOINT_MAX_THREADS,
+        ttl: Optional[float] = config.CHECKPOINT_TTL,
+        history: int = config.CHECKPOINT_HISTORY,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde or CompactSerializer())
+        self.max_threads = max_threads
+        self.ttl = ttl
+        self.history = max(history, 2)
+        self._lock = threading.RLock()
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+        self._write_keys: Dict[str, set] = {}
+        # Not `blobs`: later MemorySaver versions use that attribute for their own storage
+        self._blob_codec = BlobCodec(self.serde)
+        # digest -> [blob, number of checkpoints referencing it]
+        self._blob_store: Dict[str, list] = {}
+        # thread_id -> {(checkpoint_ns, checkpoint_id): digests referenced}
+        self._blob_refs: Dict[str, Dict[Tuple[str, str], Tuple[str, ...]]] = {}
+
+    def _touch(self, thread_id: str) -> None:
+        now = time.monotonic()
+        self._last_seen[thread_id] = now
+        self._last_seen.move_to_end(thread_id)
+        while self._last_seen:
+            oldest, seen = next(iter(self._last_seen.items()))
+            expired = self.ttl is not None and now - seen > self.ttl
+            if len(self._last_seen) <= self.max_threads and not expired:
+                break
+            self.delete_thread(oldest)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._last_seen.pop(thread_id, None)
+            self.storage.pop(thread_id, None)
+            for key in self._write_keys.pop(thread_id, ()):
+                self.writes.pop(key, None)
+            for digests in self._blob_refs.pop(thread_id, {}).values():
+                self._release(digests)
+
+    def _hold(self, thread_id: str, key: Tuple[str, str], blobs: Dict[str, Blob]) -> None:
+        for digest, blob in blobs.items():
+            self._blob_store.setdefault(digest, [blob, 0])[1] += 1
+        previous = self._blob_refs.setdefault(thread_id, {}).pop(key, ())
+        self._release(previous)
+        if blobs:
+            self._blob_refs[thread_id][key] = tuple(blobs)
+
+    def _release(self, digests: Iterable[str]) -> None:
+        for digest in digests:
+            entry = self._blob_store[digest]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._blob_store[digest]
+
+    def _load_blobs(self, digests: Sequence[str]) -> Dict[str, Blob]:
+        return {
+            digest: self._blob_store[digest][0] for digest in digests if digest in self._blob_store
+        }
+
+    def _join(self, item: CheckpointTuple) -> CheckpointTuple:
+        return item._replace(checkpoint=self._blob_codec.join(item.checkpoint, self._load_blobs))
+
+    @property
+    def thread_count(self) -> int:
+        return len(self._last_seen)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            if thread_id not in self.storage:
+                # Avoid the defaultdict creating an empty entry for unknown threads
+                return None
+            self._touch(thread_id)
+            item = super().get_tuple(config)
+            return self._join(item) if item is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            items = [
+                self._join(item)
+                for item in super().list(config, filter=filter, before=before, limit=limit)
+            ]
+        yield from items
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            checkpoint_ns = config["configurable"]["checkpoint_ns"]
+            checkpoint, blobs = self._blob_codec.split(checkpoint)
+            result = super().put(config, checkpoint, metadata, new_versions)
+            self._hold(thread_id, (checkpoint_ns, checkpoint["id"]), blobs)
+            self._touch(thread_id)
+
+            checkpoints = self.storage[thread_id][checkpoint_ns]
+            if len(checkpoints) > self.history:
+                refs = self._blob_refs.get(thread_id, {})
+                for checkpoint_id in sorted(checkpoints)[: -self.history]:
+                    del checkpoints[checkpoint_id]
+                    self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                    self._release(refs.pop((checkpoint_ns, checkpoint_id), ()))
+            return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        with self._lock:
+            configurable = config["configurable"]
+            thread_id = configurable["thread_id"]
+            super().put_writes(config, writes, task_id)
+            self._write_keys.setdefault(thread_id, set()).add(
+                (thread_id, configurable["checkpoint_ns"], configurable["checkpoint_id"])
+            )
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_last_seen ON threads (last_seen);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, digest)
+);
+CREATE INDEX IF NOT EXISTS checkpoint_blobs_digest ON checkpoint_blobs (digest);
+"""
+
+
+def _call_weak(method: weakref.WeakMethod) -> None:
+    bound = method()
+    if bound is not None:
+        bound()
+
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """
+    Durable checkpointer backed by SQLite in WAL mode.
+
+    Survives restarts and can be shared by several worker processes on one
+    host. Payloads use `CompactSerializer`, only the latest `history`
+    checkpoints of each thread are kept, and threads idle for longer than
+    `ttl` seconds are evicted periodically. Large channel values are stored
+    once in a blobs table (see `BlobCodec`); blobs no longer referenced by any
+    checkpoint are deleted along with the eviction. Async methods run the
+    SQLite calls on the shared I/O thread pool.
+    """
+
+    def __init__(
+        self,
+        path: str = config.CHECKPOINT_DB,
+        *,
+        ttl: Optional[float] = config.CHECKPOINT_TTL,
+        history: int = config.CHECKPOINT_HISTORY,
+        evict_interval: float = 60.0,
+        serde: Optional[SerializerProtocol] = None,
+    ) -> None:
+        super().__init__(serde=serde or CompactSerializer())
+        self.path = path
+        self.ttl = ttl
+        self.history = max(history, 2)
+        self.evict_interval = evict_interval
+        self._next_eviction = 0.0
+        self._blob_codec = BlobCodec(self.serde)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect()
+        self.conn.executescript(_SCHEMA)
+        # A SQLite connection must not be used across a fork; forked workers reopen it
+        os.register_at_fork(
+            after_in_child=functools.partial(_call_weak, weakref.WeakMethod(self._connect))
+        )
+
+    def _connect(self) -> None:
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _pending_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        return self.conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+    def _load(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self._pending_writes(thread_id, checkpoint_ns, checkpoint_id)
+        sends = []
+        if parent_checkpoint_id:
+            sends = [
+                self.serde.loads_typed((w_type, value))
+                for _, channel, w_type, value in self._pending_writes(
+                    thread_id, checkpoint_ns, parent_checkpoint_id
+                )
+                if channel == TASKS
+            ]
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **self._blob_codec.join(
+                    self.serde.loads_typed((type_, checkpoint)), self._load_blobs
+                ),
+                "pending_sends": sends,
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_checkpoint_id,
+                }
+            }
+            if parent_checkpoint_id
+            else None,
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((w_type, value)))
+                for task_id, channel, w_type, value in writes
+            ],
+        )
+
+    def _load_blobs(self, digests: Sequence[str]) -> Dict[str, Blob]:
+        placeholders = ", ".join("?" * len(digests))
+        rows = self.conn.execute(
+            f"SELECT digest, type, data FROM blobs WHERE digest IN ({placeholders})",
+            tuple(digests),
+        ).fetchall()
+        return {digest: (type_, data) for digest, type_, data in rows}
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._load(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+            results = []
+            for thread_id, checkpoint_ns, *row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                # Metadata filters are applied after loading, like MemorySaver does
+                metadata = self.serde.loads_typed((row[4], row[5]))
+                if filter and not all(
+                    value == metadata.get(key) for key, value in filter.items()
+                ):
+                    continue
+                results.append(self._load(thread_id, checkpoint_ns, row))
+        yield from results
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        c, blobs = self._blob_codec.split(checkpoint)
+        c = c.copy()
+        c.pop("pending_sends")  # type: ignore[misc]
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        type_, data = self.serde.dumps_typed(c)
+        metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        type_,
+                        data,
+                        metadata_type,
+                        metadata_data,
+                    ),
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)",
+                    [(digest, type_, data) for digest, (type_, data) in blobs.items()],
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO checkpoint_blobs VALUES (?, ?, ?, ?)",
+                    [(thread_id, checkpoint_ns, checkpoint["id"], digest) for digest in blobs],
+                )
+                self._prune(thread_id, checkpoint_ns)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO threads VALUES (?, ?)", (thread_id, time.time())
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._maybe_evict()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        configurable = config["configurable"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    configurable["thread_id"],
+                    configurable["checkpoint_ns"],
+                    configurable["checkpoint_id"],
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    data,
+                )
+            )
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _prune(self, thread_id: str, checkpoint_ns: str) -> None:
+        stale = self.conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.history),
+        ).fetchall()
+        for (checkpoint_id,) in stale:
+            for table in ("checkpoints", "writes", "checkpoint_blobs"):
+                self.conn.execute(
+                    f"DELETE FROM {table} "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                )
+
+    def _maybe_evict(self) -> None:
+        now = time.time()
+        if now < self._next_eviction:
+            return
+        self._next_eviction = now + self.evict_interval
+        if self.ttl is not None:
+            self.evict_idle(now - self.ttl)
+        self.collect_blobs()
+
+    def collect_blobs(self) -> int:
+        """Delete blobs no checkpoint references any more."""
+        with self._lock:
+            return self.conn.execute(
+                "DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM checkpoint_blobs)"
+            ).rowcount
+
+    def evict_idle(self, cutoff: float) -> int:
+        """Delete every thread last written before `cutoff` (a UNIX timestamp)."""
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for table in ("checkpoints", "writes", "checkpoint_blobs"):
+                    self.conn.execute(
+                        f"DELETE FROM {table} WHERE thread_id IN "
+                        "(SELECT thread_id FROM threads WHERE last_seen < ?)",
+                        (cutoff,),
+                    )
+                evicted = self.conn.execute(
+                    "DELETE FROM threads WHERE last_seen < ?", (cutoff,)
+                ).rowcount
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            return evicted
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "writes", "checkpoint_blobs", "threads"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await run_blocking(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        results = await run_blocking(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in results:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await run_blocking(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+    ) -> None:
+        return await run_blocking(self.put_writes, config, writes, task_id)
+
+    def get_next_version(self, current: Optional[str], channel) -> str:
+        return MemorySaver.get_next_version(self, current, channel)  # type: ignore[arg-type]
+
+
+def get_checkpointer(backend: str = config.CHECKPOINTER) -> BaseCheckpointSaver:
+    """
+    Create the checkpointer selected by EDISON_CHECKPOINTER.
+
+    Raises:
+        ValueError: If an unsupported backend is specified.
+    """
+    if backend == "bounded":
+        return BoundedMemorySaver()
+    if backend == "sqlite":
+        return SQLiteSaver()
+    if backend == "memory":
+        return MemorySaver()
+    raise ValueError(f"Unsupported checkpointer: {backend}")
@@ -0,0 +1,142 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Root directory for on-disk caches shared by every session on this host
+CACHE_DIR = os.path.expanduser(os.getenv("EDISON_CACHE_DIR", "~/.cache/edison_ai"))
+
+# Transcript store
+TRANSCRIPT_CACHE_DIR = os.getenv(
+    "EDISON_TRANSCRIPT_CACHE_DIR", os.path.join(CACHE_DIR, "transcripts")
+)
+TRANSCRIPT_CACHE_MAX_BYTES = _env_int("EDISON_TRANSCRIPT_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+TRANSCRIPT_CACHE_TTL = _env_float("EDISON_TRANSCRIPT_CACHE_TTL", 7 * 24 * 3600)
+# When set, transcripts are read from <dir>/<video_id>.json|.txt instead of YouTube
+TRANSCRIPT_SOURCE_DIR = os.getenv("EDISON_TRANSCRIPT_SOURCE_DIR")
+TRANSCRIPT_FETCH_TIMEOUT = _env_float("EDISON_TRANSCRIPT_FETCH_TIMEOUT", 30.0)
+
+# Thread pool for blocking I/O (transcript fetches, disk cache) run off the event loop
+IO_MAX_WORKERS = _env_int("EDISON_IO_MAX_WORKERS", 8)
+
+# "classic" runs router -> extract -> analyze as separate LLM calls per turn,
+# "fused" handles routing, assessment update and the next question in one call
+TURN_MODE = os.getenv("EDISON_TURN_MODE", "classic")
+
+# Conversation context: the last HISTORY_TURNS student turns are sent verbatim, older
+# turns are folded into a rolling summary once HISTORY_SUMMARY_BATCH of them pile up
+HISTORY_TURNS = _env_int("EDISON_HISTORY_TURNS", 6)
+HISTORY_SUMMARY_BATCH = _env_int("EDISON_HISTORY_SUMMARY_BATCH", 4)
+# Token budget for the verbatim messages each node sends, on top of its system prompt
+HISTORY_TOKEN_BUDGET = _env_int("EDISON_HISTORY_TOKEN_BUDGET", 4000)
+
+# Checkpointer: "bounded" (in-process, LRU + idle TTL), "sqlite" (durable, shared by
+# workers on one host) or "memory" (unbounded MemorySaver, for debugging)
+CHECKPOINTER = os.getenv("EDISON_CHECKPOINTER", "bounded")
+CHECKPOINT_DB = os.getenv("EDISON_CHECKPOINT_DB", os.path.join(CACHE_DIR, "checkpoints.sqlite"))
+# Threads idle for longer than this are evicted
+CHECKPOINT_TTL = _env_float("EDISON_CHECKPOINT_TTL", 24 * 3600)
+CHECKPOINT_MAX_THREADS = _env_int("EDISON_CHECKPOINT_MAX_THREADS", 10_000)
+# Checkpoints kept per thread; older ones are only needed for time travel
+CHECKPOINT_HISTORY = _env_int("EDISON_CHECKPOINT_HISTORY", 4)
+
+# Generated lesson plans and quizzes shared by every student of the same video
+ARTIFACT_CACHE_DIR = os.getenv(
+    "EDISON_ARTIFACT_CACHE_DIR", os.path.join(CACHE_DIR, "artifacts")
+)
+ARTIFACT_CACHE_MAX_BYTES = _env_int("EDISON_ARTIFACT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+ARTIFACT_CACHE_TTL = _env_float("EDISON_ARTIFACT_CACHE_TTL", 30 * 24 * 3600)
+# Lessons and quizzes pre-generated for a course catalog by `edison-ai-batch`; read
+# when the artifact cache misses, if the file exists
+CATALOG_DB = os.getenv("EDISON_CATALOG_DB", os.path.join(CACHE_DIR, "catalog.sqlite"))
+
+# Minimum seconds between partial lesson updates pushed to the UI while streaming
+STREAM_EMIT_INTERVAL = _env_float("EDISON_STREAM_EMIT_INTERVAL", 0.1)
+
+# Map-reduce summarization: transcripts of up to SUMMARY_SINGLE_PASS_TOKENS (about two
+# chunks) are summarized in one streamed call. Longer ones are summarized chunk by chunk,
+# with at most SUMMARY_CONCURRENCY chunk calls in flight, which beats one long serial
+# call once there are a few chunks to run at once; the lesson only streams once every
+# chunk is done
+SUMMARY_CHUNK_TOKENS = _env_int("EDISON_SUMMARY_CHUNK_TOKENS", 6000)
+SUMMARY_SINGLE_PASS_TOKENS = _env_int(
+    "EDISON_SUMMARY_SINGLE_PASS_TOKENS", 2 * SUMMARY_CHUNK_TOKENS
+)
+SUMMARY_CONCURRENCY = _env_int("EDISON_SUMMARY_CONCURRENCY", 4)
+CHUNK_CACHE_DIR = os.getenv("EDISON_CHUNK_CACHE_DIR", os.path.join(CACHE_DIR, "chunks"))
+CHUNK_CACHE_MAX_BYTES = _env_int("EDISON_CHUNK_CACHE_MAX_BYTES", 128 * 1024 * 1024)
+
+# Retrieval over transcript passages: nodes get the top-k passages relevant to the
+# turn instead of the whole lesson
+RETRIEVAL_ENABLED = os.getenv("EDISON_RETRIEVAL", "1") not in ("0", "false", "no")
+RETRIEVAL_PASSAGE_TOKENS = _env_int("EDISON_RETRIEVAL_PASSAGE_TOKENS", 150)
+RETRIEVAL_TOP_K = _env_int("EDISON_RETRIEVAL_TOP_K", 6)
+INDEX_DIR = os.getenv("EDISON_INDEX_DIR", os.path.join(CACHE_DIR, "index"))
+
+# Quiz generation: "single" asks for the whole quiz in one call, "parallel" plans
+# QUIZ_QUESTIONS topics first and writes the questions concurrently
+QUIZ_MODE = os.getenv("EDISON_QUIZ_MODE", "single")
+QUIZ_QUESTIONS = _env_int("EDISON_QUIZ_QUESTIONS", 10)
+QUIZ_CONCURRENCY = _env_int("EDISON_QUIZ_CONCURRENCY", 8)
+# Extra attempts for a question that fails validation before it is dropped
+QUIZ_QUESTION_RETRIES = _env_int("EDISON_QUIZ_QUESTION_RETRIES", 2)
+
+# Observability: rich panels with every node's output are debug-only, and when
+# EDISON_TRACE_FILE is set every node run and model call is appended to it as JSON
+DEBUG_PANELS = os.getenv("EDISON_DEBUG_PANELS", "0") not in ("0", "false", "no")
+TRACE_FILE = os.getenv("EDISON_TRACE_FILE")
+# Directory each `edison-ai-serve` worker publishes its metrics to every
+# METRICS_FLUSH_INTERVAL seconds, so /metrics on any worker reports all of them. The
+# server uses a fresh temporary directory unless it is set
+METRICS_DIR = os.getenv("EDISON_METRICS_DIR")
+METRICS_FLUSH_INTERVAL = _env_float("EDISON_METRICS_FLUSH_INTERVAL", 1.0)
+
+# Worker processes serving the app on this host; `edison-ai-serve` sets it, one per
+# core by default. Workers get DRAIN_TIMEOUT seconds to finish open requests on stop
+WORKERS = _env_int("EDISON_WORKERS", 1)
+DRAIN_TIMEOUT = _env_float("EDISON_DRAIN_TIMEOUT", 30.0)
+
+# Chat model: provider ("openai", "anthropic" or "fake") and an optional model name
+# overriding the provider default
+MODEL_PROVIDER = os.getenv("EDISON_MODEL_PROVIDER", "openai")
+MODEL_NAME = os.getenv("EDISON_MODEL_NAME")
+# Requests per second per provider, shared by every session of this process, with
+# bursts of up to MODEL_BURST requests; EDISON_<PROVIDER>_RPS overrides it, 0 disables
+MODEL_RPS = _env_float("EDISON_MODEL_RPS", 10.0)
+MODEL_BURST = _env_int("EDISON_MODEL_BURST", 20)
+# Extra attempts for rate limited, timed out or failed requests, with jittered backoff
+MODEL_RETRIES = _env_int("EDISON_MODEL_RETRIES", 3)
+MODEL_TIMEOUT = _env_float("EDISON_MODEL_TIMEOUT", 60.0)
+# Pooled HTTP connections to the provider, shared by every model instance
+MODEL_MAX_CONNECTIONS = _env_int("EDISON_MODEL_MAX_CONNECTIONS", 100)
+MODEL_MAX_KEEPALIVE = _env_int("EDISON_MODEL_MAX_KEEPALIVE", 20)
+
+
+def model_rps(provider: str) -> float:
+    """
+    This worker's request rate limit for `provider`: the host-wide limit split
+    evenly between WORKERS. The fake model is unlimited unless set.
+    """
+    default = 0.0 if provider == "fake" else MODEL_RPS
+    return _env_float(f"EDISON_{provider.upper()}_RPS", default) / max(1, WORKERS)
+
+# Provider fallback: with EDISON_FALLBACK_PROVIDER set, calls fail over to it when the
+# primary provider errors, and are hedged to it when the primary has not answered
+# within its recent HEDGE_QUANTILE latency, clamped to [HEDGE_MIN_DELAY, HEDGE_MAX_DELAY]
+FALLBACK_PROVIDER = os.getenv("EDISON_FALLBACK_PROVIDER")
+FALLBACK_MODEL_NAME = os.getenv("EDISON_FALLBACK_MODEL_NAME")
+HEDGE_ENABLED = os.getenv("EDISON_HEDGE", "1") not in ("0", "false", "no")
+HEDGE_QUANTILE = _env_float("EDISON_HEDGE_QUANTILE", 0.95)
+HEDGE_MIN_DELAY = _env_float("EDISON_HEDGE_MIN_DELAY", 0.5)
+HEDGE_MAX_DELAY = _env_float("EDISON_HEDGE_MAX_DELAY", 10.0)
+# Latencies kept per call type, and how many are needed before the quantile is used
+HEDGE_WINDOW = _env_int("EDISON_HEDGE_WINDOW", 200)
+HEDGE_MIN_SAMPLES = _env_int("EDISON_HEDGE_MIN_SAMPLES", 20)
@@ -0,0 +1,117 @@
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AnyMessage
+
+from . import config
+from .models.clients import chat
+from .prompts import HISTORY_SUMMARY_PROMPT
+from .schema import (
+    ANALYZE_STUDENT_LEVEL,
+    CREATE_QUIZ,
+    EXTRACT_STUDENT_RESPONSE,
+    FUSED_TURN,
+    ROUTER,
+    AgentState,
+)
+from .tokens import count_tokens
+
+# Routing and extraction only need the latest exchange; question asking and quiz
+# generation benefit from a longer window
+DEFAULT_NODE_BUDGETS = {
+    ROUTER: config.HISTORY_TOKEN_BUDGET // 2,
+    EXTRACT_STUDENT_RESPONSE: config.HISTORY_TOKEN_BUDGET // 2,
+    ANALYZE_STUDENT_LEVEL: config.HISTORY_TOKEN_BUDGET,
+    CREATE_QUIZ: config.HISTORY_TOKEN_BUDGET,
+    FUSED_TURN: config.HISTORY_TOKEN_BUDGET,
+}
+
+_SPEAKERS = {"human": "Student", "ai": "Tutor"}
+
+
+def format_conversation(messages: Sequence[AnyMessage]) -> str:
+    return "\n".join(
+        f"{_SPEAKERS.get(message.type, message.type)}: {message.content}"
+        for message in messages
+    )
+
+
+class ContextWindow:
+    """
+    Bounds the conversation history sent to the model on every turn.
+
+    The last `keep_turns` student turns are kept verbatim. Once `summary_batch`
+    older turns have scrolled out of that window, they are folded into
+    `AgentState.conversation_summary` by an incremental LLM summary, so the
+    verbatim history never exceeds `keep_turns + summary_batch` turns. Each
+    node also gets a token budget for the verbatim messages.
+    """
+
+    def __init__(
+        self,
+        keep_turns: int = config.HISTORY_TURNS,
+        summary_batch: int = config.HISTORY_SUMMARY_BATCH,
+        budgets: Optional[Dict[str, int]] = None,
+        default_budget: int = config.HISTORY_TOKEN_BUDGET,
+    ):
+        self.keep_turns = keep_turns
+        self.summary_batch = summary_batch
+        self.budgets = DEFAULT_NODE_BUDGETS if budgets is None else budgets
+        self.default_budget = default_budget
+
+    def _window_start(self, messages: Sequence[AnyMessage]) -> int:
+        """Index of the first message of the last `keep_turns` student turns."""
+        turns = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index].type == "human":
+                turns += 1
+                if turns == self.keep_turns:
+                    return index
+        return 0
+
+    def messages_for(self, state: AgentState, node: str) -> List[AnyMessage]:
+        """The unsummarized recent messages for `node`, trimmed to its token budget."""
+        window = state.messages[state.summarized_messages:]
+        budget = self.budgets.get(node, self.default_budget)
+
+        kept: List[AnyMessage] = []
+        used = 0
+        for message in reversed(window):
+            used += count_tokens(str(message.content))
+            # Always keep the latest message, even when it alone exceeds the budget
+            if kept and used > budget:
+                break
+            kept.append(message)
+        return kept[::-1]
+
+    def pending(self, state: AgentState) -> Sequence[AnyMessage]:
+        """Messages that have left the window but are not in the summary yet."""
+        end = self._window_start(state.messages)
+        if end <= state.summarized_messages:
+            return ()
+        pending = state.messages[state.summarized_messages:end]
+        if sum(1 for message in pending if message.type == "human") < self.summary_batch:
+            return ()
+        return pending
+
+    async def summarize(self, state: AgentState, model: BaseChatModel) -> dict:
+        """
+        Fold pending messages into the rolling summary.
+
+        Returns a state update, empty when there is nothing to fold yet.
+        """
+        pending = self.pending(state)
+        if not pending:
+            return {}
+        response = await chat(model).ainvoke(
+            [
+                HISTORY_SUMMARY_PROMPT.message(
+                    summary=state.conversation_summary,
+                    conversation=format_conversation(pending),
+                )
+            ]
+        )
+        return {
+            "conversation_summary": str(response.content),
+            "summarized_messages": state.summarized_messages + len(pending),
+        }
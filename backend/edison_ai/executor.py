@@ -0,0 +1,52 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from . import config
+from .metrics import REGISTRY
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the bounded thread pool shared by all blocking I/O in the agent."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=config.IO_MAX_WORKERS, thread_name_prefix="edison-io"
+        )
+    return _executor
+
+
+def _reset_after_fork() -> None:
+    # Pool threads do not survive a fork; a forked worker starts its own pool
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+async def run_blocking(
+    func: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs
+) -> T:
+    """
+    Run a blocking call on the shared I/O pool without stalling the event loop.
+
+    Raises asyncio.TimeoutError if the call does not finish within `timeout`
+    seconds. The worker thread cannot be interrupted, so a timed out call keeps
+    its pool slot until it returns on its own.
+    """
+    submitted = time.perf_counter()
+
+    def call() -> T:
+        REGISTRY.observe("edison_io_queue_seconds", {}, time.perf_counter() - submitted)
+        return func(*args, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor(), call)
+    return await asyncio.wait_for(future, timeout)
@@ -0,0 +1,128 @@
+import re
+from typing import List, Optional, Tuple
+
+from .schema import Quiz, QuizQuestion, QuizResult, QuizScore
+
+# (question index, answer index), both zero-based
+Answer = Tuple[int, int]
+
+_LETTERS = "abcdefgh"
+_PAIR = r"(?:q(?:uestion)?\s*#?\s*)?(\d{1,2})\s*[).:=-]?\s*(?:is\s+|answer\s+)?\(?([a-h])\)?"
+_PAIR_LIST = re.compile(
+    rf"^\s*(?:{_PAIR}(?:\s*(?:[,;&/]|and)\s*|\s+|(?=[.!]?\s*$)))+[.!]?\s*$", re.IGNORECASE
+)
+_PAIRS = re.compile(rf"\b{_PAIR}(?![a-z])", re.IGNORECASE)
+_SINGLE = re.compile(
+    r"^\s*(?:(?:my |the )?answer(?: is)?:?\s*|i (?:choose|pick|think it'?s|go with)\s*|option\s*)?"
+    r"\(?([a-h])\)?[.!]?\s*$",
+    re.IGNORECASE,
+)
+
+
+def current_question(quiz: Quiz, score: Optional[QuizScore]) -> Optional[int]:
+    """The first question the student has not answered yet."""
+    answered = {result.question for result in score.results} if score else set()
+    for index in range(len(quiz.questions)):
+        if index not in answered:
+            return index
+    return None
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def parse_answers(text: str, quiz: Quiz, score: Optional[QuizScore] = None) -> List[Answer]:
+    """
+    Find quiz answers in a student's message without calling a model.
+
+    Understands numbered answers ("1b", "Q2: C", "3) a, 4) d", "question 5 is b"),
+    a lone letter ("B", "my answer is c") for the current question, and the
+    exact text of one of the current question's answers. Returns an empty list
+    when the message is not a quiz answer, e.g. a free-text follow-up question.
+    """
+    answers: List[Answer] = []
+    if _PAIR_LIST.match(text):
+        for number, letter in _PAIRS.findall(text):
+            question, answer = int(number) - 1, _LETTERS.index(letter.lower())
+            if 0 <= question < len(quiz.questions) and answer < len(
+                quiz.questions[question].answers
+            ):
+                answers.append((question, answer))
+        return answers
+
+    question = current_question(quiz, score)
+    if question is None:
+        return answers
+    single = _SINGLE.match(text)
+    if single:
+        answer = _LETTERS.index(single.group(1).lower())
+        if answer < len(quiz.questions[question].answers):
+            answers.append((question, answer))
+        return answers
+
+    normalized = _normalize(text)
+    for index, choice in enumerate(quiz.questions[question].answers):
+        if normalized and normalized == _normalize(choice.text):
+            answers.append((question, index))
+            break
+    return answers
+
+
+def _label(question: QuizQuestion, index: int) -> str:
+    return f"{_LETTERS[index].upper()}) {question.answers[index].text}"
+
+
+def grade_answers(
+    quiz: Quiz, score: Optional[QuizScore], answers: List[Answer]
+) -> Tuple[QuizScore, str]:
+    """
+    Grade `answers` against the stored quiz; returns the updated score and the
+    feedback for the student, built from the explanations in the quiz.
+    """
+    results = {result.question: result for result in score.results} if score else {}
+    attempts = score.attempts if score else 0
+    feedback = []
+    for question_index, answer_index in answers:
+        question = quiz.questions[question_index]
+        chosen = question.answers[answer_index]
+        results[question_index] = QuizResult(
+            question=question_index, answer=answer_index, correct=chosen.is_correct
+        )
+        attempts += 1
+
+        lines = [f"**Question {question_index + 1}:** "]
+        if chosen.is_correct:
+            lines[0] += "Correct!"
+            if chosen.explanation:
+                lines.append(chosen.explanation)
+        else:
+            lines[0] += f"Not quite, you chose {_label(question, answer_index)}."
+            if chosen.explanation:
+                lines.append(chosen.explanation)
+            correct = next(
+                (i for i, answer in enumerate(question.answers) if answer.is_correct), None
+            )
+            if correct is not None:
+                lines.append(f"The correct answer is {_label(question, correct)}.")
+                if question.answers[correct].explanation:
+                    lines.append(question.answers[correct].explanation)
+        feedback.append(" ".join(lines))
+
+    updated = QuizScore(results=list(results.values()), attempts=attempts)
+    total = len(quiz.questions)
+    if len(updated.results) >= total:
+        feedback.append(f"You finished the quiz with a score of {updated.correct}/{total}.")
+    else:
+        feedback.append(
+            f"Score so far: {updated.correct}/{len(updated.results)} "
+            f"({len(updated.results)} of {total} questions answered)."
+        )
+        next_question = current_question(quiz, updated)
+        if next_question is not None:
+            question = quiz.questions[next_question]
+            choices = "\n".join(f"- {_label(question, i)}" for i in range(len(question.answers)))
+            feedback.append(
+                f"**Question {next_question + 1}:** {question.question}\n{choices}"
+            )
+    return updated, "\n\n".join(feedback)
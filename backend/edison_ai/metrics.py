@@ -0,0 +1,510 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from . import config
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# USD per million (prompt, completion) tokens, used for the cost counter
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-2024-08-06": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "claude-3-5-sonnet-20240620": (3.0, 15.0),
+}
+
+_HELP = {
+    "edison_node_duration_seconds": ("histogram", "Wall time of each graph node run"),
+    "edison_node_queue_seconds": (
+        "histogram",
+        "Time between the previous step of a run finishing and a node starting",
+    ),
+    "edison_node_runs_total": ("counter", "Graph node runs by outcome"),
+    "edison_routes_total": ("counter", "Routes taken by the routing nodes"),
+    "edison_model_duration_seconds": ("histogram", "Wall time of each chat model call"),
+    "edison_model_calls_total": ("counter", "Chat model calls by outcome"),
+    "edison_model_tokens_total": ("counter", "Tokens sent to and generated by chat models"),
+    "edison_model_cost_usd_total": ("counter", "Estimated chat model spend in USD"),
+    "edison_provider_latency_seconds": (
+        "histogram",
+        "Latency of successful calls per provider, to the first chunk for streams",
+    ),
+    "edison_provider_requests_total": ("counter", "Calls per provider by outcome"),
+    "edison_hedges_total": ("counter", "Calls hedged to the fallback provider"),
+    "edison_failovers_total": ("counter", "Calls failed over after a provider error"),
+    "edison_io_queue_seconds": (
+        "histogram",
+        "Time blocking calls wait for a thread in the shared I/O pool",
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+# Called at scrape time; yields (name, type, help, [(labels, value), ...])
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+# A registry's series as plain lists and dicts: {"counters": {name: [[labels, value]]},
+# "histograms": {name: [[labels, state]]}, "collected": [[name, type, help, samples]]}
+Snapshot = Dict[str, Any]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class Registry:
+    """
+    Minimal in-process registry of counters and histograms, rendered in the
+    Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._collectors: List[Collector] = []
+
+    def inc(self, name: str, labels: Dict[str, Any], value: float = 1.0) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: Dict[str, Any], value: float) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # One count per bucket plus +Inf, then the sum
+            state = series.setdefault(key, [0.0] * (len(BUCKETS) + 2))
+            state[bisect_left(BUCKETS, value)] += 1
+            state[-1] += value
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Snapshot:
+        """Every series, collectors included, in a form that survives JSON."""
+        with self._lock:
+            counters = {
+                name: [[list(key), value] for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [[list(key), list(state)] for key, state in series.items()]
+                for name, series in self._histograms.items()
+            }
+        collected = [
+            [name, kind, help_text, [[labels, value] for labels, value in samples]]
+            for collector in self._collectors
+            for name, kind, help_text, samples in collector()
+        ]
+        return {"counters": counters, "histograms": histograms, "collected": collected}
+
+    def render(self, others: Sequence[Snapshot] = ()) -> str:
+        """
+        The metrics in the Prometheus text exposition format, summed with
+        `others`, snapshots of the same metrics taken in other processes.
+        """
+        counters: Dict[str, Dict[Labels, float]] = {}
+        histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        collected: Dict[str, Tuple[str, str, Dict[Labels, float]]] = {}
+        for snapshot in (self.snapshot(), *others):
+            for name, series in snapshot["counters"].items():
+                totals = counters.setdefault(name, {})
+                for key, value in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    totals[key] = totals.get(key, 0.0) + value
+            for name, series in snapshot["histograms"].items():
+                totals = histograms.setdefault(name, {})
+                for key, state in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    total = totals.setdefault(key, [0.0] * len(state))
+                    for i, value in enumerate(state):
+                        total[i] += value
+            for name, kind, help_text, samples in snapshot["collected"]:
+                totals = collected.setdefault(name, (kind, help_text, {}))[2]
+                for labels, value in samples:
+                    key = _labels(labels)
+                    totals[key] = totals.get(key, 0.0) + value
+
+        lines: List[str] = []
+        for name, series in sorted(counters.items()):
+            kind, help_text = _HELP.get(name, ("counter", name))
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_format_labels(key)} {value:g}" for key, value in series.items()]
+
+        for name, series in sorted(histograms.items()):
+            kind, help_text = _HELP.get(name, ("histogram", name))
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for key, state in series.items():
+                cumulative = 0.0
+                for bound, count in zip((*BUCKETS, "+Inf"), state[:-1]):
+                    cumulative += count
+                    bucket = _format_labels((*key, ("le", str(bound))))
+                    lines.append(f"{name}_bucket{bucket} {cumulative:g}")
+                lines.append(f"{name}_sum{_format_labels(key)} {state[-1]:g}")
+                lines.append(f"{name}_count{_format_labels(key)} {cumulative:g}")
+
+        for name, (kind, help_text, series) in collected.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_format_labels(key)} {value:g}" for key, value in series.items()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _trace_logger(path: Optional[str]) -> Optional[logging.Logger]:
+    """A logger writing JSON lines to `path` from a background thread."""
+    if not path:
+        return None
+    logger = logging.getLogger("edison_ai.trace")
+    if not logger.handlers:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        file_handler = logging.FileHandler(path, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        logging.handlers.QueueListener(records, file_handler).start()
+        # The listener thread does not survive a fork; forked workers start their own
+        os.register_at_fork(
+            after_in_child=lambda: logging.handlers.QueueListener(records, file_handler).start()
+        )
+        logger.addHandler(logging.handlers.QueueHandler(records))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def _model_name(serialized: Dict[str, Any], metadata: Dict[str, Any], kwargs: Dict[str, Any]) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return (
+        metadata.get("ls_model_name")
+        or params.get("model_name")
+        or params.get("model")
+        or params.get("_type")
+        or (serialized or {}).get("name")
+        or "unknown"
+    )
+
+
+def _usage(response: LLMResult) -> Tuple[int, int]:
+    """(prompt, completion) tokens reported by the provider."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _estimated_usage(messages: Any, response: LLMResult) -> Tuple[int, int]:
+    """(prompt, completion) tokens counted locally, for calls that report no usage."""
+    prompt = sum(
+        count_tokens(str(message.content)) for batch in messages or [] for message in batch
+    )
+    completion = sum(
+        count_tokens(generation.text)
+        for generations in response.generations
+        for generation in generations
+    )
+    return prompt, completion
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Records every graph node run and chat model call into `registry`.
+
+    Installed process-wide by `install_metrics`, so it sees every run no matter
+    which callbacks the caller (e.g. CopilotKit's event stream) passes in. Node
+    runs are recognized by the `langgraph_node` metadata LangGraph sets on each
+    task.
+    """
+
+    # Handlers are called on the event loop instead of the default executor
+    run_inline = True
+
+    def __init__(self, registry: Registry = REGISTRY, trace_file: Optional[str] = config.TRACE_FILE):
+        self.registry = registry
+        self.tracer = _trace_logger(trace_file)
+        self._nodes: Dict[UUID, Tuple[str, Any, float]] = {}
+        self._models: Dict[UUID, Tuple[str, str, float, Any]] = {}
+        self._roots: Dict[UUID, Any] = {}
+        # When the previous step of each thread's current run finished
+        self._last_end: Dict[Any, float] = {}
+
+    def _trace(self, event: Dict[str, Any]) -> None:
+        if self.tracer is not None:
+            self.tracer.info(json.dumps({"ts": time.time(), **event}, default=str))
+
+    def on_chain_start(
+        self,
+        serialized: Dict[str, Any],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        if parent_run_id is None:
+            self._roots[run_id] = metadata.get("thread_id")
+            return
+        node = metadata.get("langgraph_node")
+        if node is None or kwargs.get("name") != node:
+            return
+        now = time.perf_counter()
+        thread_id = metadata.get("thread_id")
+        last_end = self._last_end.get(thread_id)
+        if last_end is not None and node != "__start__":
+            self.registry.observe("edison_node_queue_seconds", {"node": node}, now - last_end)
+        self._nodes[run_id] = (node, thread_id, now)
+
+    def _end_node(self, run_id: UUID, status: str, outputs: Any = None) -> None:
+        entry = self._nodes.pop(run_id, None)
+        if entry is None:
+            thread_id = self._roots.pop(run_id, None)
+            self._last_end.pop(thread_id, None)
+            return
+        node, thread_id, started = entry
+        now = time.perf_counter()
+        self._last_end[thread_id] = now
+        if node == "__start__":
+            return
+        labels = {"node": node}
+        self.registry.observe("edison_node_duration_seconds", labels, now - started)
+        self.registry.inc("edison_node_runs_total", {**labels, "status": status})
+        route = outputs.get("route") if isinstance(outputs, dict) else None
+        if route:
+            self.registry.inc("edison_routes_total", {**labels, "route": route})
+        self._trace(
+            {
+                "event": "node",
+                "node": node,
+                "thread_id": thread_id,
+                "status": status,
+                "duration": now - started,
+                "route": route,
+            }
+        )
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "ok", outputs)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_node(run_id, "error")
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        metadata = metadata or {}
+        model = _model_name(serialized, metadata, kwargs)
+        self._models[run_id] = (
+            metadata.get("langgraph_node", "none"),
+            model,
+            time.perf_counter(),
+            messages,
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        entry = self._models.pop(run_id, None)
+        if entry is None:
+            return
+        node, model, started, messages = entry
+        duration = time.perf_counter() - started
+        prompt, completion = _usage(response)
+        if not prompt and not completion:
+            # Streamed calls without usage reporting, e.g. OpenAI without stream_usage
+            prompt, completion = _estimated_usage(messages, response)
+        labels = {"node": node, "model": model}
+        self.registry.observe("edison_model_duration_seconds", labels, duration)
+        self.registry.inc("edison_model_calls_total", {**labels, "status": "ok"})
+        self.registry.inc("edison_model_tokens_total", {**labels, "type": "prompt"}, prompt)
+        self.registry.inc("edison_model_tokens_total", {**labels, "type": "completion"}, completion)
+        prices = MODEL_PRICES.get(model)
+        if prices is not None:
+            cost = (prompt * prices[0] + completion * prices[1]) / 1_000_000
+            self.registry.inc("edison_model_cost_usd_total", labels, cost)
+        self._trace(
+            {
+                "event": "model",
+                "node": node,
+                "model": model,
+                "duration": duration,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+            }
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        entry = self._models.pop(run_id, None)
+        if entry is None:
+            return
+        node, model, started, _ = entry
+        labels = {"node": node, "model": model}
+        self.registry.observe("edison_model_duration_seconds", labels, time.perf_counter() - started)
+        self.registry.inc("edison_model_calls_total", {**labels, "status": "error"})
+
+
+def _route_samples():
+    from .routing import ROUTE_COUNTERS
+
+    samples = [
+        ({"source": source, "route": route}, count)
+        for (source, route), count in ROUTE_COUNTERS.items()
+    ]
+    return [("edison_route_decisions_total", "counter", "Routing decisions by source", samples)]
+
+
+def _cache_samples():
+    from . import artifacts, summarize, transcripts
+
+    requests, evictions, saved = [], [], []
+    caches = {}
+    if transcripts._store is not None:
+        caches["transcripts"] = transcripts._store.cache
+    if summarize._summarizer is not None:
+        caches["chunks"] = summarize._summarizer.cache
+    for name, cache in caches.items():
+        requests.append(({"cache": name, "result": "hit"}, cache.stats["hits"]))
+        requests.append(({"cache": name, "result": "miss"}, cache.stats["misses"]))
+        evictions.append(({"cache": name}, cache.stats["evictions"]))
+    if artifacts._artifacts is not None:
+        for kind, stats in artifacts._artifacts.stats.items():
+            requests.append(({"cache": kind, "result": "hit"}, stats["hits"]))
+            requests.append(({"cache": kind, "result": "miss"}, stats["misses"]))
+            saved.append(({"cache": kind}, stats["saved_tokens"]))
+    return [
+        ("edison_cache_requests_total", "counter", "Cache lookups by result", requests),
+        ("edison_cache_evictions_total", "counter", "Entries evicted from disk caches", evictions),
+        ("edison_cache_saved_tokens_total", "counter", "Tokens not spent thanks to cache hits", saved),
+    ]
+
+
+REGISTRY.add_collector(_route_samples)
+REGISTRY.add_collector(_cache_samples)
+
+
+_handler: Optional[MetricsCallbackHandler] = None
+
+
+def install_metrics() -> MetricsCallbackHandler:
+    """Attach a MetricsCallbackHandler to every LangChain run in this process."""
+    global _handler
+    if _handler is None:
+        _handler = MetricsCallbackHandler()
+        register_configure_hook(ContextVar("edison_metrics", default=_handler), inheritable=True)
+    return _handler
+
+
+_snapshot_path: Optional[str] = None
+
+
+def _write_snapshot(path: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(REGISTRY.snapshot(), file, separators=(",", ":"))
+    # Readers see either the previous snapshot or this one, never a partial file
+    os.replace(tmp_path, path)
+
+
+def share_metrics(directory: str, interval: float = config.METRICS_FLUSH_INTERVAL) -> None:
+    """
+    Publish this process's metrics to `directory` every `interval` seconds and
+    add every other process publishing there to `render_metrics`.
+
+    Each worker of `edison-ai-serve` has its own registry, and a scrape reaches
+    just one of them. Snapshots of workers that exited are kept, so counters
+    never go backwards when a worker is replaced.
+    """
+    global _snapshot_path
+    os.makedirs(directory, exist_ok=True)
+    # Unique even when a replacement worker is given a PID back
+    path = os.path.join(directory, f"{os.getpid()}-{time.time_ns()}.json")
+    _snapshot_path = path
+
+    def publish() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                _write_snapshot(path)
+            except OSError:
+                logger.warning("Failed to publish metrics", exc_info=True)
+
+    threading.Thread(target=publish, name="edison-metrics", daemon=True).start()
+
+
+def flush_metrics() -> None:
+    """Publish this process's metrics now, e.g. as a worker exits."""
+    if _snapshot_path is not None:
+        _write_snapshot(_snapshot_path)
+
+
+def clear_shared_metrics(directory: str) -> None:
+    """Remove the snapshots a previous server left in `directory`."""
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".tmp")):
+            os.remove(os.path.join(directory, name))
+
+
+def _shared_snapshots() -> List[Snapshot]:
+    if _snapshot_path is None:
+        return []
+    directory = os.path.dirname(_snapshot_path)
+    snapshots = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not name.endswith(".json") or path == _snapshot_path:
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                snapshots.append(json.load(file))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def render_metrics() -> str:
+    """
+    All metrics in the Prometheus text exposition format. Under `share_metrics`,
+    summed over every process sharing the directory, each at most one publish
+    interval old.
+    """
+    return REGISTRY.render(_shared_snapshots())
@@ -0,0 +1,118 @@
+import asyncio
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Hashable, Optional, Sequence, Tuple, Type
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.retry import RunnableRetry
+
+from .. import config
+
+
+@lru_cache(maxsize=1)
+def retryable_errors() -> Tuple[Type[BaseException], ...]:
+    """Transient provider errors worth retrying: rate limits, 5xx and connection errors."""
+    errors: list = [asyncio.TimeoutError]
+    try:
+        import httpx
+
+        errors.append(httpx.TransportError)
+    except ImportError:
+        pass
+    try:
+        import openai
+
+        errors += [openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError]
+    except ImportError:
+        pass
+    try:
+        import anthropic
+
+        errors += [
+            anthropic.RateLimitError,
+            anthropic.APIConnectionError,
+            anthropic.InternalServerError,
+        ]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+class StreamRetry(RunnableRetry):
+    """
+    RunnableRetry that also retries `astream`, which RunnableRetry passes
+    straight through. A stream is retried only when it fails before its first
+    chunk; after that the caller has consumed part of it, so errors propagate.
+    """
+
+    async def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        async for attempt in self._async_retrying(reraise=True):
+            with attempt:
+                stream = self.bound.astream(input, config, **kwargs)
+                try:
+                    first = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+
+def with_retries(runnable: Runnable, attempts: int = config.MODEL_RETRIES + 1) -> Runnable:
+    """
+    Retry `runnable` on transient provider errors with exponential backoff and
+    jitter, so clients throttled at the same moment do not retry in lockstep.
+    Streams are retried until their first chunk arrives, not after.
+    """
+    return StreamRetry(
+        bound=runnable,
+        kwargs={},
+        config={},
+        retry_exception_types=retryable_errors(),
+        wait_exponential_jitter=True,
+        max_attempt_number=attempts,
+    )
+
+
+# Runnables built on top of each model, keyed by id(model). The runnables hold the
+# model, so an entry keeps its model alive and its id unique; the least recently
+# used models are dropped once more than MAX_CACHED_MODELS are cached
+MAX_CACHED_MODELS = 32
+_runnables: "OrderedDict[int, Dict[Hashable, Runnable]]" = OrderedDict()
+
+
+def _cached(model: BaseChatModel, key: Hashable, build) -> Runnable:
+    cache = _runnables.get(id(model))
+    if cache is None:
+        cache = _runnables[id(model)] = {}
+        while len(_runnables) > MAX_CACHED_MODELS:
+            _runnables.popitem(last=False)
+    else:
+        _runnables.move_to_end(id(model))
+    runnable = cache.get(key)
+    if runnable is None:
+        runnable = cache[key] = with_retries(build())
+    return runnable
+
+
+def chat(model: BaseChatModel) -> Runnable:
+    """`model` with retries, for plain text calls."""
+    return _cached(model, "chat", lambda: model)
+
+
+def structured_output(model: BaseChatModel, schema: Type, **kwargs: Any) -> Runnable:
+    """
+    `model.with_structured_output(schema, **kwargs)` with retries, built once
+    per model and schema instead of on every turn.
+    """
+    key = ("structured", schema, tuple(sorted(kwargs.items())))
+    return _cached(model, key, lambda: model.with_structured_output(schema, **kwargs))
+
+
+def tool_call(model: BaseChatModel, tools: Sequence[Type], tool_choice: str) -> Runnable:
+    """`model.bind_tools(tools, tool_choice=...)` with retries, built once per model."""
+    key = ("tools", tuple(tools), tool_choice)
+    return _cached(model, key, lambda: model.bind_tools(list(tools), tool_choice=tool_choice))
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import BaseModel, PrivateAttr
+
+from ..tokens import count_tokens
+
+# Called with the requested schema (None for plain text) and the prompt messages
+Responder = Callable[[Optional[Type[BaseModel]], List[BaseMessage]], Union[str, BaseModel]]
+
+
+def _fake_value(annotation: Any, name: str) -> Any:
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _fake_value(args[0], name)
+    if origin in (list, List):
+        return [_fake_value(get_args(annotation)[0], name)]
+    if origin is Literal:
+        return get_args(annotation)[0]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation)
+    if annotation is bool:
+        return False
+    if annotation in (int, float):
+        return annotation(0)
+    return f"fake {name}"
+
+
+def fake_instance(schema: Type[BaseModel]) -> BaseModel:
+    """Build a deterministic instance of `schema` with every field filled in."""
+    return schema(
+        **{
+            name: _fake_value(field.annotation, name)
+            for name, field in schema.model_fields.items()
+        }
+    )
+
+
+def default_responder(
+    schema: Optional[Type[BaseModel]], messages: List[BaseMessage]
+) -> Union[str, BaseModel]:
+    if schema is None:
+        return "This is a fake response."
+    return fake_instance(schema)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic, offline chat model for benchmarks and local runs.
+
+    Supports `with_structured_output` by answering with tool calls built by the
+    `responder`, reports token usage, and sleeps for `latency` seconds per call
+    plus `prompt_token_latency` per prompt token before the first chunk, then
+    `chunk_latency` per `chunk_size`-character chunk of output, so graph
+    timings resemble a real provider without network access. Text and tool
+    call arguments are streamed in chunks by `astream`.
+
+    For load tests, `latency_sigma` draws each call's latency from a
+    log-normal distribution around `latency`, and `tokens_per_second` adds
+    output generation time at a rate drawn the same way with `token_rate_sigma`.
+    Draws come from a generator seeded with `seed`.
+    """
+
+    model: str = "fake-chat-model"
+    temperature: float = 0.0
+    streaming: bool = False
+    responder: Responder = default_responder
+    latency: float = 0.0
+    latency_sigma: float = 0.0
+    prompt_token_latency: float = 0.0
+    tokens_per_second: float = 0.0
+    token_rate_sigma: float = 0.0
+    chunk_size: int = 16
+    chunk_latency: float = 0.0
+    seed: Optional[int] = None
+    calls: int = 0
+    prompt_tokens: int = 0
+
+    _random: random.Random = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._random = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    def bind_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        tool_choice: Optional[Any] = None,
+        **kwargs: Any,
+    ):
+        return self.bind(fake_schemas=tuple(tools), **kwargs)
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs: Any):
+        # Provider-specific options such as strict=True or method= are irrelevant here
+        return super().with_structured_output(schema, include_raw=include_raw)
+
+    def _spread(self, value: float, sigma: float) -> float:
+        if not sigma or not value:
+            return value
+        # Log-normal with median `value`
+        return value * self._random.lognormvariate(0.0, sigma)
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        latency = self._spread(self.latency, self.latency_sigma)
+        if not self.prompt_token_latency:
+            return latency
+        input_tokens = sum(count_tokens(str(message.content)) for message in messages)
+        return latency + input_tokens * self.prompt_token_latency
+
+    def _token_time(self, message: AIMessage) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        rate = self._spread(self.tokens_per_second, self.token_rate_sigma)
+        return message.usage_metadata["output_tokens"] / rate
+
+    def _respond(
+        self, messages: List[BaseMessage], fake_schemas: Sequence[Any] = ()
+    ) -> ChatResult:
+        schema = fake_schemas[0] if fake_schemas else None
+        result = self.responder(schema, messages)
+        input_tokens = sum(count_tokens(str(message.content)) for message in messages)
+        if isinstance(result, BaseModel):
+            args = result.model_dump()
+            content = ""
+            tool_calls = [
+                {"name": type(result).__name__, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"}
+            ]
+            output_tokens = count_tokens(result.model_dump_json())
+        else:
+            content = result
+            tool_calls = []
+            output_tokens = count_tokens(content)
+
+        self.calls += 1
+        self.prompt_tokens += input_tokens
+        message = AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _output(self, message: AIMessage) -> str:
+        if message.tool_calls:
+            return json.dumps(message.tool_calls[0]["args"])
+        return str(message.content)
+
+    def _generation_time(self, messages: List[BaseMessage], message: AIMessage) -> float:
+        chunks = -(-len(self._output(message)) // self.chunk_size)
+        return self._delay(messages) + chunks * self.chunk_latency + self._token_time(message)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        fake_schemas: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, fake_schemas)
+        delay = self._generation_time(messages, result.generations[0].message)
+        if delay:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        fake_schemas: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> ChatResult:
+        result = self._respond(messages, fake_schemas)
+        delay = self._generation_time(messages, result.generations[0].message)
+        if delay:
+            await asyncio.sleep(delay)
+        return result
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[Any] = None,
+        fake_schemas: Sequence[Any] = (),
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages, fake_schemas).generations[0].message
+        delay = self._delay(messages)
+        if delay:
+            await asyncio.sleep(delay)
+
+        output = self._output(message)
+        pieces = [
+            output[i : i + self.chunk_size] for i in range(0, len(output), self.chunk_size)
+        ] or [""]
+        chunk_delay = self.chunk_latency + self._token_time(message) / len(pieces)
+        for index, piece in enumerate(pieces):
+            if chunk_delay:
+                await asyncio.sleep(chunk_delay)
+            first, last = index == 0, index == len(pieces) - 1
+            if message.tool_calls:
+                tool_call = message.tool_calls[0]
+                chunk = AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": tool_call["name"] if first else None,
+                            "args": piece,
+                            "id": tool_call["id"] if first else None,
+                            "index": 0,
+                        }
+                    ],
+                )
+            else:
+                chunk = AIMessageChunk(content=piece)
+            if last:
+                chunk.usage_metadata = message.usage_metadata
+            yield ChatGenerationChunk(message=chunk)
@@ -0,0 +1,273 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import PrivateAttr
+
+from .. import config as settings
+from ..metrics import REGISTRY
+
+T = TypeVar("T")
+
+
+class LatencyWindow:
+    """Recent latencies of one call type against one provider."""
+
+    def __init__(self, size: int = settings.HEDGE_WINDOW):
+        self._samples: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class HedgedRunnable(Runnable):
+    """
+    The same call against several providers, in order of preference.
+
+    The first provider gets every request. When it fails, the next one is
+    tried at once; when it has not answered within the hedge delay, the next
+    one is sent the same request and whichever answers first wins, the other
+    being cancelled. The delay is the HEDGE_QUANTILE of the first provider's
+    recent latencies for this call, clamped to [HEDGE_MIN_DELAY,
+    HEDGE_MAX_DELAY], and HEDGE_MAX_DELAY until HEDGE_MIN_SAMPLES calls have
+    been seen. Streams are hedged on the time to their first chunk.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[str],
+        runnables: Sequence[Runnable],
+        hedge: bool = settings.HEDGE_ENABLED,
+        quantile: float = settings.HEDGE_QUANTILE,
+        min_delay: float = settings.HEDGE_MIN_DELAY,
+        max_delay: float = settings.HEDGE_MAX_DELAY,
+        min_samples: int = settings.HEDGE_MIN_SAMPLES,
+    ):
+        self.providers = list(providers)
+        self.runnables = list(runnables)
+        self.hedge = hedge
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.latencies = [LatencyWindow() for _ in self.runnables]
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait for the first provider before hedging, None to never hedge."""
+        if not self.hedge:
+            return None
+        window = self.latencies[0]
+        if len(window) < self.min_samples:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, window.quantile(self.quantile)))
+
+    def _record(self, index: int, seconds: float, outcome: str) -> None:
+        provider = self.providers[index]
+        # Cancelled calls took at least this long, which keeps a slow provider's
+        # quantile from drifting down to only the calls it won
+        self.latencies[index].add(seconds)
+        if outcome == "ok":
+            REGISTRY.observe("edison_provider_latency_seconds", {"provider": provider}, seconds)
+        REGISTRY.inc("edison_provider_requests_total", {"provider": provider, "outcome": outcome})
+
+    async def _race(self, attempt: Callable[[int], Awaitable[T]]) -> Tuple[int, T]:
+        """Run `attempt(i)` per provider until one succeeds, hedging and failing over."""
+        delay = self.hedge_delay()
+        tasks: Dict[asyncio.Future, Tuple[int, float]] = {}
+        errors: List[BaseException] = []
+        launched = 0
+
+        def launch() -> None:
+            nonlocal launched
+            tasks[asyncio.ensure_future(attempt(launched))] = (launched, time.perf_counter())
+            launched += 1
+
+        launch()
+        try:
+            while tasks:
+                more = launched < len(self.runnables)
+                done, _ = await asyncio.wait(
+                    tasks, timeout=delay if more else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    REGISTRY.inc("edison_hedges_total", {"provider": self.providers[0]})
+                    launch()
+                    continue
+                for task in sorted(done, key=lambda task: tasks[task][0]):
+                    index, started = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self._record(index, time.perf_counter() - started, "ok")
+                        return index, task.result()
+                    self._record(index, time.perf_counter() - started, "error")
+                    errors.append(error)
+                    if launched < len(self.runnables) and not tasks:
+                        REGISTRY.inc("edison_failovers_total", {"provider": self.providers[index]})
+                        launch()
+            raise errors[0]
+        finally:
+            for task, (index, started) in tasks.items():
+                task.cancel()
+                self._record(index, time.perf_counter() - started, "cancelled")
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _fail_over(self, attempt: Callable[[int], T]) -> Tuple[int, T]:
+        """Blocking calls cannot be raced, so they only fail over."""
+        for index in range(len(self.runnables)):
+            started = time.perf_counter()
+            try:
+                result = attempt(index)
+            except Exception:
+                self._record(index, time.perf_counter() - started, "error")
+                if index == len(self.runnables) - 1:
+                    raise
+                REGISTRY.inc("edison_failovers_total", {"provider": self.providers[index]})
+                continue
+            self._record(index, time.perf_counter() - started, "ok")
+            return index, result
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        _, output = self._fail_over(
+            lambda index: self.runnables[index].invoke(input, config, **kwargs)
+        )
+        return output
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        _, output = await self._race(
+            lambda index: self.runnables[index].ainvoke(input, config, **kwargs)
+        )
+        return output
+
+    def stream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Optional[Any]
+    ) -> Iterator[Any]:
+        streams: Dict[int, Iterator[Any]] = {}
+
+        def first_chunk(index: int) -> Any:
+            stream = streams[index] = iter(self.runnables[index].stream(input, config, **kwargs))
+            return next(stream)
+
+        winner, chunk = self._fail_over(first_chunk)
+        yield chunk
+        yield from streams[winner]
+
+    async def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Optional[Any]
+    ) -> AsyncIterator[Any]:
+        streams: Dict[int, AsyncIterator[Any]] = {}
+
+        async def first_chunk(index: int) -> Any:
+            stream = streams[index] = self.runnables[index].astream(input, config, **kwargs)
+            return await stream.__anext__()
+
+        try:
+            winner, chunk = await self._race(first_chunk)
+            yield chunk
+            async for chunk in streams[winner]:
+                yield chunk
+        finally:
+            for stream in streams.values():
+                await stream.aclose()
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    Chat model routing every call through a HedgedRunnable over `models`.
+
+    Structured output and tool binding are delegated to each model, so every
+    provider formats the schema its own way. Each underlying model reports its
+    own callbacks and token usage; the wrapper adds none.
+    """
+
+    models: List[BaseChatModel]
+    providers: List[str]
+    _plain: HedgedRunnable = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._plain = self._hedged(self.models)
+
+    @property
+    def model_name(self) -> str:
+        """The preferred model, which names cached artifacts."""
+        return getattr(self.models[0], "model_name", None) or getattr(self.models[0], "model")
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    def _hedged(self, runnables: Sequence[Runnable]) -> HedgedRunnable:
+        return HedgedRunnable(self.providers, runnables)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self.models[0]._generate(messages, stop, run_manager, **kwargs)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return self._plain.invoke(input, config, **kwargs)
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        return await self._plain.ainvoke(input, config, **kwargs)
+
+    def stream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[Any]:
+        return self._plain.stream(input, config, **kwargs)
+
+    def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        return self._plain.astream(input, config, **kwargs)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> Runnable:
+        return self._hedged([model.bind_tools(tools, **kwargs) for model in self.models])
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        runnables = []
+        for model in self.models:
+            try:
+                runnables.append(model.with_structured_output(schema, **kwargs))
+            except (TypeError, ValueError):
+                # Provider-specific options, e.g. OpenAI's `strict`, are dropped elsewhere
+                runnables.append(model.with_structured_output(schema))
+        return self._hedged(runnables)
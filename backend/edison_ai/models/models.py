@@ -1,28 +1,110 @@
-from typing import Literal
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
+import importlib
+import warnings
+from functools import lru_cache
+from typing import Literal, Optional, Type
+
+import httpx
+from langchain_core._api import LangChainBetaWarning
 from langchain_core.language_models import BaseChatModel
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from .. import config as settings
+from .hedge import HedgedChatModel
 
-ModelProvider = Literal["openai", "anthropic"]
+ModelProvider = Literal["openai", "anthropic", "fake"]
 
+# Provider classes are named as "module:class" and imported on first use, so a process
+# never pays for importing provider SDKs it does not call
 MODEL_CONFIGS = {
     "openai": {
-        "class": ChatOpenAI,
+        "class": "langchain_openai:ChatOpenAI",
         "model": "gpt-4o-2024-08-06",
     },
     "anthropic": {
-        "class": ChatAnthropic,
+        "class": "langchain_anthropic:ChatAnthropic",
         "model": "claude-3-5-sonnet-20240620",
     },
+    # Offline model for benchmarks and load tests; no API key needed
+    "fake": {
+        "class": "edison_ai.models.fake:FakeChatModel",
+        "model": "fake-chat-model",
+    },
 }
 
-def get_model(provider: ModelProvider = "openai", streaming: bool = True) -> BaseChatModel:
+
+@lru_cache(maxsize=None)
+def model_class(provider: str) -> Type[BaseChatModel]:
+    """The chat model class of `provider`, imported on first use."""
+    module, name = MODEL_CONFIGS[provider]["class"].split(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.MODEL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.MODEL_MAX_KEEPALIVE,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Connection pool shared by every sync model client of this process."""
+    return httpx.Client(limits=_limits(), timeout=settings.MODEL_TIMEOUT)
+
+
+@lru_cache(maxsize=1)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Connection pool shared by every async model client of this process."""
+    return httpx.AsyncClient(limits=_limits(), timeout=settings.MODEL_TIMEOUT)
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter(provider: str) -> Optional[InMemoryRateLimiter]:
+    """Token bucket shared by every model of `provider`, or None when unlimited."""
+    rps = settings.model_rps(provider)
+    if rps <= 0:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", LangChainBetaWarning)
+        return InMemoryRateLimiter(
+            requests_per_second=rps,
+            check_every_n_seconds=min(0.1, 1 / rps),
+            max_bucket_size=max(1, settings.MODEL_BURST),
+        )
+
+
+def _client_kwargs(provider: str) -> dict:
+    """Pooling and timeouts per provider; retries are left to `clients.with_retries`."""
+    if provider == "openai":
+        return {
+            "http_client": get_http_client(),
+            "http_async_client": get_async_http_client(),
+            # Streamed responses only carry token usage when asked for it
+            "stream_usage": True,
+            "max_retries": 0,
+            "timeout": settings.MODEL_TIMEOUT,
+        }
+    if provider == "anthropic":
+        # ChatAnthropic builds its own SDK client, pooled per model instance
+        return {"max_retries": 0, "timeout": settings.MODEL_TIMEOUT}
+    return {}
+
+
+def get_model(
+    provider: ModelProvider = "openai",
+    streaming: bool = True,
+    model_name: Optional[str] = None,
+    **kwargs,
+) -> BaseChatModel:
     """
     Factory function to create and return a chat model based on the specified provider.
 
     Args:
         provider (ModelProvider): The model provider to use. Defaults to "openai".
         streaming (bool): Whether to enable streaming for the model. Defaults to True.
+        model_name (str, optional): Overrides the provider's default model.
+        **kwargs: Extra arguments for the model class, e.g. the latency settings
+            of the fake model.
 
     Returns:
         BaseChatModel: An instance of the specified chat model.
@@ -34,15 +116,47 @@ def get_model(provider: ModelProvider = "openai", streaming: bool = True) -> Bas
         raise ValueError(f"Unsupported provider: {provider}")
 
     config = MODEL_CONFIGS[provider]
-    return config["class"](
-        model=config["model"],
+    kwargs = {
+        **_client_kwargs(provider),
+        "rate_limiter": get_rate_limiter(provider),
+        **kwargs,
+    }
+    return model_class(provider)(
+        model=model_name or config["model"],
         temperature=0,
-        streaming=streaming
+        streaming=streaming,
+        **kwargs,
+    )
+
+
+def get_routed_model(streaming: bool = True) -> BaseChatModel:
+    """
+    The configured model, wrapped in a HedgedChatModel that fails over and hedges
+    to EDISON_FALLBACK_PROVIDER when one is set.
+    """
+    primary = get_model(settings.MODEL_PROVIDER, streaming, settings.MODEL_NAME)
+    if not settings.FALLBACK_PROVIDER:
+        return primary
+    fallback = get_model(settings.FALLBACK_PROVIDER, streaming, settings.FALLBACK_MODEL_NAME)
+    return HedgedChatModel(
+        models=[primary, fallback],
+        providers=[settings.MODEL_PROVIDER, settings.FALLBACK_PROVIDER],
     )
 
-# TODO: model can come from an env var or some other config
-model = get_model("openai")
-nonstreaming_model = get_model("openai", streaming=False)
+
+@lru_cache(maxsize=None)
+def get_default_model(streaming: bool = True) -> BaseChatModel:
+    """The configured model shared by every node, built on first use."""
+    return get_routed_model(streaming)
+
+
+def __getattr__(name: str):
+    # `model` and `nonstreaming_model` are built when first read, not at import
+    if name == "model":
+        return get_default_model()
+    if name == "nonstreaming_model":
+        return get_default_model(streaming=False)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Configuration for tool binding
 tool_bind_kwargs = {
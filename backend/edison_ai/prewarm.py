@@ -0,0 +1,100 @@
+"""Pre-generate lesson plans and quizzes for a list of videos ahead of a class."""
+
+import argparse
+import asyncio
+import logging
+from typing import Iterable, List
+
+from dotenv import find_dotenv, load_dotenv
+
+from .schema import StudentAssessment, StudentLevelAssessment
+
+logger = logging.getLogger(__name__)
+
+
+def level_assessment(level: str) -> StudentLevelAssessment:
+    """A stand-in assessment that puts a student in `level`'s bucket."""
+    return StudentLevelAssessment(
+        assessment=StudentAssessment(),
+        overall_level=level,
+        strengths=[],
+        areas_for_improvement=[],
+    )
+
+
+async def prewarm_video(video_id: str, levels: Iterable[str]) -> None:
+    # Imported here so the graph and model are only built when actually prewarming, and
+    # so that main() can load .env before config reads the environment
+    from . import agent
+    from .artifacts import UNASSESSED, get_artifact_cache, model_name
+    from .retrieval import get_index_store
+    from .transcripts import get_transcript_store
+
+    artifacts = get_artifact_cache()
+    name = model_name(agent.chat_model())
+
+    lesson = await artifacts.get_lesson(video_id, name)
+    if lesson is None:
+        transcript = await get_transcript_store().get(video_id)
+        lesson, tokens = await agent.generate_lesson(transcript)
+        await artifacts.set_lesson(video_id, name, lesson, tokens)
+    await get_index_store().get(video_id, lambda: get_transcript_store().get(video_id))
+
+    for level in levels:
+        if await artifacts.get_quiz(video_id, name, level) is not None:
+            continue
+        assessment = None if level == UNASSESSED else level_assessment(level)
+        quiz, tokens = await agent.generate_quiz(lesson, assessment)
+        await artifacts.set_quiz(video_id, name, level, quiz, tokens)
+    logger.info("Prewarmed %s", video_id)
+
+
+async def prewarm(video_ids: List[str], levels: List[str], concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(video_id: str) -> None:
+        async with semaphore:
+            try:
+                await prewarm_video(video_id, levels)
+            except Exception:
+                logger.exception("Failed to prewarm %s", video_id)
+
+    await asyncio.gather(*(run(video_id) for video_id in video_ids))
+
+
+def main():
+    """Run the prewarm command."""
+    load_dotenv(find_dotenv(usecwd=True))
+    from .artifacts import LEVEL_BUCKETS, UNASSESSED, get_artifact_cache
+    from .transcripts import extract_video_id
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("videos", nargs="+", help="YouTube URLs or video IDs")
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        default=[UNASSESSED, *LEVEL_BUCKETS],
+        choices=[UNASSESSED, *LEVEL_BUCKETS],
+        help="Level buckets to generate quizzes for",
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    video_ids = []
+    for video in args.videos:
+        video_id = extract_video_id(video)
+        if video_id is None:
+            parser.error(f"Not a YouTube URL or video ID: {video}")
+        video_ids.append(video_id)
+
+    asyncio.run(prewarm(video_ids, args.levels, args.concurrency))
+
+    for kind, stats in get_artifact_cache().stats.items():
+        logger.info(
+            "%s cache: %d hits, %d misses, %d tokens saved",
+            kind, stats["hits"], stats["misses"], stats["saved_tokens"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AnyMessage
+
+from . import config
+from .models.clients import structured_output
+from .prompts import PLAN_QUIZ_PROMPT, QUIZ_QUESTION_PROMPT
+from .schema import Quiz, QuizPlan, QuizQuestion, QuizTopic, StudentLevelAssessment
+from .streaming import OnQuestions
+from .tokens import generation_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def validate_question(question: QuizQuestion) -> None:
+    """Raise ValueError unless `question` can be asked as a multiple-choice question."""
+    if not question.question.strip():
+        raise ValueError("Question has no text")
+    if len(question.answers) < 2:
+        raise ValueError(f"Question has {len(question.answers)} answers")
+    correct = sum(answer.is_correct for answer in question.answers)
+    if correct != 1:
+        raise ValueError(f"Question has {correct} correct answers")
+    texts = [answer.text.strip().lower() for answer in question.answers]
+    if len(set(texts)) != len(texts):
+        raise ValueError("Question has duplicate answers")
+
+
+class ParallelQuizGenerator:
+    """
+    Generates a quiz in two steps: one call plans a topic per question, then
+    the questions are written concurrently (at most `concurrency` calls in
+    flight). Each question is validated and retried on its own, and one that
+    still fails after `retries` extra attempts is dropped instead of failing
+    the quiz. Questions always keep the order of the plan.
+    """
+
+    def __init__(
+        self,
+        questions: int = config.QUIZ_QUESTIONS,
+        concurrency: int = config.QUIZ_CONCURRENCY,
+        retries: int = config.QUIZ_QUESTION_RETRIES,
+    ):
+        self.questions = questions
+        self.concurrency = concurrency
+        self.retries = retries
+
+    async def _question(
+        self,
+        model: BaseChatModel,
+        topic: QuizTopic,
+        lesson: Optional[str],
+        assessment: Optional[StudentLevelAssessment],
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[Optional[QuizQuestion], int]:
+        rejected = ""
+        tokens = 0
+        for attempt in range(self.retries + 1):
+            # The retry prompt says what was wrong with the previous attempt,
+            # e.g. "Question has 2 correct answers"
+            messages = [
+                QUIZ_QUESTION_PROMPT.message(
+                    topic=topic.model_dump_json(),
+                    lesson=lesson,
+                    assessment=assessment,
+                    rejected=rejected,
+                )
+            ]
+            try:
+                async with semaphore:
+                    question = await structured_output(model, QuizQuestion).ainvoke(messages)
+                tokens += generation_tokens(messages, question.model_dump_json())
+                validate_question(question)
+                return question, tokens
+            except Exception as e:
+                if isinstance(e, ValueError):
+                    # Failed validation, or output that did not parse as a QuizQuestion
+                    rejected = str(e)
+                logger.warning(
+                    "Question on %r failed (attempt %d): %s", topic.topic, attempt + 1, e
+                )
+        return None, tokens
+
+    async def generate(
+        self,
+        model: BaseChatModel,
+        lesson: Optional[str],
+        assessment: Optional[StudentLevelAssessment],
+        summary: Optional[str] = None,
+        messages: Sequence[AnyMessage] = (),
+        on_questions: Optional[OnQuestions] = None,
+    ) -> Tuple[Quiz, int]:
+        """Generate the quiz; returns (quiz, tokens spent)."""
+        prompt = [
+            PLAN_QUIZ_PROMPT.message(
+                questions=str(self.questions),
+                lesson=lesson,
+                assessment=assessment,
+                summary=summary,
+            ),
+            *messages,
+        ]
+        plan: QuizPlan = await structured_output(model, QuizPlan).ainvoke(prompt)
+        tokens = generation_tokens(prompt, plan.model_dump_json())
+        topics = plan.topics[: self.questions]
+        header = plan.model_dump(exclude={"topics"})
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            asyncio.ensure_future(self._question(model, topic, lesson, assessment, semaphore))
+            for topic in topics
+        ]
+        results: List[Optional[QuizQuestion]] = [None] * len(tasks)
+        finished = [False] * len(tasks)
+        emitted = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                await next_done
+                for index, task in enumerate(tasks):
+                    if task.done() and not finished[index]:
+                        finished[index] = True
+                        results[index], spent = task.result()
+                        tokens += spent
+
+                # Only the leading run of finished questions is shown, so the
+                # UI never sees questions reorder
+                ready = 0
+                while ready < len(finished) and finished[ready]:
+                    ready += 1
+                if on_questions is not None and ready > emitted:
+                    emitted = ready
+                    questions = [q.model_dump() for q in results[:ready] if q is not None]
+                    await on_questions({**header, "questions": questions})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        questions = [question for question in results if question is not None]
+        if not questions:
+            raise ValueError("The model did not return any valid quiz question")
+        return Quiz(**header, questions=questions), tokens
+
+
+_generator: Optional[ParallelQuizGenerator] = None
+
+
+def get_quiz_generator() -> ParallelQuizGenerator:
+    """Return the process-wide parallel quiz generator, configured from the environment."""
+    global _generator
+    if _generator is None:
+        _generator = ParallelQuizGenerator()
+    return _generator
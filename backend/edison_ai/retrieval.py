@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import zlib
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from . import config
+from .executor import run_blocking
+from .summarize import chunk_span, chunk_transcript
+from .transcripts import Transcript, transcript_text
+
+# numpy is imported where indexes are built, loaded or searched, not with the agent
+if TYPE_CHECKING:
+    import numpy as np
+
+# Size of the hashed vocabulary; collisions are rare at lecture scale
+HASH_BITS = 20
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do for from has have he i if in is it its of on or "
+    "so that the their there they this to was we what when which who will with you your "
+    "uh um like just okay yeah".split()
+)
+
+_ARRAYS = ("term_ids", "doc_ids", "term_freqs", "doc_lengths", "vocab", "doc_freqs", "offsets")
+# Part of each saved index's directory name, so indexes in an older layout are rebuilt
+INDEX_FORMAT = 2
+
+
+def tokenize(text: str) -> List[int]:
+    """Lowercase word tokens, minus stopwords, hashed into the vocabulary."""
+    mask = (1 << HASH_BITS) - 1
+    return [
+        zlib.crc32(token.encode("utf-8")) & mask
+        for token in _TOKEN.findall(text.lower())
+        if token not in _STOPWORDS
+    ]
+
+
+class TranscriptIndex:
+    """
+    BM25 index over the timestamped passages of one transcript.
+
+    Postings are stored as flat NumPy arrays (hashed term ID, passage ID, term
+    frequency) so an index can be saved once per video and memory-mapped by
+    every worker instead of being rebuilt per session. They are sorted by term,
+    and `offsets` holds where each vocabulary term's postings start, so a query
+    term is found by binary search instead of a scan over every posting.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, passages: List[Dict], arrays: Dict[str, "np.ndarray"]):
+        self.passages = passages
+        self.term_ids = arrays["term_ids"]
+        self.doc_ids = arrays["doc_ids"]
+        self.term_freqs = arrays["term_freqs"]
+        self.doc_lengths = arrays["doc_lengths"]
+        self.vocab = arrays["vocab"]
+        self.doc_freqs = arrays["doc_freqs"]
+        self.offsets = arrays["offsets"]
+        self.avg_length = float(self.doc_lengths.mean()) if len(self.doc_lengths) else 0.0
+
+    @classmethod
+    def build(cls, transcript: Transcript, passage_tokens: int) -> "TranscriptIndex":
+        import numpy as np
+
+        passages = [
+            {"span": chunk_span(chunk), "text": transcript_text(chunk)}
+            for chunk in chunk_transcript(transcript, passage_tokens)
+        ]
+        term_ids, doc_ids, term_freqs, doc_lengths = [], [], [], []
+        for doc_id, passage in enumerate(passages):
+            tokens = tokenize(passage["text"])
+            doc_lengths.append(len(tokens))
+            for term, freq in Counter(tokens).items():
+                term_ids.append(term)
+                doc_ids.append(doc_id)
+                term_freqs.append(freq)
+
+        term_array = np.asarray(term_ids, dtype=np.int32)
+        doc_array = np.asarray(doc_ids, dtype=np.int32)
+        # Postings sorted by term, then passage; a term's postings are one slice
+        order = np.lexsort((doc_array, term_array))
+        term_array = term_array[order]
+        vocab, offsets, doc_freqs = np.unique(term_array, return_index=True, return_counts=True)
+        arrays = {
+            "term_ids": term_array,
+            "doc_ids": doc_array[order],
+            "term_freqs": np.asarray(term_freqs, dtype=np.float32)[order],
+            "doc_lengths": np.asarray(doc_lengths, dtype=np.float32),
+            "vocab": vocab.astype(np.int32),
+            "doc_freqs": doc_freqs.astype(np.int32),
+            "offsets": offsets.astype(np.int64),
+        }
+        return cls(passages, arrays)
+
+    def save(self, directory: str) -> None:
+        import numpy as np
+
+        tmp_directory = tempfile.mkdtemp(
+            prefix=f"{os.path.basename(directory)}.", suffix=".tmp", dir=os.path.dirname(directory)
+        )
+        for name in _ARRAYS:
+            np.save(os.path.join(tmp_directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(tmp_directory, "passages.json"), "w", encoding="utf-8") as file:
+            json.dump(self.passages, file, separators=(",", ":"))
+        try:
+            os.rename(tmp_directory, directory)
+        except OSError:
+            # Another worker or thread saved the same index first
+            shutil.rmtree(tmp_directory, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str) -> "TranscriptIndex":
+        import numpy as np
+
+        arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+        with open(os.path.join(directory, "passages.json"), "r", encoding="utf-8") as file:
+            passages = json.load(file)
+        return cls(passages, arrays)
+
+    def search(self, query: str, k: int) -> List[Dict]:
+        """The `k` passages most relevant to `query`, in transcript order."""
+        import numpy as np
+
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        n = len(self.passages)
+        for term in set(tokenize(query)):
+            position = np.searchsorted(self.vocab, term)
+            if position >= len(self.vocab) or self.vocab[position] != term:
+                continue
+            df = float(self.doc_freqs[position])
+            idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            start = int(self.offsets[position])
+            docs = self.doc_ids[start : start + int(df)]
+            tf = self.term_freqs[start : start + int(df)]
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / self.avg_length)
+            np.add.at(scores, docs, idf * tf * (self.k1 + 1) / (tf + norm))
+
+        if k < n:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(n)
+        top = [int(i) for i in top if scores[i] > 0]
+        return [self.passages[i] for i in sorted(top)]
+
+
+def format_passages(passages: List[Dict]) -> str:
+    return "\n\n".join(f"[{passage['span']}] {passage['text']}" for passage in passages)
+
+
+class IndexStore:
+    """Builds, persists and memory-maps one TranscriptIndex per video."""
+
+    def __init__(
+        self,
+        directory: str,
+        passage_tokens: int = config.RETRIEVAL_PASSAGE_TOKENS,
+        max_loaded: int = 64,
+    ):
+        self.directory = directory
+        self.passage_tokens = passage_tokens
+        self.max_loaded = max_loaded
+        self._loaded: "OrderedDict[str, TranscriptIndex]" = OrderedDict()
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}-{self.passage_tokens}-v{INDEX_FORMAT}")
+
+    def _get_or_build(self, video_id: str, transcript: Transcript) -> TranscriptIndex:
+        path = self._path(video_id)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            TranscriptIndex.build(transcript, self.passage_tokens).save(path)
+        return TranscriptIndex.load(path)
+
+    async def get(self, video_id: str, transcript_loader) -> TranscriptIndex:
+        """
+        Return the index for `video_id`, building it from the transcript
+        returned by the async `transcript_loader` the first time.
+        """
+        index = self._loaded.get(video_id)
+        if index is not None:
+            self._loaded.move_to_end(video_id)
+            return index
+
+        transcript: Transcript = []
+        if not os.path.exists(self._path(video_id)):
+            transcript = await transcript_loader()
+        index = await run_blocking(self._get_or_build, video_id, transcript)
+        self._loaded[video_id] = index
+        while len(self._loaded) > self.max_loaded:
+            self._loaded.popitem(last=False)
+        return index
+
+
+_indexes: Optional[IndexStore] = None
+
+
+def get_index_store() -> IndexStore:
+    """Return the process-wide index store, configured from the environment."""
+    global _indexes
+    if _indexes is None:
+        _indexes = IndexStore(config.INDEX_DIR)
+    return _indexes
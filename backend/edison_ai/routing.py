@@ -0,0 +1,126 @@
+import re
+from collections import Counter
+from typing import Optional, Tuple
+
+from .grading import parse_answers
+from .schema import (
+    ANALYZE_STUDENT_LEVEL,
+    CREATE_QUIZ,
+    EXTRACT_STUDENT_RESPONSE,
+    GRADE_QUIZ,
+    AgentState,
+    StudentAssessment,
+    StudentLevelAssessment,
+)
+
+# How often each route was decided locally ("rule") or by the LLM router ("llm"),
+# keyed by (source, route)
+ROUTE_COUNTERS: Counter = Counter()
+
+# "test" alone is too common ("a t-test", "unit test") to count as a quiz request
+_QUIZ_REQUEST = re.compile(
+    r"\b(?:(?:make|create|generate|give|build|prepare|start|take|want|ready for)\b(?P<gap>.{0,30}?)"
+    r"\bquiz(?:zes)?|quiz me|test me|test my (?:knowledge|understanding))\b",
+    re.IGNORECASE,
+)
+# Words between the verb and "quiz" that make it a question about the quiz, as in
+# "I want to know how the quiz will be graded"
+_QUESTION_GAP = re.compile(
+    r"\b(?:how|what|when|why|where|which|who|whether|if|about|know|understand|ask)\b",
+    re.IGNORECASE,
+)
+# A clause continuing after "quiz" ("... the quiz is graded", "... the quiz, how long is it?");
+# these turns are left to the LLM router
+_QUESTION_CLAUSE = re.compile(
+    r"[\s,]+(?:is|are|was|will|would|be|does|did|has|had|can|could|should|works?|counts?|gets?"
+    r"|how|what|when|why|where|which|whether|if)\b",
+    re.IGNORECASE,
+)
+_NEGATION = re.compile(
+    r"\b(?:no|not|never|don['’]?t|do not|doesn['’]?t|won['’]?t|wouldn['’]?t|can['’]?t|cannot"
+    r"|isn['’]?t|aren['’]?t|rather not)\b",
+    re.IGNORECASE,
+)
+# Characters before the request searched for a negation, within the same clause
+_NEGATION_WINDOW = 20
+_CLAUSE_END = re.compile(r"[,.;:!?]")
+_READY = re.compile(
+    r"^\s*(?:yes|yeah|yep|sure|ok(?:ay)?|ready|i'?m ready|let'?s go|go ahead|next|continue|sounds good|looks good)"
+    r"[\s.!]*$",
+    re.IGNORECASE,
+)
+
+
+def assessment_progress(assessment: Optional[StudentLevelAssessment]) -> Tuple[int, int]:
+    """Return (answered, total) StudentAssessment questions."""
+    total = len(StudentAssessment.model_fields)
+    if assessment is None:
+        return 0, total
+    answered = sum(
+        1
+        for name in StudentAssessment.model_fields
+        if getattr(assessment.assessment, name).response
+    )
+    return answered, total
+
+
+def is_quiz_request(text: str) -> bool:
+    """
+    True when `text` asks for a quiz: not negated ("I don't want a quiz yet") and not
+    a question about the quiz ("I want to know how the quiz will be graded").
+    """
+    for match in _QUIZ_REQUEST.finditer(text):
+        if match.group("gap") and _QUESTION_GAP.search(match.group("gap")):
+            continue
+        if _QUESTION_CLAUSE.match(text, match.end()):
+            continue
+        # "I'm not sure, quiz me" is not negated: only the clause leading into the request counts
+        window = text[max(0, match.start() - _NEGATION_WINDOW) : match.end()]
+        if _NEGATION.search(_CLAUSE_END.split(window)[-1]):
+            continue
+        return True
+    return False
+
+
+def classify_turn(state: AgentState) -> Optional[str]:
+    """
+    Decide the route for unambiguous turns without calling the LLM router.
+
+    Returns None when the turn is ambiguous and the LLM router should decide.
+    """
+    if not state.messages or state.messages[-1].type != "human":
+        return None
+    text = str(state.messages[-1].content)
+
+    if state.quiz is not None and parse_answers(text, state.quiz, state.score):
+        return GRADE_QUIZ
+
+    answered, total = assessment_progress(state.assessment)
+    if is_quiz_request(text):
+        # A quiz needs a finished assessment; the LLM router decides what to do until then
+        return CREATE_QUIZ if answered >= total else None
+    if state.quiz is not None or answered >= total:
+        # While a quiz is active, a reply that is not an answer ("why is b right?") is
+        # not an assessment response, even after an AI message ending with "?"
+        return None
+
+    previous = state.messages[-2] if len(state.messages) > 1 else None
+    if previous is not None and previous.type == "ai" and str(previous.content).rstrip().endswith("?"):
+        # The student is replying to the assessment question we just asked, even
+        # when the reply is a bare "yes"
+        return EXTRACT_STUDENT_RESPONSE
+    if _READY.match(text):
+        return ANALYZE_STUDENT_LEVEL
+    return None
+
+
+def record_route(source: str, route: str) -> None:
+    ROUTE_COUNTERS[(source, route)] += 1
+
+
+def route_stats() -> dict:
+    """Route counts per source, e.g. {"rule": {"create_quiz": 3}, "llm": {...}}."""
+    stats: dict = {"rule": {}, "llm": {}}
+    for (source, route), count in ROUTE_COUNTERS.items():
+        stats.setdefault(source, {})[route] = count
+    return stats
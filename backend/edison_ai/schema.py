@@ -1,4 +1,4 @@
-from typing import Annotated, List, Optional
+from typing import Annotated, Any, Dict, List, Optional, Union
 from langchain_core.messages import AnyMessage
 from langgraph.graph.message import add_messages
 from pydantic import BaseModel, Field
@@ -11,6 +11,8 @@ CREATE_QUIZ = "create_quiz"
 ROUTER = "router"
 EXTRACT_STUDENT_RESPONSE = "extract_student_response"
 TRANSCRIBE_YOUTUBE = "transcribe_youtube"
+FUSED_TURN = "fused_turn"
+GRADE_QUIZ = "grade_quiz"
 
 class QuestionResponse(BaseModel):
     question: str = Field(default="", description="The question posed to the student")
@@ -59,6 +61,15 @@ class ResponseAssessment(BaseModel):
     should_analyze_student_level: ShouldAnalyzeStudentLevel
     should_extract_student_response: ShouldExtractStudentResponse
 
+class FusedTurn(BaseModel):
+    """
+    Use this to handle the student's turn in a single step: decide whether to create a quiz,
+    record what the student's latest response reveals about their level, and ask the next assessment question.
+    """
+    should_create_quiz: ShouldCreateQuiz
+    assessment: StudentLevelAssessment = Field(description="The StudentLevelAssessment updated with the information extracted from the student's latest response")
+    next_question: str = Field(description="The next assessment question to ask the student. Empty if a quiz should be created.")
+
 class YouTubeURLParser(BaseModel):
     """
     Parse the YouTube URL from the user's input
@@ -72,15 +83,6 @@ class Log(TypedDict):
     message: str
     done: bool
     
-class AgentState(BaseModel):
-    messages: Annotated[List[AnyMessage], add_messages] = Field(default_factory=list)
-    route: Optional[str] = Field(default=None)
-    assessment: Optional[StudentLevelAssessment] = Field(default=None)
-    lesson_explanation: Optional[str] = Field(default=None)
-    logs: List[Log] = Field(default_factory=list)
-    transcript: Optional[str] = Field(default=None)
-    quiz: Optional[str] = Field(default=None)
-
 class QuizAnswer(BaseModel):
     text: str = Field(description="The answer text")
     is_correct: bool = Field(description="Whether this is the correct answer")
@@ -99,4 +101,108 @@ class Quiz(BaseModel):
     instructions: str = Field(description="Instructions for taking the quiz")
     questions: List[QuizQuestion] = Field(description="List of quiz questions")
     difficulty_level: str = Field(description="Overall difficulty level of the quiz")
-    target_skills: List[str] = Field(description="List of skills being tested in this quiz")
\ No newline at end of file
+    target_skills: List[str] = Field(description="List of skills being tested in this quiz")
+
+class QuizTopic(BaseModel):
+    topic: str = Field(description="The main topic the question should cover")
+    skill_tested: str = Field(description="The type of skill the question should test (recall, comprehension, application, etc.)")
+    difficulty: str = Field(description="Difficulty level of the question (easy, moderate, or challenging)")
+
+class QuizPlan(BaseModel):
+    title: str = Field(description="Title of the quiz")
+    description: str = Field(description="Brief description of the quiz content")
+    instructions: str = Field(description="Instructions for taking the quiz")
+    difficulty_level: str = Field(description="Overall difficulty level of the quiz")
+    target_skills: List[str] = Field(description="List of skills being tested in this quiz")
+    topics: List[QuizTopic] = Field(description="One entry per question, in the order the questions should appear")
+
+class QuizResult(BaseModel):
+    question: int = Field(description="Index of the question in the quiz")
+    answer: int = Field(description="Index of the answer the student chose")
+    correct: bool = Field(description="Whether the chosen answer is correct")
+
+class QuizScore(BaseModel):
+    # Latest answer per question, in the order the questions were first answered
+    results: List[QuizResult] = Field(default_factory=list)
+    attempts: int = Field(default=0, description="Answers submitted, including changed answers")
+
+    @property
+    def correct(self) -> int:
+        return sum(result.correct for result in self.results)
+
+# Field-level changes to a StudentLevelAssessment, as built by `assessment_patch`;
+# "assessment" maps skill names to their QuestionResponse
+AssessmentPatch = Dict[str, Any]
+
+def empty_assessment() -> StudentLevelAssessment:
+    return StudentLevelAssessment(
+        assessment=StudentAssessment(),
+        overall_level="",
+        strengths=[],
+        areas_for_improvement=[],
+    )
+
+def assessment_patch(
+    current: Optional[StudentLevelAssessment],
+    update: Optional[StudentLevelAssessment],
+) -> Union[StudentLevelAssessment, AssessmentPatch, None]:
+    """
+    The fields of `update` that change `current`, for nodes to return instead
+    of the whole assessment. Empty fields of `update` keep their current value.
+    Without a current assessment the patch is `update` itself.
+    """
+    if current is None or update is None:
+        return update
+    patch: AssessmentPatch = {}
+    for field in ("overall_level", "strengths", "areas_for_improvement"):
+        value = getattr(update, field)
+        if value and value != getattr(current, field):
+            patch[field] = value
+    skills = {
+        skill: response
+        for skill, response in update.assessment
+        if any(response.model_dump().values()) and response != getattr(current.assessment, skill)
+    }
+    if skills:
+        patch["assessment"] = skills
+    return patch
+
+def merge_assessment(
+    current: Optional[StudentLevelAssessment],
+    update: Union[StudentLevelAssessment, AssessmentPatch, None],
+) -> Optional[StudentLevelAssessment]:
+    """
+    Reducer of AgentState.assessment: applies a patch from `assessment_patch`,
+    or the non-empty fields of a whole assessment, to a copy of `current`.
+    """
+    if update is None:
+        return current
+    if isinstance(update, StudentLevelAssessment):
+        update = assessment_patch(current or empty_assessment(), update)
+    if not update:
+        return current
+    base = current or empty_assessment()
+    changes = {field: value for field, value in update.items() if field != "assessment"}
+    if update.get("assessment"):
+        changes["assessment"] = base.assessment.model_copy(
+            update={
+                skill: QuestionResponse.model_validate(response)
+                for skill, response in update["assessment"].items()
+            }
+        )
+    return base.model_copy(update=changes)
+
+class AgentState(BaseModel):
+    messages: Annotated[List[AnyMessage], add_messages] = Field(default_factory=list)
+    # Rolling summary of messages[:summarized_messages], which are no longer sent verbatim
+    conversation_summary: Optional[str] = Field(default=None)
+    summarized_messages: int = Field(default=0)
+    route: Optional[str] = Field(default=None)
+    # Nodes return patches to the assessment, which are merged into it
+    assessment: Annotated[Optional[StudentLevelAssessment], merge_assessment] = Field(default=None)
+    lesson_explanation: Optional[str] = Field(default=None)
+    logs: List[Log] = Field(default_factory=list)
+    video_id: Optional[str] = Field(default=None)
+    transcript: Optional[str] = Field(default=None)
+    quiz: Optional[Quiz] = Field(default=None)
+    score: Optional[QuizScore] = Field(default=None)
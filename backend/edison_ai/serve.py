@@ -0,0 +1,181 @@
+"""Serve the app in production with a pool of pre-forked uvicorn workers."""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import tempfile
+import time
+from typing import Set
+
+from dotenv import find_dotenv, load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# Backends that keep conversations inside one process
+IN_PROCESS_CHECKPOINTERS = ("bounded", "memory")
+
+
+def preload() -> None:
+    """
+    Build everything workers share before forking: the compiled graph, models,
+    prompts and tokenizer. Forked workers then start without paying for it and
+    share those pages with the supervisor.
+    """
+    from . import app
+    from .models.models import get_default_model
+    from .tokens import count_tokens
+
+    # The graph, models and provider SDKs are otherwise built on the first request of
+    # each worker
+    app._agents()
+    get_default_model()
+    count_tokens("preload")
+    # Keep preloaded objects out of the collector so it does not dirty shared pages
+    gc.freeze()
+
+
+def bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """The listening socket every worker accepts connections on."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock: socket.socket, drain_timeout: float) -> None:
+    """Serve on `sock` until SIGTERM or SIGINT, then drain open requests."""
+    import uvicorn
+
+    from . import config
+    from .app import app
+    from .metrics import flush_metrics, share_metrics
+
+    # Each worker has its own registry; publishing it lets any worker answer /metrics
+    # for all of them
+    share_metrics(config.METRICS_DIR)
+    server = uvicorn.Server(
+        uvicorn.Config(app, timeout_graceful_shutdown=drain_timeout, log_level="info")
+    )
+    # uvicorn stops accepting on SIGTERM and waits for in-flight requests
+    server.run(sockets=[sock])
+    flush_metrics()
+
+
+class Supervisor:
+    """
+    Forks `workers` processes serving `sock`, replaces workers that die, and on
+    SIGTERM or SIGINT asks every worker to drain, killing those still running
+    `drain_timeout` seconds later.
+    """
+
+    def __init__(self, sock: socket.socket, workers: int, drain_timeout: float):
+        self.sock = sock
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.children: Set[int] = set()
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+                    signal.signal(signum, signal.SIG_DFL)
+                run_worker(self.sock, self.drain_timeout)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        self.children.add(pid)
+
+    def stop(self, signum: int, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Draining %d workers", len(self.children))
+        for pid in self.children:
+            self._signal(pid, signal.SIGTERM)
+        signal.alarm(int(self.drain_timeout) + 5)
+
+    def kill(self, signum: int, frame) -> None:
+        for pid in self.children:
+            logger.warning("Worker %d did not drain in time, killing it", pid)
+            self._signal(pid, signal.SIGKILL)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGALRM, self.kill)
+        for _ in range(self.workers):
+            self.spawn()
+        logger.info("Serving with %d workers", self.workers)
+
+        while self.children:
+            pid, status = os.wait()
+            self.children.discard(pid)
+            if not self.stopping:
+                logger.warning("Worker %d exited with status %d, restarting it", pid, status)
+                # Avoid a tight loop when workers die on startup
+                time.sleep(1)
+                self.spawn()
+        self.sock.close()
+
+
+def main():
+    """Run the production server."""
+    load_dotenv(find_dotenv(usecwd=True))
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("EDISON_WORKERS") or os.cpu_count() or 1),
+        help="Worker processes, one per core by default",
+    )
+    parser.add_argument("--drain-timeout", type=float, help="Seconds to finish open requests")
+    args = parser.parse_args()
+
+    # Settings are read when edison_ai.config is first imported, below
+    os.environ["EDISON_WORKERS"] = str(args.workers)
+    if args.drain_timeout is not None:
+        os.environ["EDISON_DRAIN_TIMEOUT"] = str(args.drain_timeout)
+    if not os.getenv("EDISON_METRICS_DIR"):
+        os.environ["EDISON_METRICS_DIR"] = tempfile.mkdtemp(prefix="edison-metrics-")
+    if args.workers > 1:
+        # Every turn of a conversation may land on a different worker
+        checkpointer = os.environ.setdefault("EDISON_CHECKPOINTER", "sqlite")
+        if checkpointer in IN_PROCESS_CHECKPOINTERS:
+            parser.error(
+                f"EDISON_CHECKPOINTER={checkpointer} keeps conversations in one process; "
+                "use sqlite with more than one worker"
+            )
+
+    logging.basicConfig(level=logging.INFO)
+    from . import config
+    from .metrics import clear_shared_metrics
+
+    # Counts from a previous server would otherwise be added to this one's
+    clear_shared_metrics(config.METRICS_DIR)
+    sock = bind(args.host, args.port)
+    preload()
+    Supervisor(sock, config.WORKERS, config.DRAIN_TIMEOUT).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.utils.json import parse_partial_json
+
+from . import config as settings
+from .models.clients import chat, tool_call
+from .schema import Quiz, QuizQuestion
+
+OnText = Callable[[str], Awaitable[None]]
+OnQuestions = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+async def stream_text(
+    model: BaseChatModel,
+    messages: Sequence[BaseMessage],
+    on_text: Optional[OnText] = None,
+    interval: float = settings.STREAM_EMIT_INTERVAL,
+) -> str:
+    """
+    Stream a plain-text generation, calling `on_text` with the text so far at
+    most every `interval` seconds, and return the full text.
+    """
+    parts: List[str] = []
+    last_emit = 0.0
+    async for chunk in chat(model).astream(messages):
+        parts.append(str(chunk.content))
+        now = time.monotonic()
+        if on_text is not None and now - last_emit >= interval:
+            last_emit = now
+            await on_text("".join(parts))
+    text = "".join(parts)
+    if on_text is not None:
+        await on_text(text)
+    return text
+
+
+def _complete_questions(partial: Dict[str, Any], done: bool) -> List[QuizQuestion]:
+    """
+    Questions from a partially parsed Quiz that are known to be complete.
+
+    A question is complete once the next one has started, or once a field
+    after `questions` appears or the stream ends.
+    """
+    questions = partial.get("questions") or []
+    fields_after = ("difficulty_level", "target_skills")
+    if not done and not any(field in partial for field in fields_after):
+        questions = questions[:-1]
+
+    complete = []
+    for question in questions:
+        try:
+            complete.append(QuizQuestion.model_validate(question))
+        except ValueError:
+            break
+    return complete
+
+
+async def stream_quiz(
+    model: BaseChatModel,
+    messages: Sequence[BaseMessage],
+    on_questions: Optional[OnQuestions] = None,
+) -> Quiz:
+    """
+    Generate a Quiz through a streamed tool call.
+
+    Every time one or more `QuizQuestion`s are complete, `on_questions` is
+    called with the quiz so far: the header fields that have arrived and the
+    validated questions.
+    """
+    gathered: Optional[AIMessageChunk] = None
+    emitted = 0
+    async for chunk in tool_call(model, [Quiz], "Quiz").astream(messages):
+        gathered = chunk if gathered is None else gathered + chunk
+        if on_questions is None or not gathered.tool_call_chunks:
+            continue
+        partial = parse_partial_json(gathered.tool_call_chunks[0]["args"] or "{}")
+        if not isinstance(partial, dict):
+            continue
+        questions = _complete_questions(partial, done=False)
+        if len(questions) > emitted:
+            emitted = len(questions)
+            await on_questions({**partial, "questions": [q.model_dump() for q in questions]})
+
+    if gathered is None or not gathered.tool_call_chunks:
+        raise ValueError("The model did not return a quiz")
+    quiz = Quiz.model_validate(json.loads(gathered.tool_call_chunks[0]["args"]))
+    if on_questions is not None and len(quiz.questions) > emitted:
+        await on_questions(quiz.model_dump())
+    return quiz
+
+
+def state_emitter(config: Optional[RunnableConfig], state: Dict[str, Any], key: str):
+    """
+    Build a callback that pushes `state` with `key` set to the value it is
+    called with to the CopilotKit frontend as an intermediate state update.
+    """
+
+    async def emit(value: Any) -> None:
+        if config is None:
+            return
+        from copilotkit.langchain import copilotkit_emit_state
+
+        await copilotkit_emit_state(config, {**state, key: value})
+
+    return emit
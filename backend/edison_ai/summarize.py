@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+
+from . import config
+from .artifacts import model_name
+from .cache import DiskCache
+from .executor import run_blocking
+from .models.clients import chat
+from .prompts import CHUNK_SUMMARY_PROMPT, PROMPT_VERSION, SUMMARIZE_TRANSCRIPT_PROMPT
+from .streaming import OnText, stream_text
+from .tokens import count_tokens, generation_tokens
+from .transcripts import Transcript, transcript_text
+
+
+def _timestamp(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _split_segment(segment: Dict, max_tokens: int) -> List[Dict]:
+    """Split a segment that alone exceeds `max_tokens` on word boundaries."""
+    words = segment["text"].split()
+    # ~0.75 words per token keeps each piece comfortably under the budget
+    step = max(1, int(max_tokens * 0.75))
+    pieces = [" ".join(words[i : i + step]) for i in range(0, len(words), step)]
+    duration = segment.get("duration", 0.0) / max(len(pieces), 1)
+    return [
+        {"text": text, "start": segment.get("start", 0.0) + i * duration, "duration": duration}
+        for i, text in enumerate(pieces)
+    ]
+
+
+def chunk_transcript(transcript: Transcript, max_tokens: int) -> List[Transcript]:
+    """Group consecutive segments into chunks of at most ~`max_tokens` tokens."""
+    chunks: List[Transcript] = []
+    current: Transcript = []
+    used = 0
+    for segment in transcript:
+        tokens = count_tokens(segment["text"])
+        pieces = _split_segment(segment, max_tokens) if tokens > max_tokens else [segment]
+        for piece in pieces:
+            tokens = count_tokens(piece["text"]) if len(pieces) > 1 else tokens
+            if current and used + tokens > max_tokens:
+                chunks.append(current)
+                current, used = [], 0
+            current.append(piece)
+            used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_span(chunk: Transcript) -> str:
+    end = chunk[-1].get("start", 0.0) + chunk[-1].get("duration", 0.0)
+    return f"{_timestamp(chunk[0].get('start', 0.0))} - {_timestamp(end)}"
+
+
+class ChunkedSummarizer:
+    """
+    Map-reduce lesson generation for transcripts too long for the model.
+
+    Transcripts of at most `single_pass_tokens` tokens are summarized in one
+    call, so the lesson streams from the first token. Longer ones are split on
+    segment boundaries into chunks of at most `chunk_tokens` tokens, each chunk
+    is summarized concurrently (at most `concurrency` calls in flight), and the
+    timestamped notes are reduced into the lesson plan with the regular lesson
+    prompt. Chunk notes are cached by content, so a retry only redoes the
+    chunks that failed.
+    """
+
+    def __init__(
+        self,
+        cache: DiskCache,
+        chunk_tokens: int = config.SUMMARY_CHUNK_TOKENS,
+        concurrency: int = config.SUMMARY_CONCURRENCY,
+        single_pass_tokens: int = config.SUMMARY_SINGLE_PASS_TOKENS,
+    ):
+        self.cache = cache
+        self.single_pass_tokens = single_pass_tokens
+        self.chunk_tokens = chunk_tokens
+        self.concurrency = concurrency
+
+    def _key(self, model: BaseChatModel, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"chunk:{PROMPT_VERSION}:{model_name(model)}:{digest}"
+
+    async def _summarize_chunk(
+        self, model: BaseChatModel, chunk: Transcript, semaphore: asyncio.Semaphore
+    ) -> Dict:
+        text = transcript_text(chunk)
+        key = self._key(model, text)
+        cached = await run_blocking(self.cache.get, key)
+        if cached is not None:
+            return {**cached, "tokens": 0}
+
+        async with semaphore:
+            messages = [CHUNK_SUMMARY_PROMPT.message(span=chunk_span(chunk), transcript=text)]
+            response = await chat(model).ainvoke(messages)
+        notes = {"span": chunk_span(chunk), "notes": str(response.content)}
+        await run_blocking(self.cache.set, key, notes)
+        return {**notes, "tokens": generation_tokens(messages, notes["notes"])}
+
+    async def summarize(
+        self,
+        model: BaseChatModel,
+        transcript: Transcript,
+        on_text: Optional[OnText] = None,
+    ) -> Tuple[str, int]:
+        """Generate the lesson plan; returns (lesson, tokens spent)."""
+        text = transcript_text(transcript)
+        if count_tokens(text) <= self.single_pass_tokens:
+            messages = [SUMMARIZE_TRANSCRIPT_PROMPT.message(transcript=text)]
+            lesson = await stream_text(model, messages, on_text)
+            return lesson, generation_tokens(messages, lesson)
+
+        chunks = chunk_transcript(transcript, self.chunk_tokens)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._summarize_chunk(model, chunk, semaphore) for chunk in chunks),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            # Successful chunks are cached, so the next attempt only redoes these
+            raise failures[0]
+
+        notes = "\n\n".join(f"[{result['span']}]\n{result['notes']}" for result in results)
+        messages = [SUMMARIZE_TRANSCRIPT_PROMPT.message(transcript=notes)]
+        lesson = await stream_text(model, messages, on_text)
+        tokens = sum(result["tokens"] for result in results)
+        return lesson, tokens + generation_tokens(messages, lesson)
+
+
+_summarizer: Optional[ChunkedSummarizer] = None
+
+
+def get_summarizer() -> ChunkedSummarizer:
+    """Return the process-wide chunked summarizer, configured from the environment."""
+    global _summarizer
+    if _summarizer is None:
+        _summarizer = ChunkedSummarizer(
+            DiskCache(config.CHUNK_CACHE_DIR, max_bytes=config.CHUNK_CACHE_MAX_BYTES)
+        )
+    return _summarizer
@@ -0,0 +1,30 @@
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with the GPT-4o tokenizer, or estimate ~4 characters per token
+    when tiktoken or its encoding files are unavailable.
+    """
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def generation_tokens(messages: Sequence[BaseMessage], output: str) -> int:
+    """Estimate the prompt + completion tokens a generation cost."""
+    return sum(count_tokens(str(message.content)) for message in messages) + count_tokens(output)
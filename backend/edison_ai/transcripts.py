@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Protocol
+
+from . import config
+from .cache import DiskCache
+from .executor import run_blocking
+
+# A transcript is the list of timestamped segments returned by YouTubeTranscriptApi:
+# [{"text": "...", "start": 0.0, "duration": 1.5}, ...]
+Transcript = List[Dict[str, Any]]
+
+_VIDEO_ID = r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+_YOUTUBE_URL = re.compile(
+    r"(?:https?://)?(?:[\w-]+\.)?(?:youtube\.com|youtube-nocookie\.com|youtu\.be)/"
+    r"(?:"
+    r"\S*?[?&](?:v=|u=(?:/|%2F)watch%3Fv%3D)"
+    r"|(?:shorts|embed|live|v|e)/"
+    r"|(?<=youtu\.be/)"
+    r")" + _VIDEO_ID,
+    re.IGNORECASE,
+)
+_BARE_VIDEO_ID = re.compile(r"^\s*" + _VIDEO_ID + r"\s*$")
+
+
+def extract_video_id(text: str) -> Optional[str]:
+    """
+    Extract a YouTube video ID from free text without calling a model.
+
+    Handles watch, youtu.be, shorts, embed, live and attribution URLs with any
+    extra query parameters, as well as a message consisting of a bare video ID.
+    A bare word without digits, "_", "-" or mixed case is taken for prose.
+    Returns None when nothing that looks like a video ID is found.
+    """
+    match = _YOUTUBE_URL.search(text)
+    if match:
+        return match.group(1)
+    match = _BARE_VIDEO_ID.match(text)
+    return match.group(1) if match and _looks_like_video_id(match.group(1)) else None
+
+
+def _looks_like_video_id(word: str) -> bool:
+    """
+    Whether a bare 11-character word is a video ID rather than a word like
+    "Explanation": it has a digit, "_" or "-", or mixes case past its first letter.
+    """
+    if any(char.isdigit() or char in "_-" for char in word):
+        return True
+    rest = word[1:]
+    return any(char.isupper() for char in rest) and any(char.islower() for char in word)
+
+
+class TranscriptFetcher(Protocol):
+    def fetch(self, video_id: str) -> Transcript: ...
+
+
+class YouTubeTranscriptFetcher:
+    """Fetches transcripts from YouTube."""
+
+    def fetch(self, video_id: str) -> Transcript:
+        from youtube_transcript_api import YouTubeTranscriptApi
+
+        return YouTubeTranscriptApi.get_transcript(video_id)
+
+
+class FileTranscriptFetcher:
+    """
+    Reads transcripts from a local directory, for tests and offline runs.
+
+    `<video_id>.json` must hold a list of segments in the YouTubeTranscriptApi
+    format; `<video_id>.txt` is loaded as a single segment of plain text.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def fetch(self, video_id: str) -> Transcript:
+        json_path = os.path.join(self.directory, f"{video_id}.json")
+        if os.path.exists(json_path):
+            with open(json_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+
+        text_path = os.path.join(self.directory, f"{video_id}.txt")
+        if os.path.exists(text_path):
+            with open(text_path, "r", encoding="utf-8") as file:
+                return [{"text": file.read(), "start": 0.0, "duration": 0.0}]
+
+        raise FileNotFoundError(f"No transcript for video {video_id} in {self.directory}")
+
+
+class TranscriptStore:
+    """
+    Content-addressed transcript store keyed by video ID.
+
+    Transcripts are persisted in a `DiskCache`, and concurrent requests for the
+    same video share a single in-flight fetch. Fetches and disk access run on
+    the shared I/O thread pool so they never block the event loop.
+    """
+
+    def __init__(
+        self,
+        cache: DiskCache,
+        fetcher: TranscriptFetcher,
+        fetch_timeout: Optional[float] = None,
+    ):
+        self.cache = cache
+        self.fetcher = fetcher
+        self.fetch_timeout = fetch_timeout
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def _fetch(self, video_id: str) -> Transcript:
+        transcript = await run_blocking(self.fetcher.fetch, video_id, timeout=self.fetch_timeout)
+        await run_blocking(self.cache.set, video_id, transcript)
+        return transcript
+
+    def _done(self, video_id: str, task: asyncio.Task) -> None:
+        if self._inflight.get(video_id) is task:
+            del self._inflight[video_id]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def get(self, video_id: str) -> Transcript:
+        cached = await run_blocking(self.cache.get, video_id)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(video_id)
+        if task is None:
+            # The fetch belongs to the store rather than to the first caller, so a
+            # caller that is cancelled (its client disconnected) leaves it running
+            # for everyone else waiting on the same video
+            task = asyncio.create_task(self._fetch(video_id))
+            task.add_done_callback(lambda task: self._done(video_id, task))
+            self._inflight[video_id] = task
+        return await asyncio.shield(task)
+
+
+def transcript_text(transcript: Transcript) -> str:
+    return " ".join(entry["text"] for entry in transcript)
+
+
+_store: Optional[TranscriptStore] = None
+
+
+def get_transcript_store() -> TranscriptStore:
+    """Return the process-wide transcript store, configured from the environment."""
+    global _store
+    if _store is None:
+        fetcher: TranscriptFetcher = (
+            FileTranscriptFetcher(config.TRANSCRIPT_SOURCE_DIR)
+            if config.TRANSCRIPT_SOURCE_DIR
+            else YouTubeTranscriptFetcher()
+        )
+        _store = TranscriptStore(
+            DiskCache(
+                config.TRANSCRIPT_CACHE_DIR,
+                max_bytes=config.TRANSCRIPT_CACHE_MAX_BYTES,
+                ttl=config.TRANSCRIPT_CACHE_TTL,
+            ),
+            fetcher,
+            fetch_timeout=config.TRANSCRIPT_FETCH_TIMEOUT,
+        )
+    return _store
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when edison_ai.config is first imported, so every cache the
+# tests touch is pointed at a scratch directory before any test module imports it
+os.environ["EDISON_CACHE_DIR"] = tempfile.mkdtemp(prefix="edison-tests-")
+
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.fixture
+def fixture_video(tmp_path, monkeypatch):
+    """Serve transcript.txt as VIDEO_ID from a fresh transcript store; returns its directory."""
+    from edison_ai import transcripts
+    from edison_ai.cache import DiskCache
+    from edison_ai.transcripts import FileTranscriptFetcher, TranscriptStore
+
+    source = tmp_path / "videos"
+    source.mkdir()
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        (source / f"{VIDEO_ID}.txt").write_text(file.read(), encoding="utf-8")
+    store = TranscriptStore(
+        DiskCache(str(tmp_path / "transcripts"), max_bytes=1 << 24),
+        FileTranscriptFetcher(str(source)),
+    )
+    monkeypatch.setattr(transcripts, "_store", store)
+    return source
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Make every node use a FakeChatModel; returns it."""
+    from edison_ai import agent
+    from edison_ai.models.fake import FakeChatModel
+
+    model = FakeChatModel()
+    monkeypatch.setattr(agent, "model", model)
+    return model
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHILD = """
+import json
+import edison_ai.app
+from edison_ai import agent, config
+print(json.dumps({
+    "catalog": config.CATALOG_DB,
+    "graph_built": agent.get_graph.cache_info().currsize > 0,
+}))
+"""
+
+
+def test_importing_the_app_loads_env_first_and_builds_no_graph(tmp_path):
+    catalog = tmp_path / "catalog.sqlite"
+    (tmp_path / ".env").write_text(f"EDISON_CATALOG_DB={catalog}\n", encoding="utf-8")
+    env = {
+        key: value for key, value in os.environ.items() if key != "EDISON_CATALOG_DB"
+    }
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    env["EDISON_CACHE_DIR"] = str(tmp_path / "cache")
+    env["EDISON_MODEL_PROVIDER"] = "fake"
+
+    # Like `uvicorn edison_ai.app:app` started in a directory holding .env
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"catalog": str(catalog), "graph_built": False}
@@ -0,0 +1,69 @@
+import asyncio
+
+from edison_ai.artifacts import LEVEL_BUCKETS, UNASSESSED, model_name
+from edison_ai.batch import CatalogBuilder
+from edison_ai.catalog import CatalogStore
+from edison_ai.models.fake import default_responder
+from edison_ai.prompts import PROMPT_VERSION
+
+VIDEOS = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+LEVELS = [UNASSESSED, LEVEL_BUCKETS[0]]
+
+
+class Responder:
+    """Records which video each call was for and fails the calls listed in `fail`."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls = []
+
+    def __call__(self, schema, messages):
+        prompt = "\n".join(str(message.content) for message in messages)
+        video_id = next(video_id for video_id in VIDEOS if video_id in prompt)
+        kind = "lesson" if schema is None else "quiz"
+        level = UNASSESSED if "No assessment available" in prompt else "assessed"
+        self.calls.append((video_id, kind))
+        if (video_id, kind) in self.fail or (video_id, kind, level) in self.fail:
+            raise RuntimeError(f"{kind} for {video_id} failed")
+        if schema is None:
+            return f"Lesson plan for video {video_id}."
+        return default_responder(schema, messages)
+
+
+def test_an_interrupted_run_resumes_with_the_failed_videos(tmp_path, fixture_video, fake_model):
+    sources = []
+    for video_id in VIDEOS:
+        path = tmp_path / f"{video_id}.txt"
+        path.write_text(f"In video {video_id} we cover binary search.", encoding="utf-8")
+        sources.append((video_id, str(path)))
+    catalog = CatalogStore(str(tmp_path / "catalog.sqlite"))
+    name = model_name(fake_model)
+
+    def stored(video_id):
+        return catalog.existing(video_id, PROMPT_VERSION, name)
+
+    # "b" loses its unassessed quiz and "c" its lesson, so "c" stores nothing
+    fake_model.responder = Responder(
+        fail={("bbbbbbbbbbb", "quiz", UNASSESSED), ("ccccccccccc", "lesson")}
+    )
+    progress = asyncio.run(CatalogBuilder(catalog, LEVELS, concurrency=2).build(sources))
+    assert (progress.videos, progress.failed) == (3, 2)
+    complete = {("lesson", "all"), *(("quiz", level) for level in LEVELS)}
+    assert stored("aaaaaaaaaaa") == complete
+    assert stored("bbbbbbbbbbb") == {("lesson", "all"), ("quiz", LEVEL_BUCKETS[0])}
+    assert stored("ccccccccccc") == set()
+
+    fake_model.responder = responder = Responder()
+    progress = asyncio.run(CatalogBuilder(catalog, LEVELS, concurrency=2).build(sources))
+    assert (progress.videos, progress.failed) == (3, 0)
+    assert all(stored(video_id) == complete for video_id in VIDEOS)
+    # Completed work is not redone: "a" is skipped and "b" only writes its missing quiz
+    assert sorted(responder.calls) == [
+        ("bbbbbbbbbbb", "quiz"),
+        ("ccccccccccc", "lesson"),
+        ("ccccccccccc", "quiz"),
+        ("ccccccccccc", "quiz"),
+    ]
+    assert progress.reused == 5
+    assert progress.generated == 4
+    catalog.close()
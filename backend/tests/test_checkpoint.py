@@ -0,0 +1,270 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from edison_ai.checkpoint import BoundedMemorySaver, SQLiteSaver
+
+
+def text(seed: str) -> str:
+    """A value that stays over the blob size threshold once compressed."""
+    return " ".join(hashlib.sha256(f"{seed} {index}".encode()).hexdigest() for index in range(64))
+
+
+TRANSCRIPT = text("transcript")
+LESSONS = [text(f"lesson {index}") for index in range(6)]
+
+
+def put(saver, thread_id: str, step: int, **values):
+    checkpoint = empty_checkpoint()
+    checkpoint["id"] = f"{step:04d}"
+    checkpoint["channel_values"] = {"messages": [f"turn {step}"], **values}
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    return saver.put(config, checkpoint, {"step": step}, {})
+
+
+def get(saver, thread_id: str):
+    item = saver.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}})
+    return item.checkpoint["channel_values"] if item is not None else None
+
+
+def refcounts(saver: BoundedMemorySaver) -> list:
+    return sorted(count for _, count in saver._blob_store.values())
+
+
+def sqlite_blobs(saver: SQLiteSaver) -> int:
+    return saver.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+
+
+def test_threads_with_the_same_values_share_blobs():
+    saver = BoundedMemorySaver(max_threads=10, ttl=None, history=10)
+    put(saver, "a", 1, transcript=TRANSCRIPT)
+    put(saver, "b", 1, transcript=TRANSCRIPT)
+    put(saver, "a", 2, transcript=TRANSCRIPT, lesson_explanation=LESSONS[0])
+
+    # One transcript blob held by three checkpoints, one lesson blob held by one
+    assert refcounts(saver) == [1, 3]
+    assert get(saver, "a") == {
+        "messages": ["turn 2"],
+        "transcript": TRANSCRIPT,
+        "lesson_explanation": LESSONS[0],
+    }
+    assert get(saver, "b")["transcript"] == TRANSCRIPT
+    # Small values stay inline
+    put(saver, "c", 1, transcript="short")
+    assert refcounts(saver) == [1, 3]
+
+
+def test_blobs_are_freed_with_the_last_checkpoint_that_uses_them():
+    saver = BoundedMemorySaver(max_threads=10, ttl=None, history=2)
+    for step, lesson in enumerate(LESSONS[:4]):
+        put(saver, "a", step, transcript=TRANSCRIPT, lesson_explanation=lesson)
+    # Only the last two checkpoints are kept, with their two lessons
+    assert refcounts(saver) == [1, 1, 2]
+    assert get(saver, "a")["lesson_explanation"] == LESSONS[3]
+
+    put(saver, "b", 0, transcript=TRANSCRIPT)
+    saver.delete_thread("a")
+    assert refcounts(saver) == [1]
+    assert get(saver, "b")["transcript"] == TRANSCRIPT
+    saver.delete_thread("b")
+    assert saver._blob_store == {}
+
+
+def test_rewriting_a_checkpoint_does_not_leak_references():
+    saver = BoundedMemorySaver(max_threads=10, ttl=None, history=10)
+    put(saver, "a", 1, transcript=TRANSCRIPT, lesson_explanation=LESSONS[0])
+    put(saver, "a", 1, transcript=TRANSCRIPT, lesson_explanation=LESSONS[1])
+    assert refcounts(saver) == [1, 1]
+    assert get(saver, "a")["lesson_explanation"] == LESSONS[1]
+
+
+def test_evicted_threads_release_their_blobs():
+    saver = BoundedMemorySaver(max_threads=1, ttl=None, history=10)
+    put(saver, "a", 1, transcript=TRANSCRIPT)
+    put(saver, "b", 1, lesson_explanation=LESSONS[0])
+    assert get(saver, "a") is None
+    assert refcounts(saver) == [1]
+
+
+def test_sqlite_collects_blobs_no_checkpoint_references(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), ttl=None, history=2)
+    for step, lesson in enumerate(LESSONS[:4]):
+        put(saver, "a", step, transcript=TRANSCRIPT, lesson_explanation=lesson)
+    put(saver, "b", 0, transcript=TRANSCRIPT)
+    assert sqlite_blobs(saver) == 5
+
+    # The lessons of the two pruned checkpoints go; the shared transcript stays
+    assert saver.collect_blobs() == 2
+    saver.delete_thread("a")
+    assert saver.collect_blobs() == 2
+    assert sqlite_blobs(saver) == 1
+    assert get(saver, "b")["transcript"] == TRANSCRIPT
+    saver.close()
+
+
+class Clock:
+    """Stands in for the `time` module in edison_ai.checkpoint."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("edison_ai.checkpoint.time", clock)
+    return clock
+
+
+@pytest.fixture(params=["bounded", "sqlite"])
+def make_saver(request, tmp_path):
+    savers = []
+
+    def make(**kwargs):
+        kwargs = {"ttl": None, "history": 10, **kwargs}
+        if request.param == "bounded":
+            saver = BoundedMemorySaver(max_threads=kwargs.pop("max_threads", 100), **kwargs)
+        else:
+            kwargs.pop("max_threads", None)
+            saver = SQLiteSaver(str(tmp_path / f"{len(savers)}.db"), **kwargs)
+        savers.append(saver)
+        return saver
+
+    yield make
+    for saver in savers:
+        if isinstance(saver, SQLiteSaver):
+            saver.close()
+
+
+def config(thread_id: str, checkpoint_id: str = None) -> dict:
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id is not None:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def test_round_trip(make_saver):
+    saver = make_saver()
+    first = put(saver, "a", 1, transcript=TRANSCRIPT)
+    saver.put_writes(first, [("messages", "pending"), ("route", "create_quiz")], "task-1")
+    second = saver.put(
+        first,
+        {**empty_checkpoint(), "id": "0002", "channel_values": {"quiz": None, "route": "x"}},
+        {"step": 2},
+        {},
+    )
+    saver.put_writes(second, [("messages", "next")], "task-2")
+
+    item = saver.get_tuple(config("a"))
+    assert item.config["configurable"]["checkpoint_id"] == "0002"
+    assert item.parent_config["configurable"]["checkpoint_id"] == "0001"
+    assert item.checkpoint["channel_values"] == {"quiz": None, "route": "x"}
+    assert item.metadata == {"step": 2}
+    assert item.pending_writes == [("task-2", "messages", "next")]
+
+    item = asyncio.run(saver.aget_tuple(config("a", "0001")))
+    assert item.checkpoint["channel_values"]["transcript"] == TRANSCRIPT
+    assert item.pending_writes == [
+        ("task-1", "messages", "pending"),
+        ("task-1", "route", "create_quiz"),
+    ]
+
+    listed = [item.config["configurable"]["checkpoint_id"] for item in saver.list(config("a"))]
+    assert listed == ["0002", "0001"]
+    assert [i.metadata for i in saver.list(config("a"), filter={"step": 1})] == [{"step": 1}]
+    assert len(list(saver.list(config("a"), before=config("a", "0002")))) == 1
+    assert len(list(saver.list(config("a"), limit=1))) == 1
+    assert saver.get_tuple(config("unknown")) is None
+
+
+def test_history_is_capped_with_the_writes_of_dropped_checkpoints(make_saver):
+    saver = make_saver(history=3)
+    for step in range(6):
+        saver.put_writes(put(saver, "a", step), [("messages", step)], "task")
+
+    listed = [item.config["configurable"]["checkpoint_id"] for item in saver.list(config("a"))]
+    assert listed == ["0005", "0004", "0003"]
+    assert saver.get_tuple(config("a", "0001")) is None
+    if isinstance(saver, SQLiteSaver):
+        rows = saver.conn.execute("SELECT DISTINCT checkpoint_id FROM writes").fetchall()
+    else:
+        rows = [(key[2],) for key in saver.writes]
+    assert sorted(rows) == [("0003",), ("0004",), ("0005",)]
+
+
+def test_idle_threads_are_evicted(make_saver, clock):
+    saver = make_saver(ttl=60)
+    put(saver, "idle", 1, transcript=TRANSCRIPT)
+    clock.now += 30
+    put(saver, "active", 1)
+    clock.now += 45
+    if isinstance(saver, SQLiteSaver):
+        # Eviction runs at most every evict_interval seconds, on a write
+        saver._next_eviction = 0.0
+    put(saver, "active", 2)
+
+    assert saver.get_tuple(config("idle")) is None
+    assert saver.get_tuple(config("active")) is not None
+    if isinstance(saver, SQLiteSaver):
+        assert sqlite_blobs(saver) == 0
+    else:
+        assert saver.thread_count == 1
+        assert saver._blob_store == {}
+
+
+def test_least_recently_used_threads_are_evicted_over_the_limit(clock):
+    saver = BoundedMemorySaver(max_threads=2, ttl=None, history=10)
+    put(saver, "a", 1)
+    put(saver, "b", 1)
+    assert get(saver, "a") is not None  # "a" is now the most recently used
+    put(saver, "c", 1)
+    assert get(saver, "b") is None
+    assert get(saver, "a") is not None and get(saver, "c") is not None
+    assert saver.thread_count == 2
+
+
+def test_sqlite_evict_idle(tmp_path, clock):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), ttl=None)
+    put(saver, "old", 1, transcript=TRANSCRIPT)
+    clock.now += 100
+    put(saver, "new", 1, lesson_explanation=LESSONS[0])
+
+    assert saver.evict_idle(clock.now - 50) == 1
+    assert saver.evict_idle(clock.now - 50) == 0
+    assert get(saver, "old") is None
+    assert get(saver, "new")["lesson_explanation"] == LESSONS[0]
+    assert saver.collect_blobs() == 1
+    assert sqlite_blobs(saver) == 1
+    saver.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_sqlite_reconnects_in_forked_children(tmp_path):
+    saver = SQLiteSaver(str(tmp_path / "checkpoints.db"), ttl=None)
+    put(saver, "parent", 1)
+    connection = saver.conn
+
+    pid = os.fork()
+    if pid == 0:
+        # Child: the connection was reopened and the parent's data is readable
+        ok = saver.conn is not connection and get(saver, "parent") is not None
+        try:
+            put(saver, "child", 1, transcript=TRANSCRIPT)
+        except Exception:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert saver.conn is connection
+    assert get(saver, "child")["transcript"] == TRANSCRIPT
+    saver.close()
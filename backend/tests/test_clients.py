@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableGenerator
+
+from edison_ai.models.clients import with_retries
+
+
+def flaky_stream(fail_after: int):
+    """A stream that raises a retryable error after `fail_after` chunks on its first call."""
+    calls = []
+
+    async def stream(inputs):
+        async for _ in inputs:
+            pass
+        calls.append(1)
+        for i, chunk in enumerate("abc"):
+            if len(calls) == 1 and i == fail_after:
+                raise asyncio.TimeoutError()
+            yield chunk
+
+    return RunnableGenerator(stream), calls
+
+
+async def collect(runnable):
+    return [chunk async for chunk in runnable.astream("input")]
+
+
+def test_streams_are_retried_until_the_first_chunk():
+    runnable, calls = flaky_stream(fail_after=0)
+    assert asyncio.run(collect(with_retries(runnable, attempts=2))) == ["a", "b", "c"]
+    assert len(calls) == 2
+
+
+def test_streams_are_not_retried_once_chunks_were_yielded():
+    runnable, calls = flaky_stream(fail_after=1)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(collect(with_retries(runnable, attempts=2)))
+    assert len(calls) == 1
@@ -0,0 +1,103 @@
+import pytest
+
+from edison_ai.grading import grade_answers, parse_answers
+from edison_ai.schema import Quiz, QuizAnswer, QuizQuestion, QuizResult, QuizScore
+
+
+def make_quiz(questions: int = 5) -> Quiz:
+    return Quiz(
+        title="Binary search",
+        description="",
+        instructions="",
+        difficulty_level="moderate",
+        target_skills=[],
+        questions=[
+            QuizQuestion(
+                question=f"Question {number}?",
+                answers=[
+                    QuizAnswer(
+                        text=f"answer {letter} of question {number}",
+                        is_correct=letter == "b",
+                        explanation=f"{letter} explained",
+                    )
+                    for letter in "abcd"
+                ],
+                difficulty="moderate",
+                topic="search",
+                skill_tested="recall",
+            )
+            for number in range(1, questions + 1)
+        ],
+    )
+
+
+QUIZ = make_quiz()
+
+
+@pytest.mark.parametrize(
+    "text, answers",
+    [
+        ("1b", [(0, 1)]),
+        ("Q2: C", [(1, 2)]),
+        ("3) a, 4) d", [(2, 0), (3, 3)]),
+        ("question 5 is b", [(4, 1)]),
+        ("1a 2b and 3c.", [(0, 0), (1, 1), (2, 2)]),
+        ("B", [(0, 1)]),
+        ("my answer is c", [(0, 2)]),
+        ("I think it's c", [(0, 2)]),
+        ("Answer D of question 1", [(0, 3)]),
+    ],
+)
+def test_parses_answers(text, answers):
+    assert parse_answers(text, QUIZ) == answers
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I have 2 questions",
+        "Why is b right?",
+        "10 a",
+        "e",
+        "a question about recursion",
+        "",
+    ],
+)
+def test_ignores_messages_that_are_not_answers(text):
+    assert parse_answers(text, QUIZ) == []
+
+
+def test_lone_letters_answer_the_first_unanswered_question():
+    score = QuizScore(results=[QuizResult(question=0, answer=1, correct=True)], attempts=1)
+    assert parse_answers("c", QUIZ, score) == [(1, 2)]
+    assert parse_answers("answer c of question 2", QUIZ, score) == [(1, 2)]
+
+
+def test_finished_quizzes_still_take_numbered_answers():
+    score, _ = grade_answers(QUIZ, None, [(index, 0) for index in range(5)])
+    assert parse_answers("b", QUIZ, score) == []
+    # Re-answering a question replaces its result instead of adding one
+    assert parse_answers("2b", QUIZ, score) == [(1, 1)]
+    score, feedback = grade_answers(QUIZ, score, [(1, 1)])
+    assert len(score.results) == 5
+    assert score.correct == 1
+    assert score.attempts == 6
+    assert "score of 1/5" in feedback
+
+
+def test_scores_accumulate_across_turns():
+    score, feedback = grade_answers(QUIZ, None, parse_answers("1b", QUIZ))
+    assert (score.correct, len(score.results), score.attempts) == (1, 1, 1)
+    assert "Correct!" in feedback
+    assert "Score so far: 1/1" in feedback
+    assert "**Question 2:** Question 2?" in feedback
+
+    score, feedback = grade_answers(QUIZ, score, parse_answers("a", QUIZ, score))
+    assert (score.correct, len(score.results), score.attempts) == (1, 2, 2)
+    assert "Not quite, you chose A) answer a of question 2." in feedback
+    assert "The correct answer is B) answer b of question 2." in feedback
+
+    score, feedback = grade_answers(QUIZ, score, parse_answers("3b, 4b, 5) c", QUIZ, score))
+    assert [result.question for result in score.results] == [0, 1, 2, 3, 4]
+    assert (score.correct, score.attempts) == (3, 5)
+    assert "You finished the quiz with a score of 3/5." in feedback
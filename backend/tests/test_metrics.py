@@ -0,0 +1,50 @@
+import asyncio
+import json
+import re
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from edison_ai.metrics import MetricsCallbackHandler, Registry
+from edison_ai.models.models import get_model
+
+
+def _tokens(registry: Registry, kind: str) -> float:
+    pattern = re.compile(rf'^edison_model_tokens_total\{{.*type="{kind}".*\}} (\S+)$', re.M)
+    return sum(float(value) for value in pattern.findall(registry.render()))
+
+
+def test_openai_models_stream_token_usage(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    assert get_model("openai").stream_usage
+
+
+def test_token_usage_is_never_zero_when_the_provider_reports_none():
+    registry = Registry()
+    handler = MetricsCallbackHandler(registry, trace_file=None)
+    # Like a streamed OpenAI call without stream_usage: no usage_metadata at all
+    answer = AIMessage(content="Four, as two plus two is four.")
+    model = GenericFakeChatModel(messages=iter([answer]))
+
+    async def stream():
+        async for _ in model.astream("What is two plus two?", config={"callbacks": [handler]}):
+            pass
+
+    asyncio.run(stream())
+    assert _tokens(registry, "prompt") > 0
+    assert _tokens(registry, "completion") > 0
+
+
+def test_render_sums_snapshots_of_other_workers():
+    workers = [Registry(), Registry()]
+    for registry, runs in zip(workers, (2, 3)):
+        registry.add_collector(lambda: [("edison_test_total", "counter", "Test", [({}, 1.0)])])
+        registry.inc("edison_node_runs_total", {"node": "router", "status": "ok"}, runs)
+        registry.observe("edison_node_duration_seconds", {"node": "router"}, 0.2)
+
+    # Snapshots reach other workers as JSON files
+    other = json.loads(json.dumps(workers[1].snapshot()))
+    text = workers[0].render([other])
+    assert 'edison_node_runs_total{node="router",status="ok"} 5' in text
+    assert 'edison_node_duration_seconds_count{node="router"} 2' in text
+    assert "edison_test_total 2" in text
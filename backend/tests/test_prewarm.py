@@ -0,0 +1,31 @@
+import asyncio
+
+from conftest import VIDEO_ID
+
+from edison_ai import artifacts
+from edison_ai.artifacts import LEVEL_BUCKETS, UNASSESSED, ArtifactCache, model_name
+from edison_ai.cache import DiskCache
+from edison_ai.prewarm import prewarm_video
+
+
+def test_prewarm_stores_the_lesson_and_every_quiz(tmp_path, monkeypatch, fixture_video, fake_model):
+    cache = ArtifactCache(DiskCache(str(tmp_path / "artifacts"), max_bytes=1 << 24))
+    monkeypatch.setattr(artifacts, "_artifacts", cache)
+    levels = [UNASSESSED, *LEVEL_BUCKETS]
+
+    asyncio.run(prewarm_video(VIDEO_ID, levels))
+
+    name = model_name(fake_model)
+
+    async def stored():
+        lesson = await cache.get_lesson(VIDEO_ID, name)
+        quizzes = [await cache.get_quiz(VIDEO_ID, name, level) for level in levels]
+        return lesson, quizzes
+
+    lesson, quizzes = asyncio.run(stored())
+    assert lesson
+    assert all(quiz is not None and quiz.questions for quiz in quizzes)
+    # A second run finds everything cached
+    calls = fake_model.calls
+    asyncio.run(prewarm_video(VIDEO_ID, levels))
+    assert fake_model.calls == calls
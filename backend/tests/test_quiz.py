@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+from edison_ai.models.fake import FakeChatModel, default_responder
+from edison_ai.quiz import ParallelQuizGenerator
+from edison_ai.schema import QuizAnswer, QuizPlan, QuizQuestion, QuizTopic
+
+TOPICS = ["arrays", "recursion", "sorting", "graphs"]
+
+
+def make_question(topic: str, correct: int = 1) -> QuizQuestion:
+    return QuizQuestion(
+        question=f"What about {topic}?",
+        answers=[
+            QuizAnswer(text=f"{topic} {index}", is_correct=index < correct) for index in range(4)
+        ],
+        difficulty="easy",
+        topic=topic,
+        skill_tested="recall",
+    )
+
+
+class Responder:
+    """
+    Writes an invalid "recursion" question until the prompt says why it was
+    rejected; "graphs" never validates.
+    """
+
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, schema, messages):
+        if schema is QuizPlan:
+            plan = default_responder(schema, messages)
+            plan.topics = [
+                QuizTopic(topic=topic, skill_tested="recall", difficulty="easy") for topic in TOPICS
+            ]
+            return plan
+        if schema is not QuizQuestion:
+            return default_responder(schema, messages)
+        prompt = str(messages[0].content)
+        self.prompts.append(prompt)
+        topic = next(topic for topic in TOPICS if json.dumps(topic) in prompt)
+        if topic == "graphs":
+            return make_question(topic, correct=0)
+        if topic == "recursion" and "Question has 2 correct answers" not in prompt:
+            return make_question(topic, correct=2)
+        return make_question(topic)
+
+
+def test_rejected_questions_are_retried_with_the_reason():
+    responder = Responder()
+    model = FakeChatModel(responder=responder)
+    generator = ParallelQuizGenerator(questions=len(TOPICS), concurrency=4, retries=1)
+    partials = []
+
+    async def on_questions(quiz):
+        partials.append([question["topic"] for question in quiz["questions"]])
+
+    quiz, tokens = asyncio.run(
+        generator.generate(model, "a lesson", None, on_questions=on_questions)
+    )
+
+    # "recursion" was repaired on its retry, "graphs" was dropped after it
+    assert [question.topic for question in quiz.questions] == ["arrays", "recursion", "sorting"]
+    assert tokens > 0
+    retries = [prompt for prompt in responder.prompts if "was rejected" in prompt]
+    assert len(retries) == 2
+    assert any("Question has 2 correct answers" in prompt for prompt in retries)
+    assert any("Question has 0 correct answers" in prompt for prompt in retries)
+
+    # Partial quizzes only ever grow in plan order
+    for partial in partials:
+        assert partial == ["arrays", "recursion", "sorting"][: len(partial)]
+    assert partials[-1] == ["arrays", "recursion", "sorting"]
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pytest
+from conftest import TRANSCRIPT_PATH
+
+from edison_ai.retrieval import IndexStore, TranscriptIndex, tokenize
+
+QUERIES = ["binary search", "what is recursion", "sorting algorithms and their cost", "zebra"]
+
+
+@pytest.fixture(scope="module")
+def transcript():
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        words = file.read().split()
+    # Segments of 40 words, like captions
+    return [
+        {"text": " ".join(words[i : i + 40]), "start": float(i), "duration": 40.0}
+        for i in range(0, len(words), 40)
+    ]
+
+
+def scan_scores(index: TranscriptIndex, query: str) -> np.ndarray:
+    """BM25 scores computed by scanning every posting, as a reference."""
+    n = len(index.passages)
+    scores = np.zeros(n, dtype=np.float32)
+    for term in set(tokenize(query)):
+        hits = np.flatnonzero(index.term_ids == term)
+        if not len(hits):
+            continue
+        df = float(len(hits))
+        idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+        docs, tf = index.doc_ids[hits], index.term_freqs[hits]
+        norm = index.k1 * (1 - index.b + index.b * index.doc_lengths[docs] / index.avg_length)
+        np.add.at(scores, docs, idf * tf * (index.k1 + 1) / (tf + norm))
+    return scores
+
+
+def test_postings_are_sorted_with_one_slice_per_term(transcript):
+    index = TranscriptIndex.build(transcript, passage_tokens=200)
+    assert np.all(np.diff(index.term_ids) >= 0)
+    for position in range(0, len(index.vocab), 97):
+        start, count = index.offsets[position], index.doc_freqs[position]
+        postings = index.term_ids[start : start + count]
+        assert np.all(postings == index.vocab[position])
+        assert np.all(np.diff(index.doc_ids[start : start + count]) > 0)
+
+
+def test_search_matches_a_full_scan(transcript):
+    index = TranscriptIndex.build(transcript, passage_tokens=200)
+    for query in QUERIES:
+        scores = scan_scores(index, query)
+        expected = sorted(np.argsort(-scores, kind="stable")[:3])
+        expected = [index.passages[i] for i in expected if scores[i] > 0]
+        assert index.search(query, 3) == expected
+    assert index.search("zebra", 3) == []
+
+
+def test_saved_indexes_are_memory_mapped_and_search_the_same(tmp_path, transcript):
+    store = IndexStore(str(tmp_path / "indexes"), passage_tokens=200)
+
+    async def loader():
+        return transcript
+
+    index = asyncio.run(store.get("abc123DEF45", loader))
+    assert isinstance(index.offsets, np.memmap)
+    built = TranscriptIndex.build(transcript, passage_tokens=200)
+    for query in QUERIES:
+        assert index.search(query, 3) == built.search(query, 3)
+
+    async def unused_loader():
+        raise AssertionError("the saved index should be loaded")
+
+    # Another worker loads the saved index instead of rebuilding it
+    other = IndexStore(str(tmp_path / "indexes"), passage_tokens=200)
+    assert asyncio.run(other.get("abc123DEF45", unused_loader)).search("binary search", 3)
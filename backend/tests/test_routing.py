@@ -0,0 +1,110 @@
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from edison_ai.routing import classify_turn, is_quiz_request
+from edison_ai.schema import (
+    ANALYZE_STUDENT_LEVEL,
+    CREATE_QUIZ,
+    EXTRACT_STUDENT_RESPONSE,
+    GRADE_QUIZ,
+    AgentState,
+    QuestionResponse,
+    StudentAssessment,
+    empty_assessment,
+)
+from test_grading import make_quiz
+
+
+def complete_assessment():
+    assessment = empty_assessment()
+    answered = QuestionResponse(question="?", response="an answer")
+    assessment.assessment = StudentAssessment(
+        **{name: answered for name in StudentAssessment.model_fields}
+    )
+    return assessment
+
+
+def state(text: str, *, previous: str = "", quiz: bool = False, assessed: bool = False):
+    messages = ([AIMessage(content=previous)] if previous else []) + [HumanMessage(content=text)]
+    return AgentState(
+        messages=messages,
+        quiz=make_quiz() if quiz else None,
+        assessment=complete_assessment() if assessed else None,
+    )
+
+
+def test_replies_to_assessment_questions_are_extracted():
+    assert classify_turn(state("yes", previous="Have you used recursion?")) == (
+        EXTRACT_STUDENT_RESPONSE
+    )
+
+
+def test_non_answers_during_a_quiz_go_to_the_llm_router():
+    turn = state("Why is b right?", previous="Ready for question 2?", quiz=True)
+    assert classify_turn(turn) is None
+    # Even before the assessment is complete
+    assert classify_turn(state("hmm, not sure", previous="Which is it?", quiz=True)) is None
+
+
+def test_answers_during_a_quiz_are_graded():
+    assert classify_turn(state("1b", previous="Question 1?", quiz=True)) == GRADE_QUIZ
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Can you make me a quiz?",
+        "give me a quiz about binary search",
+        "I want to take the quiz now",
+        "I'm ready for a quiz!",
+        "quiz me",
+        "I'm not sure, quiz me",
+        "No, I want a quiz",
+        "I don't know much yet. Test my knowledge",
+        "Test me on recursion please",
+    ],
+)
+def test_quiz_requests(text):
+    assert is_quiz_request(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I don't want a quiz yet",
+        "I'd rather not take a quiz",
+        "please don't quiz me",
+        "I'm not ready for a quiz",
+        "I want to know how the quiz will be graded",
+        "I want to understand what the quiz covers",
+        "I want to take the quiz, how long is it?",
+        "Will the quiz I take be hard?",
+        "we ran a t-test in class",
+        "What is a quiz?",
+    ],
+)
+def test_not_quiz_requests(text):
+    assert not is_quiz_request(text)
+
+
+def test_quiz_requests_need_a_complete_assessment():
+    assert classify_turn(state("quiz me", assessed=True)) == CREATE_QUIZ
+    # Before that, the LLM router explains that the assessment comes first
+    assert classify_turn(state("quiz me", previous="What is recursion?")) is None
+    # Asking for another quiz while one is active
+    assert classify_turn(state("give me another quiz", quiz=True, assessed=True)) == CREATE_QUIZ
+
+
+def test_ready_turns_start_the_analysis():
+    assert classify_turn(state("Sounds good!", previous="Let's check your level.")) == (
+        ANALYZE_STUDENT_LEVEL
+    )
+    # A bare "yes" replying to a question is an answer, not a "ready"
+    assert classify_turn(state("yes", previous="Ready?")) == EXTRACT_STUDENT_RESPONSE
+
+
+def test_ambiguous_turns_go_to_the_llm_router():
+    assert classify_turn(state("Tell me more about sorting")) is None
+    assert classify_turn(state("yes", assessed=True, previous="Anything else?")) is None
+    assert classify_turn(AgentState(messages=[AIMessage(content="Hello?")])) is None
+    assert classify_turn(AgentState()) is None
@@ -0,0 +1,96 @@
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from edison_ai.schema import (
+    AgentState,
+    QuestionResponse,
+    StudentAssessment,
+    StudentLevelAssessment,
+    assessment_patch,
+    empty_assessment,
+    merge_assessment,
+)
+
+RECALL = QuestionResponse(question="What is a loop?", response="It repeats code", analysis="ok")
+APPLICATION = QuestionResponse(question="Sum a list?", response="Use a for loop")
+
+
+def assessment(**fields) -> StudentLevelAssessment:
+    skills = fields.pop("skills", {})
+    return empty_assessment().model_copy(
+        update={"assessment": StudentAssessment(**skills), **fields}
+    )
+
+
+def test_none_never_overwrites_the_assessment():
+    current = assessment(overall_level="beginner", skills={"knowledge_recall": RECALL})
+    assert merge_assessment(current, None) is current
+    assert merge_assessment(None, None) is None
+    assert merge_assessment(current, {}) is current
+
+
+def test_empty_fields_of_a_whole_assessment_keep_their_value():
+    current = assessment(
+        overall_level="beginner", strengths=["loops"], skills={"knowledge_recall": RECALL}
+    )
+    update = assessment(skills={"application": APPLICATION})
+
+    merged = merge_assessment(current, update)
+    assert merged.overall_level == "beginner"
+    assert merged.strengths == ["loops"]
+    assert merged.assessment.knowledge_recall == RECALL
+    assert merged.assessment.application == APPLICATION
+    # The reducer works on a copy
+    assert current.assessment.application == QuestionResponse()
+
+
+def test_patches_only_hold_what_changed():
+    current = assessment(overall_level="beginner", skills={"knowledge_recall": RECALL})
+    update = current.model_copy(update={"strengths": ["loops"]})
+    assert assessment_patch(current, update) == {"strengths": ["loops"]}
+    assert assessment_patch(current, current) == {}
+    assert assessment_patch(current, None) is None
+    # Without a current assessment, the update is the patch
+    assert assessment_patch(None, update) is update
+
+    patch = assessment_patch(current, assessment(skills={"application": APPLICATION}))
+    assert patch == {"assessment": {"application": APPLICATION}}
+    assert merge_assessment(current, patch).assessment.knowledge_recall == RECALL
+
+
+def test_patches_accumulate_across_turns():
+    # What the model returns each turn; nodes send assessment_patch(state.assessment, it)
+    # like the agent's nodes do, and a model that drops earlier answers loses nothing
+    turns = [
+        assessment(skills={"knowledge_recall": RECALL}),
+        None,
+        assessment(overall_level="beginner", skills={"application": APPLICATION}),
+        assessment(overall_level="intermediate"),
+    ]
+    sent = []
+
+    def node(state: AgentState):
+        sent.append(assessment_patch(state.assessment, turns[len(state.messages) - 1]))
+        return {"assessment": sent[-1]}
+
+    builder = StateGraph(AgentState)
+    builder.add_node("assess", node)
+    builder.add_edge(START, "assess")
+    builder.add_edge("assess", END)
+    graph = builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "student"}}
+
+    for index in range(len(turns)):
+        graph.invoke({"messages": [("user", f"turn {index}")]}, config)
+        merged = graph.get_state(config).values["assessment"]
+        if index == 1:
+            # A turn that returns None keeps the assessment as it was
+            assert merged.assessment.knowledge_recall == RECALL
+
+    assert merged.assessment.knowledge_recall == RECALL
+    assert merged.assessment.application == APPLICATION
+    assert merged.overall_level == "intermediate"
+    # Only the first turn sent a whole assessment; later turns sent what changed
+    assert isinstance(sent[0], StudentLevelAssessment)
+    assert sent[1] is None
+    assert sent[3] == {"overall_level": "intermediate"}
@@ -0,0 +1,70 @@
+import asyncio
+import os
+
+from langchain_core.messages import HumanMessage
+
+from edison_ai import agent, transcripts
+from edison_ai.cache import DiskCache
+from edison_ai.models.fake import FakeChatModel, default_responder, fake_instance
+from edison_ai.schema import Quiz, QuizQuestion
+from edison_ai.transcripts import FileTranscriptFetcher, TranscriptStore
+
+VIDEO_ID = "dQw4w9WgXcQ"
+TRANSCRIPT_PATH = os.path.join(os.path.dirname(__file__), "..", "transcript.txt")
+QUESTIONS = 6
+
+
+def respond(schema, messages):
+    if schema is Quiz:
+        quiz = fake_instance(Quiz)
+        quiz.questions = [fake_instance(QuizQuestion) for _ in range(QUESTIONS)]
+        return quiz
+    if schema is None:
+        return "Today we will work together to learn about LangGraph. " * 20
+    return default_responder(schema, messages)
+
+
+async def first_emits():
+    """
+    The first state each streaming node pushes to CopilotKit, and the node's
+    final output, in the order they reach the event stream.
+    """
+    events = []
+    async for event in agent.graph.astream_events(
+        {"messages": [HumanMessage(content=f"https://youtu.be/{VIDEO_ID}")]},
+        {"configurable": {"thread_id": "test-streaming"}},
+        version="v2",
+    ):
+        node = event["metadata"].get("langgraph_node")
+        if event["event"] != "on_chain_end":
+            continue
+        if event["metadata"].get("copilotkit:force-emit-intermediate-state"):
+            events.append(("emit", node, event["data"]["output"]))
+        elif event["name"] == node and node in ("summarize_transcript", "create_quiz"):
+            events.append(("end", node, event["data"]["output"]))
+    return events
+
+
+def test_first_lesson_and_quiz_chunks_arrive_before_generation_finishes(tmp_path, monkeypatch):
+    with open(TRANSCRIPT_PATH, "r", encoding="utf-8") as file:
+        (tmp_path / f"{VIDEO_ID}.txt").write_text(file.read(), encoding="utf-8")
+    store = TranscriptStore(
+        DiskCache(str(tmp_path / "cache"), max_bytes=1 << 24), FileTranscriptFetcher(str(tmp_path))
+    )
+    monkeypatch.setattr(transcripts, "_store", store)
+    monkeypatch.setattr(
+        agent, "model", FakeChatModel(responder=respond, latency=0.05, chunk_latency=0.002)
+    )
+
+    events = asyncio.run(first_emits())
+
+    for node, key in (("summarize_transcript", "lesson_explanation"), ("create_quiz", "quiz")):
+        kinds = [kind for kind, name, _ in events if name == node]
+        assert kinds and kinds[0] == "emit", f"{node} pushed nothing before it finished"
+        first = next(state[key] for kind, name, state in events if name == node)
+        final = next(output[key] for kind, name, output in events if (kind, name) == ("end", node))
+        # Partial content, not the finished generation pushed once at the end
+        if key == "quiz":
+            assert 0 < len(first["questions"]) < len(final.questions)
+        else:
+            assert 0 < len(first) < len(final)
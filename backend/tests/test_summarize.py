@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from edison_ai.cache import DiskCache
+from edison_ai.models.fake import FakeChatModel
+from edison_ai.summarize import ChunkedSummarizer, chunk_transcript
+
+# 12 segments of ~20 tokens; 50-token chunks hold two segments each
+TRANSCRIPT = [
+    {
+        "text": f"Segment {index} explains step {index} of binary search " * 2,
+        "start": 10.0 * index,
+        "duration": 10.0,
+    }
+    for index in range(12)
+]
+
+
+class Responder:
+    """Writes notes for each chunk and the lesson, failing on chunks listed in `fail`."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.chunks = []
+        self.lessons = []
+
+    def __call__(self, schema, messages):
+        prompt = str(messages[0].content)
+        if "one part of a longer lecture" not in prompt:
+            self.lessons.append(prompt)
+            return "The lesson."
+        segment = int(prompt.split("Segment ")[1].split()[0])
+        self.chunks.append(segment)
+        if segment in self.fail:
+            raise RuntimeError(f"chunk starting at segment {segment} failed")
+        return f"notes from segment {segment}"
+
+
+def make_summarizer(tmp_path, **kwargs) -> ChunkedSummarizer:
+    cache = DiskCache(str(tmp_path / "chunks"), max_bytes=1 << 20)
+    return ChunkedSummarizer(cache, **{"chunk_tokens": 50, "concurrency": 2, **kwargs})
+
+
+def test_short_transcripts_are_summarized_in_one_pass(tmp_path):
+    responder = Responder()
+    summarizer = make_summarizer(tmp_path, single_pass_tokens=10_000)
+    model = FakeChatModel(responder=responder)
+    lesson, tokens = asyncio.run(summarizer.summarize(model, TRANSCRIPT))
+    assert lesson == "The lesson."
+    assert tokens > 0
+    assert responder.chunks == []
+    assert "Segment 11 explains" in responder.lessons[0]
+
+
+def test_long_transcripts_are_mapped_then_reduced_and_resume_from_cached_chunks(tmp_path):
+    chunks = chunk_transcript(TRANSCRIPT, 50)
+    assert [len(chunk) for chunk in chunks] == [2] * 6
+
+    responder = Responder(fail={4, 8})
+    model = FakeChatModel(responder=responder)
+    summarizer = make_summarizer(tmp_path, single_pass_tokens=50)
+    with pytest.raises(RuntimeError):
+        asyncio.run(summarizer.summarize(model, TRANSCRIPT))
+    assert sorted(responder.chunks) == [0, 2, 4, 6, 8, 10]
+    assert responder.lessons == []
+
+    # The retry only redoes the chunks that failed; the rest come from the chunk cache
+    responder.fail.clear()
+    responder.chunks.clear()
+    lesson, _ = asyncio.run(summarizer.summarize(model, TRANSCRIPT))
+    assert lesson == "The lesson."
+    assert sorted(responder.chunks) == [4, 8]
+
+    # The reduce call gets every chunk's notes, in transcript order, under its time span
+    reduce_prompt = responder.lessons[0]
+    positions = [reduce_prompt.index(f"notes from segment {index}") for index in range(0, 12, 2)]
+    assert positions == sorted(positions)
+    assert "[00:00:40 - 00:01:00]\nnotes from segment 4" in reduce_prompt
+    assert "Segment 4 explains" not in reduce_prompt
+
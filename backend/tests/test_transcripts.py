@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from typing import Optional
+
+import pytest
+
+from edison_ai.cache import DiskCache
+from edison_ai.transcripts import TranscriptStore
+
+TRANSCRIPT = [{"text": "Today we cover binary search.", "start": 0.0, "duration": 2.0}]
+
+
+class SlowFetcher:
+    """Counts fetches and blocks each one until `release` is set."""
+
+    def __init__(self, error: Optional[Exception] = None):
+        self.calls = 0
+        self.error = error
+        self.release = threading.Event()
+
+    def fetch(self, video_id: str):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return TRANSCRIPT
+
+
+def make_store(tmp_path, fetcher) -> TranscriptStore:
+    return TranscriptStore(DiskCache(str(tmp_path), max_bytes=1 << 20), fetcher)
+
+
+async def _started(fetcher: SlowFetcher) -> None:
+    while not fetcher.calls:
+        await asyncio.sleep(0.01)
+
+
+def test_concurrent_gets_share_one_fetch(tmp_path):
+    fetcher = SlowFetcher()
+    store = make_store(tmp_path, fetcher)
+
+    async def run():
+        gets = [asyncio.create_task(store.get("abc123DEF45")) for _ in range(5)]
+        await _started(fetcher)
+        fetcher.release.set()
+        return await asyncio.gather(*gets)
+
+    assert asyncio.run(run()) == [TRANSCRIPT] * 5
+    assert fetcher.calls == 1
+
+
+def test_cached_transcripts_are_not_fetched_again(tmp_path):
+    fetcher = SlowFetcher()
+    fetcher.release.set()
+    assert asyncio.run(make_store(tmp_path, fetcher).get("abc123DEF45")) == TRANSCRIPT
+
+    # A fresh store, like another worker, finds it on disk
+    assert asyncio.run(make_store(tmp_path, fetcher).get("abc123DEF45")) == TRANSCRIPT
+    assert fetcher.calls == 1
+
+
+def test_fetch_errors_reach_every_waiter_and_are_not_cached(tmp_path):
+    fetcher = SlowFetcher(error=LookupError("no captions"))
+    store = make_store(tmp_path, fetcher)
+
+    async def run():
+        gets = [asyncio.create_task(store.get("abc123DEF45")) for _ in range(3)]
+        await _started(fetcher)
+        fetcher.release.set()
+        return await asyncio.gather(*gets, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, LookupError) for result in results)
+
+    fetcher.error = None
+    assert asyncio.run(store.get("abc123DEF45")) == TRANSCRIPT
+    assert fetcher.calls == 2
+
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others(tmp_path):
+    fetcher = SlowFetcher()
+    store = make_store(tmp_path, fetcher)
+
+    async def run():
+        first = asyncio.create_task(store.get("abc123DEF45"))
+        await _started(fetcher)
+        second = asyncio.create_task(store.get("abc123DEF45"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        fetcher.release.set()
+        return await second
+
+    assert asyncio.run(run()) == TRANSCRIPT
+    assert fetcher.calls == 1
@@ -44,6 +44,17 @@ export interface Quiz {
   target_skills: string[];
 }
 
+export interface QuizResult {
+  question: number;
+  answer: number;
+  correct: boolean;
+}
+
+export interface QuizScore {
+  results: QuizResult[];
+  attempts: number;
+}
+
 export interface Log {
   message: string;
   done: boolean;
@@ -57,4 +68,5 @@ export interface AgentState {
   logs?: Log[];
   transcript?: string;
   quiz?: Quiz;
+  score?: QuizScore;
 }